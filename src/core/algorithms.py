@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 import heapq
-import math
+from collections import deque, namedtuple
+from .path_cache import ShortestPathTree
 
 class GraphAlgorithm(ABC):
     """Tüm algoritmalar için temel soyut sınıf (Interface)"""
@@ -16,119 +17,202 @@ class PathFindingAlgorithm(GraphAlgorithm):
 
 class DijkstraAlgorithm(PathFindingAlgorithm):
     def execute(self, graph, start_id, end_id):
-        if start_id not in graph.nodes or end_id not in graph.nodes:
+        csr = graph.freeze()
+        if start_id not in csr.index or end_id not in csr.index:
             return float('inf'), []
 
-        queue = [(0, start_id)]
-        distances = {node_id: float('inf') for node_id in graph.nodes}
-        distances[start_id] = 0
-        predecessors = {node_id: None for node_id in graph.nodes}
+        start, end = csr.index[start_id], csr.index[end_id]
 
-        while queue:
-            current_cost, current_id = heapq.heappop(queue)
-            if current_id == end_id:
+        # Graph üzerinde önbellek varsa aynı kaynaktan yapılmış aramaya kaldığı yerden devam edilir
+        cache = getattr(graph, 'path_cache', None)
+        tree = cache.get(csr, start) if cache is not None else ShortestPathTree(csr, start)
+        tree.settle(end)
+        return tree.result(end)
+
+    def calculate_distance(self, n1, n2): # Interface gereği zorunlu
+        pass
+
+class BidirectionalDijkstraAlgorithm(PathFindingAlgorithm):
+    """
+    Çift yönlü Dijkstra: başlangıçtan ve hedeften aynı anda arar.
+    İki kuyruğun en küçük anahtarları toplamı bulunan en iyi buluşma maliyetini
+    geçtiğinde durur; tek yönlü aramaya göre çok daha az düğüm kesinleştirir.
+    """
+    def __init__(self):
+        self.settled_count = 0  # Son çalıştırmada kesinleşen düğüm sayısı
+
+    def execute(self, graph, start_id, end_id):
+        csr = graph.freeze()
+        if start_id not in csr.index or end_id not in csr.index:
+            return float('inf'), []
+
+        start, end = csr.index[start_id], csr.index[end_id]
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        n = len(csr)
+
+        # 0: ileri (start'tan), 1: geri (end'den) arama
+        distances = ([float('inf')] * n, [float('inf')] * n)
+        predecessors = ([-1] * n, [-1] * n)
+        distances[0][start] = 0
+        distances[1][end] = 0
+        queues = ([(0, start)], [(0, end)])
+
+        best, meet = (0, start) if start == end else (float('inf'), -1)
+        self.settled_count = 0
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
                 break
-            if current_cost > distances[current_id]:
-                continue
 
-            for neighbor_id in graph.adj.get(current_id, set()):
-                weight = graph.calculate_weight(graph.nodes[current_id], graph.nodes[neighbor_id])
-                distance = current_cost + weight
-                if distance < distances[neighbor_id]:
-                    distances[neighbor_id] = distance
-                    predecessors[neighbor_id] = current_id
-                    heapq.heappush(queue, (distance, neighbor_id))
-
-        path = []
-        curr = end_id
-        if distances[end_id] == float('inf'):
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            dist, pred, other = distances[side], predecessors[side], distances[1 - side]
+
+            current_cost, current = heapq.heappop(queues[side])
+            if current_cost > dist[current]:
+                continue
+            self.settled_count += 1
+
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                distance = current_cost + weights[j]
+                if distance < dist[neighbor]:
+                    dist[neighbor] = distance
+                    pred[neighbor] = current
+                    heapq.heappush(queues[side], (distance, neighbor))
+                # Komşuya diğer taraftan da ulaşıldıysa bu bir buluşma noktasıdır
+                if dist[neighbor] + other[neighbor] < best:
+                    best = dist[neighbor] + other[neighbor]
+                    meet = neighbor
+
+        if meet == -1:
             return float('inf'), []
-        while curr is not None:
-            path.insert(0, graph.nodes[curr])
-            curr = predecessors[curr]
-        return distances[end_id], path
 
-    def calculate_distance(self, n1, n2): # Interface gereği zorunlu
+        # İleri kısım start -> meet, geri kısım meet -> end
+        path = csr.build_path(predecessors[0], meet)
+        curr = predecessors[1][meet]
+        while curr != -1:
+            path.append(csr.node_list[curr])
+            curr = predecessors[1][curr]
+        return best, path
+
+    def calculate_distance(self, n1, n2):
         pass
 
 class AStarAlgorithm(PathFindingAlgorithm):
+    """
+    A*: Dijkstra + sezgisel tahmin. Sezgi olarak landmark (ALT) tabloları kullanılır;
+    graf üzerinde landmark indeksi yoksa ya da graf değiştiği için eskiyse sezgi 0 alınır
+    (Dijkstra ile aynı sonuç). Tablolar sorgu sırasında yeniden hesaplanmaz; bu çağıranın işidir.
+    Ekran koordinatları kenar ağırlıklarıyla ilişkisiz olduğundan sezgi olarak kullanılmaz.
+    """
+    def __init__(self):
+        self.settled_count = 0  # Son çalıştırmada genişletilen düğüm sayısı
+
     def execute(self, graph, start_id, end_id):
-        if start_id not in graph.nodes or end_id not in graph.nodes:
+        csr = graph.freeze()
+        if start_id not in csr.index or end_id not in csr.index:
             return float('inf'), []
 
-        target_node = graph.nodes[end_id]
+        start, end = csr.index[start_id], csr.index[end_id]
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
 
-        def heuristic(node_id):
-            n = graph.nodes[node_id]
-            return math.sqrt((n.x - target_node.x) ** 2 + (n.y - target_node.y) ** 2)
+        landmarks = getattr(graph, 'landmarks', None)
+        if landmarks is not None and landmarks.is_fresh(graph):
+            heuristic = landmarks.heuristic_for(end)
+        else:
+            heuristic = lambda v: 0.0
 
-        queue = [(0 + heuristic(start_id), start_id)]
-        g_scores = {node_id: float('inf') for node_id in graph.nodes}
-        g_scores[start_id] = 0
-        predecessors = {node_id: None for node_id in graph.nodes}
+        # Sezgi bir düğüm ilk kez kuyruğa eklenirken hesaplanır ve sorgu boyunca saklanır (-1: henüz yok)
+        h_scores = [-1.0] * len(csr)
+        h_scores[start] = heuristic(start)
+        queue = [(h_scores[start], 0, start)]
+        g_scores = [float('inf')] * len(csr)
+        g_scores[start] = 0
+        predecessors = [-1] * len(csr)
+        self.settled_count = 0
 
         while queue:
-            _, current_id = heapq.heappop(queue)
-            if current_id == end_id:
+            _, current_g, current = heapq.heappop(queue)
+            if current_g > g_scores[current]:
+                continue
+            self.settled_count += 1
+            if current == end:
                 break
 
-            for neighbor_id in graph.adj.get(current_id, set()):
-                weight = graph.calculate_weight(graph.nodes[current_id], graph.nodes[neighbor_id])
-                tentative_g_score = g_scores[current_id] + weight
-                if tentative_g_score < g_scores[neighbor_id]:
-                    predecessors[neighbor_id] = current_id
-                    g_scores[neighbor_id] = tentative_g_score
-                    f_score = tentative_g_score + heuristic(neighbor_id)
-                    heapq.heappush(queue, (f_score, neighbor_id))
-
-        path = []
-        curr = end_id
-        if g_scores[end_id] == float('inf'):
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                tentative_g_score = current_g + weights[j]
+                if tentative_g_score < g_scores[neighbor]:
+                    predecessors[neighbor] = current
+                    g_scores[neighbor] = tentative_g_score
+                    h_score = h_scores[neighbor]
+                    if h_score < 0:
+                        h_score = h_scores[neighbor] = heuristic(neighbor)
+                    f_score = tentative_g_score + h_score
+                    heapq.heappush(queue, (f_score, tentative_g_score, neighbor))
+
+        if g_scores[end] == float('inf'):
             return float('inf'), []
-        while curr is not None:
-            path.insert(0, graph.nodes[curr])
-            curr = predecessors[curr]
-        return g_scores[end_id], path
+        return g_scores[end], csr.build_path(predecessors, end)
 
     def calculate_distance(self, n1, n2):
         pass
 
+class VisitEvent(namedtuple("VisitEvent", ["node", "depth", "parent"])):
+    """Gezinme sırasında üretilen ziyaret bilgisi: ziyaret edilen Node, derinlik ve üst Node (kök için None)."""
+    __slots__ = ()
+
+
 class BFSAlgorithm(GraphAlgorithm):
-    def execute(self, graph, start_id, end_node_id=None):
-        if start_id not in graph.nodes: return []
-        visited, queue, order = {start_id}, [start_id], []
+    def iterate(self, graph, start_id):
+        """
+        Ziyaretleri sırayla ve tembel (lazy) olarak üretir. Bellek kullanımı tüm sıra
+        kadar değil, sadece sınır (frontier) kadardır.
+        """
+        csr = graph.freeze()
+        if start_id not in csr.index: return
+        offsets, targets, node_list = csr.offsets, csr.targets, csr.node_list
+        start = csr.index[start_id]
+        visited = bytearray(len(csr))
+        visited[start] = 1
+        queue = deque([(start, 0, -1)])
         while queue:
-            curr_id = queue.pop(0)
-            order.append(graph.nodes[curr_id])
-            for neighbor in sorted(list(graph.adj.get(curr_id, set()))):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-        return order
+            curr, depth, parent = queue.popleft()
+            yield VisitEvent(node_list[curr], depth, node_list[parent] if parent != -1 else None)
+            # CSR'da komşular zaten uni_id sırasında, tekrar sıralamaya gerek yok
+            for j in range(offsets[curr], offsets[curr + 1]):
+                neighbor = targets[j]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    queue.append((neighbor, depth + 1, curr))
 
-class DFSAlgorithm(GraphAlgorithm):
     def execute(self, graph, start_id, end_node_id=None):
-        if start_id not in graph.nodes: return []
-        visited, stack, order = set(), [start_id], []
+        return [event.node for event in self.iterate(graph, start_id)]
+
+class DFSAlgorithm(GraphAlgorithm):
+    def iterate(self, graph, start_id):
+        """Ziyaretleri sırayla ve tembel (lazy) olarak üretir."""
+        csr = graph.freeze()
+        if start_id not in csr.index: return
+        offsets, targets, node_list = csr.offsets, csr.targets, csr.node_list
+        visited = bytearray(len(csr))
+        stack = [(csr.index[start_id], 0, -1)]
         while stack:
-            curr_id = stack.pop()
-            if curr_id not in visited:
-                visited.add(curr_id)
-                order.append(graph.nodes[curr_id])
-                neighbors = sorted(list(graph.adj.get(curr_id, set())), reverse=True)
-                for neighbor in neighbors:
-                    if neighbor not in visited:
-                        stack.append(neighbor)
-        return order
+            curr, depth, parent = stack.pop()
+            if not visited[curr]:
+                visited[curr] = 1
+                yield VisitEvent(node_list[curr], depth, node_list[parent] if parent != -1 else None)
+                # Büyükten küçüğe yığına at ki küçük uni_id önce ziyaret edilsin
+                for j in range(offsets[curr + 1] - 1, offsets[curr] - 1, -1):
+                    neighbor = targets[j]
+                    if not visited[neighbor]:
+                        stack.append((neighbor, depth + 1, curr))
+
+    def execute(self, graph, start_id, end_node_id=None):
+        return [event.node for event in self.iterate(graph, start_id)]
 
 class ColoringStrategy(ABC):
     """Renklendirme algoritmaları için özel arayüz (Interface)"""
     @abstractmethod
     def execute(self, graph):
         pass
-
-class WelshPowellAlgorithm(ColoringStrategy):
-    """Somut Welsh-Powell Stratejisi"""
-    def execute(self, graph):
-        # Graph sınıfındaki mantığı çağırır
-        return graph.welsh_powell_coloring()
\ No newline at end of file
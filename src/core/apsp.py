@@ -0,0 +1,119 @@
+import json
+import os
+
+import numpy as np
+
+from .csr import shortest_path_tree
+from .parallel import map_over_graph
+
+# Mesafe ve öncül matrislerinin toplamda kaplayabileceği en fazla bayt (daha büyük graflarda önhesaplama yapılmaz)
+MAX_MATRIX_BYTES = 2 * 1024 ** 3
+
+
+class AllPairsShortestPaths:
+    """
+    Tüm çiftler için en kısa yol önhesaplaması.
+    Her üniversiteden tek kaynaklı Dijkstra süreç havuzunda çalıştırılır; mesafe ve öncül
+    matrisleri veritabanının yanına bellek eşlemeli (.npy) dosyalar olarak yazılır.
+    Sorgular matristen yol uzunluğu kadar adımda cevaplanır.
+    """
+
+    def __init__(self, base_path):
+        self.dist_path = base_path + "_dist.npy"
+        self.pred_path = base_path + "_pred.npy"
+        self.meta_path = base_path + "_meta.json"
+
+        self.dist = None
+        self.pred = None
+        self.fingerprint = None
+        self.version = None  # Hangi graf sürümü için geçerli olduğu
+        self._csr = None
+
+    @classmethod
+    def for_database(cls, db_path):
+        return cls(os.path.join(os.path.dirname(os.path.abspath(db_path)), "apsp"))
+
+    @staticmethod
+    def estimated_bytes(n):
+        """n düğüm için mesafe (float64) ve öncül (int32) matrislerinin toplam boyutu."""
+        return n * n * (np.dtype(np.float64).itemsize + np.dtype(np.int32).itemsize)
+
+    def build(self, graph, processes=None):
+        """
+        Matrisleri baştan hesaplar ve diske yazar. graph bir CSR görüntüsü de olabilir; matrisler
+        görüntünün sürümüne ait sayılır. Boyut MAX_MATRIX_BYTES'ı aşarsa ValueError fırlatır.
+        """
+        csr = graph.freeze()
+        # Sürüm ve özet hesaptan önce alınır: hesap sürerken graf değişirse matris eski sayılır
+        version, fingerprint = csr.version, csr.fingerprint()
+        n = len(csr)
+        if self.estimated_bytes(n) > MAX_MATRIX_BYTES:
+            raise ValueError(f"{n} düğüm için matrisler {self.estimated_bytes(n):,} bayt tutar "
+                             f"(sınır {MAX_MATRIX_BYTES:,} bayt).")
+
+        self.close()
+        dist = np.lib.format.open_memmap(self.dist_path, mode='w+', dtype=np.float64, shape=(n, n))
+        pred = np.lib.format.open_memmap(self.pred_path, mode='w+', dtype=np.int32, shape=(n, n))
+
+        # Satırlar geldikçe diske yazılır; tüm matris bellekte tutulmaz
+        results = map_over_graph(csr, shortest_path_tree, range(n), processes=processes)
+        for source, (distances, predecessors) in enumerate(results):
+            dist[source] = np.frombuffer(distances, dtype=np.float64)
+            pred[source] = np.frombuffer(predecessors, dtype=np.int64)
+
+        dist.flush()
+        pred.flush()
+        del dist, pred
+
+        # Meta dosyası en son yazılır: yarım kalmış bir hesaplama taze sayılmaz
+        self.fingerprint = fingerprint
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": self.fingerprint, "node_count": n}, f)
+
+        self._open(csr, version)
+
+    def load(self, graph):
+        """Diskteki matrisler mevcut grafla uyumluysa açar. Başarılıysa True döner."""
+        if not all(os.path.exists(p) for p in (self.dist_path, self.pred_path, self.meta_path)):
+            return False
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        csr = graph.freeze()
+        if meta.get("fingerprint") != csr.fingerprint():
+            return False
+
+        self.fingerprint = meta["fingerprint"]
+        self._open(csr, graph.version)
+        return True
+
+    def _open(self, csr, version):
+        self.dist = np.load(self.dist_path, mmap_mode='r')
+        self.pred = np.load(self.pred_path, mmap_mode='r')
+        self._csr = csr
+        self.version = version
+
+    def close(self):
+        self.dist = None
+        self.pred = None
+        self._csr = None
+        self.version = None
+
+    def is_fresh(self, graph):
+        """Graf, matrisler hesaplandığından beri değişmediyse True."""
+        return self.dist is not None and self.version == graph.version
+
+    def query(self, start_id, end_id):
+        """(maliyet, [Node...]) döndürür; PathFindingAlgorithm ile aynı sözleşme."""
+        csr = self._csr
+        if start_id not in csr.index or end_id not in csr.index:
+            return float('inf'), []
+
+        start, end = csr.index[start_id], csr.index[end_id]
+        cost = float(self.dist[start, end])
+        if cost == float('inf'):
+            return float('inf'), []
+        return cost, csr.build_path(self.pred[start], end)
@@ -0,0 +1,306 @@
+UNIVERSITY_COLUMNS = ("uni_id", "adi", "sehir", "ilce", "kurulus_yil", "ogrenci_sayisi",
+                      "fakulte_sayisi", "akademik_sayisi", "tr_siralama")
+# Üniversiteler tablosuyla aynı sütun tipleri: metin olarak gelen sayılar SQLite tarafından dönüştürülür
+_COLUMN_TYPES = ("INTEGER", "TEXT", "TEXT", "TEXT", "INTEGER", "INTEGER", "TEXT", "INTEGER", "INTEGER")
+REQUIRED_FIELDS = ("adi", "sehir", "ilce", "tr_siralama")
+
+# Zorunlu alanlarından biri boş (NULL, '' veya 0) olan hazırlık satırları
+_INCOMPLETE = " OR ".join(f"COALESCE({field}, '') IN ('', 0)" for field in REQUIRED_FIELDS)
+
+_STAGING_TABLES = {
+    "hazirlik_universiteler": "CREATE TEMP TABLE hazirlik_universiteler (satir INTEGER PRIMARY KEY, "
+                              + ", ".join(f"{c} {t}" for c, t in zip(UNIVERSITY_COLUMNS, _COLUMN_TYPES)) + ")",
+    # Kimlikleri bilinen ilişkiler, (küçük_id, büyük_id) biçiminde ve tekil
+    "hazirlik_iliskiler": "CREATE TEMP TABLE hazirlik_iliskiler (source_id INTEGER, target_id INTEGER, "
+                          "PRIMARY KEY (source_id, target_id)) WITHOUT ROWID",
+    # Kaynağı dosyadaki satır olan ilişkiler (satırın id'si birleştirme sırasında belli olur)
+    "hazirlik_satir_iliskileri": "CREATE TEMP TABLE hazirlik_satir_iliskileri (satir INTEGER, target_id INTEGER)",
+    # Birleştirilen her satırın aldığı id (satır ilişkileri sonraki parçalarda çözülebilsin diye)
+    "hazirlik_satir_id": "CREATE TEMP TABLE hazirlik_satir_id (satir INTEGER PRIMARY KEY, uni_id INTEGER)",
+}
+_STAGING_INDEXES = (
+    "CREATE INDEX temp.hazirlik_id ON hazirlik_universiteler (uni_id)",
+    "CREATE INDEX temp.hazirlik_siralama ON hazirlik_universiteler (tr_siralama)",
+)
+
+
+class ImportReport:
+    """
+    İçe aktarma sonucu: hatalar ve uyarılar (ilk hatada durulmaz) ve sayaçlar.
+    Çok büyük dosyalarda bellek sınırlı kalsın diye en fazla MAX_MESSAGES mesaj saklanır; sayılar tamdır.
+    """
+
+    MAX_MESSAGES = 10_000
+
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+        self.error_count = 0
+        self.warning_count = 0
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.relations = 0
+
+    @property
+    def ok(self):
+        return not self.error_count
+
+    def error(self, message):
+        self.error_count += 1
+        if len(self.errors) < self.MAX_MESSAGES:
+            self.errors.append(message)
+
+    def warning(self, message):
+        self.warning_count += 1
+        if len(self.warnings) < self.MAX_MESSAGES:
+            self.warnings.append(message)
+
+    def summary(self, limit=20):
+        """Kullanıcıya gösterilecek kısa metin; hatalar limit adetle sınırlanır."""
+        if self.error_count:
+            lines = [f"{self.error_count} hata bulundu, hiçbir kayıt eklenmedi."] + self.errors[:limit]
+            if self.error_count > limit:
+                lines.append(f"... ve {self.error_count - limit} hata daha")
+            return "\n".join(lines)
+
+        lines = [f"Başarılı! {self.inserted} üniversite eklendi, {self.updated} güncellendi, "
+                 f"{self.relations} bağlantı kuruldu."]
+        if self.skipped:
+            lines.append(f"{self.skipped} eksik satır atlandı.")
+        if self.warning_count:
+            lines.append(f"{self.warning_count} uyarı var (ayrıntılara bakın).")
+        return "\n".join(lines)
+
+    def details(self):
+        """Saklanan tüm hata ve uyarılar."""
+        lines = self.errors + self.warnings
+        hidden = self.error_count + self.warning_count - len(lines)
+        if hidden:
+            lines.append(f"... ve {hidden} mesaj daha")
+        return "\n".join(lines)
+
+
+class ImportDelta:
+    """
+    İçe aktarmanın veritabanında değiştirdikleri; graf yeniden yüklenmek yerine yalnızca bunları
+    uygular (DataLoader.apply_delta). İçe aktarma kayıt silmez, yalnızca ekler ya da günceller.
+    İlişkiler (küçük_id, büyük_id) biçimindedir.
+    """
+
+    def __init__(self):
+        self.inserted = set()
+        self.updated = set()
+        self.added_relations = set()
+
+    def __bool__(self):
+        return bool(self.inserted or self.updated or self.added_relations)
+
+
+class ImportFailed(Exception):
+    """Doğrulama hataları; işlem geri alınmalıdır. Tüm hatalar report içindedir."""
+
+    def __init__(self, report):
+        super().__init__(report.summary())
+        self.report = report
+
+
+class BulkImporter:
+    """
+    Toplu içe aktarma: satırlar geçici (temp) hazırlık tablolarına executemany ile yazılır,
+    doğrulamalar (eksik alan, geçersiz sıralama, sıralama çakışması, tanımsız ilişki) her biri
+    hazırlanan tüm satırlar için tek bir SQL sorgusuyla yapılır, sonra birleştirilir.
+    Hatalar ilk hatada durmadan toplanır; hata varsa ImportFailed fırlatılır ve çağıranın
+    açtığı işlem (db.transaction) geri alınır.
+
+    Kullanım: db.transaction() içinde begin(), stage_*(), finish(). Büyük dosyalar parça parça
+    işlenebilir: her parça için stage_universities() + merge_universities() (tercihen ayrı bir
+    SAVEPOINT içinde), ilişkiler için stage_*_relations() + merge_relations(), en sonda finish().
+    Eklenen/güncellenen üniversiteler ve eklenen ilişkiler self.delta'da (ImportDelta) toplanır.
+    update_columns: uni_id zaten varsa güncellenecek sütunlar.
+    skip_incomplete: eksik satırlar hata yerine atlanır (CSV davranışı).
+    """
+
+    def __init__(self, conn, update_columns=UNIVERSITY_COLUMNS[1:], skip_incomplete=False):
+        self.conn = conn
+        self.update_columns = update_columns
+        self.skip_incomplete = skip_incomplete
+        self.report = ImportReport()
+        self.delta = ImportDelta()
+        self.rows_staged = 0
+
+    def begin(self):
+        self._drop_staging()
+        for sql in _STAGING_TABLES.values():
+            self.conn.execute(sql)
+        for sql in _STAGING_INDEXES:
+            self.conn.execute(sql)
+
+    def _drop_staging(self):
+        for table in _STAGING_TABLES:
+            self.conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+
+    # --- Hazırlık ---
+    def stage_universities(self, rows):
+        """
+        rows: UNIVERSITY_COLUMNS sırasında demetler. Satır numaraları eklenme sırasıyla 1'den
+        başlar (rapordaki 'Satır N'); verilen satır numaraları döndürülür.
+        """
+        start = self.rows_staged + 1
+        rows = list(rows)
+        self.conn.executemany(
+            f"INSERT INTO hazirlik_universiteler VALUES (?, {', '.join('?' * len(UNIVERSITY_COLUMNS))})",
+            ((start + k,) + tuple(row) for k, row in enumerate(rows)))
+        self.rows_staged += len(rows)
+        return range(start, start + len(rows))
+
+    def stage_relations(self, pairs):
+        """Kimlikleri bilinen ilişkiler: bellekte (küçük, büyük) biçimine getirilip tekilleştirilir."""
+        canonical = {(u, v) if u < v else (v, u) for u, v in pairs if u != v}
+        self.conn.executemany("INSERT OR IGNORE INTO hazirlik_iliskiler VALUES (?, ?)", canonical)
+
+    def stage_row_relations(self, pairs):
+        """(satır numarası, hedef id) çiftleri: kaynak, o satırdaki üniversitedir."""
+        self.conn.executemany("INSERT INTO hazirlik_satir_iliskileri VALUES (?, ?)", pairs)
+
+    # --- Doğrulama ---
+    def _label(self, row_no, name):
+        return f"Satır {row_no} ({name or 'Bilinmiyor'})"
+
+    def _check_fields(self):
+        conn = self.conn
+        if self.skip_incomplete:
+            self.report.skipped += conn.execute(f"DELETE FROM hazirlik_universiteler WHERE {_INCOMPLETE}").rowcount
+        else:
+            for row_no, name in conn.execute(f"SELECT satir, adi FROM hazirlik_universiteler WHERE {_INCOMPLETE}"):
+                self.report.error(f"{self._label(row_no, name)}: eksik alan")
+
+        for row_no, name, ranking in conn.execute(
+                "SELECT satir, adi, tr_siralama FROM hazirlik_universiteler "
+                f"WHERE typeof(tr_siralama) != 'integer' AND NOT ({_INCOMPLETE})"):
+            self.report.error(f"{self._label(row_no, name)}: geçersiz sıralama '{ranking}'")
+
+    def _assign_ids(self):
+        """id'siz satırlara mevcut ve hazırlanan en büyük id'den sonra gelen id'ler verilir (satır sırasıyla)."""
+        base = self.conn.execute("""
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'Üniversiteler'), 0),
+                       COALESCE((SELECT MAX(uni_id) FROM Üniversiteler), 0),
+                       COALESCE((SELECT MAX(uni_id) FROM hazirlik_universiteler), 0))
+        """).fetchone()[0]
+        # Numaralar Python'da verilir: UPDATE ... FROM ve ROW_NUMBER() eski SQLite sürümlerinde yok
+        rows = self.conn.execute("SELECT satir FROM hazirlik_universiteler WHERE uni_id IS NULL ORDER BY satir")
+        self.conn.executemany("UPDATE hazirlik_universiteler SET uni_id = ? WHERE satir = ?",
+                              ((base + k, row_no) for k, (row_no,) in enumerate(rows.fetchall(), 1)))
+
+    def _collapse_duplicates(self):
+        """Aynı uni_id birden çok satırda geçiyorsa (sıralı eklemede olduğu gibi) son satır geçerlidir."""
+        self.conn.execute("""
+            DELETE FROM hazirlik_universiteler WHERE satir NOT IN (
+                SELECT MAX(satir) FROM hazirlik_universiteler GROUP BY uni_id)
+        """)
+
+    def _check_rankings(self):
+        conn = self.conn
+
+        # Aynı parçada aynı sıralamayı paylaşan satırlar
+        for ranking, rows in conn.execute("""
+                SELECT tr_siralama, GROUP_CONCAT(satir, ', ') FROM hazirlik_universiteler
+                WHERE typeof(tr_siralama) = 'integer' GROUP BY tr_siralama HAVING COUNT(*) > 1"""):
+            self.report.error(f"Sıralama Çakışması: {ranking}. sıra dosyada birden çok satırda (Satır {rows}).")
+
+        # Veritabanında bu içe aktarmayla değişmeyecek bir üniversiteyle (önceki parçalar dahil) çakışanlar
+        for row_no, name, ranking, owner in conn.execute("""
+                SELECT h.satir, h.adi, h.tr_siralama, u.adi
+                FROM hazirlik_universiteler h JOIN Üniversiteler u ON u.tr_siralama = h.tr_siralama
+                WHERE u.uni_id != h.uni_id
+                  AND u.uni_id NOT IN (SELECT uni_id FROM hazirlik_universiteler)
+                ORDER BY h.satir"""):
+            self.report.error(
+                f"{self._label(row_no, name)}: Sıralama Çakışması: {ranking}. sıra zaten '{owner}' üniversitesine ait.")
+
+    # --- Birleştirme ---
+    def merge_universities(self):
+        """
+        Hazırlanan üniversiteleri doğrulayıp tabloya yazar ve hazırlık tablosunu boşaltır.
+        Bu parçada hata varsa hiçbir şey yazmadan ImportFailed fırlatır (hatalar rapora eklenir).
+        """
+        conn = self.conn
+        report = self.report
+        errors_before = report.error_count
+
+        self._check_fields()
+        self._assign_ids()
+        conn.execute("INSERT OR REPLACE INTO hazirlik_satir_id SELECT satir, uni_id FROM hazirlik_universiteler")
+        self._collapse_duplicates()
+        self._check_rankings()
+        if report.error_count != errors_before:
+            raise ImportFailed(report)
+
+        inserted, updated = [], []
+        for uni_id, exists in conn.execute("""
+            SELECT h.uni_id, u.uni_id IS NOT NULL
+            FROM hazirlik_universiteler h LEFT JOIN Üniversiteler u ON u.uni_id = h.uni_id
+        """):
+            (updated if exists else inserted).append(uni_id)
+
+        columns = ", ".join(UNIVERSITY_COLUMNS)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in self.update_columns)
+        conn.execute(f"""
+            INSERT INTO Üniversiteler ({columns})
+            SELECT {columns} FROM hazirlik_universiteler WHERE true ORDER BY satir
+            ON CONFLICT(uni_id) DO UPDATE SET {updates}
+        """)
+        conn.execute("DELETE FROM hazirlik_universiteler")
+
+        report.inserted += len(inserted)
+        report.updated += len(updated)
+        self.delta.inserted.update(inserted)
+        # Önceki bir parçada eklenen satır bu parçada güncellendiyse graf için hâlâ yeni bir düğümdür
+        self.delta.updated.update(uni_id for uni_id in updated if uni_id not in self.delta.inserted)
+
+    def merge_relations(self):
+        """
+        Satır ilişkilerini birleştirilmiş satırların id'lerine çevirir, uçlarından biri olmayan
+        ilişkileri uyarıyla atlar, kalanları Iliskiler tablosuna ekler ve hazırlık tablolarını boşaltır.
+        Üniversiteler önceden birleştirilmiş olmalıdır.
+        """
+        conn = self.conn
+        # Atlanan satırların ilişkileri de düşer (satırın id'si yok)
+        conn.execute("""
+            INSERT OR IGNORE INTO hazirlik_iliskiler
+            SELECT MIN(m.uni_id, r.target_id), MAX(m.uni_id, r.target_id)
+            FROM hazirlik_satir_iliskileri r JOIN hazirlik_satir_id m ON m.satir = r.satir
+            WHERE m.uni_id != r.target_id
+        """)
+        conn.execute("DELETE FROM hazirlik_satir_iliskileri")
+
+        condition = ("NOT EXISTS (SELECT 1 FROM Üniversiteler WHERE uni_id = source_id) "
+                     "OR NOT EXISTS (SELECT 1 FROM Üniversiteler WHERE uni_id = target_id)")
+        for s, t in conn.execute(f"SELECT source_id, target_id FROM hazirlik_iliskiler WHERE {condition}"):
+            self.report.warning(f"İlişki {s}-{t} atlandı: üniversite bulunamadı.")
+        conn.execute(f"DELETE FROM hazirlik_iliskiler WHERE {condition}")
+
+        # Zaten var olan ilişkiler düşülür; kalanlar gerçekten eklenenlerdir (fark için okunur)
+        conn.execute("""
+            DELETE FROM hazirlik_iliskiler WHERE EXISTS (
+                SELECT 1 FROM Iliskiler i
+                WHERE i.source_id = hazirlik_iliskiler.source_id AND i.target_id = hazirlik_iliskiler.target_id)
+        """)
+        added = conn.execute("SELECT source_id, target_id FROM hazirlik_iliskiler").fetchall()
+        conn.execute(
+            "INSERT OR IGNORE INTO Iliskiler (source_id, target_id) SELECT source_id, target_id FROM hazirlik_iliskiler")
+        conn.execute("DELETE FROM hazirlik_iliskiler")
+
+        self.report.relations += len(added)
+        self.delta.added_relations.update(added)
+
+    def finish(self):
+        """Kalan hazırlık satırlarını birleştirir; önceki parçalarda hata olduysa ImportFailed fırlatır."""
+        try:
+            self.merge_universities()
+            self.merge_relations()
+            if self.report.error_count:
+                raise ImportFailed(self.report)
+            return self.report
+        finally:
+            self._drop_staging()
@@ -0,0 +1,218 @@
+import heapq
+import math
+
+import numpy as np
+
+from .parallel import default_processes, map_over_graph
+
+
+def _accumulate(arrays, sources):
+    """
+    Verilen kaynak düğümlerden ağırlıklı Brandes taraması yapar ve kısmi toplamları döndürür:
+    (arasındalık katkıları, mesafe toplamları, ters mesafe toplamları, ulaşan kaynak sayıları).
+    Dizilerin i. elemanı i. düğüme aittir. Süreç havuzunda çalıştığı için modül seviyesindedir.
+    """
+    offsets, targets, weights = arrays
+    n = len(offsets) - 1
+    betweenness = [0.0] * n
+    distance_sum = [0.0] * n
+    harmonic = [0.0] * n
+    reach = [0] * n
+
+    for source in sources:
+        # Dijkstra: kesinleşme sırası, en kısa yol sayıları (sigma) ve öncüller
+        settled = {}
+        seen = {source: 0.0}
+        sigma = {source: 0.0}
+        predecessors = {source: []}
+        order = []
+        queue = [(0.0, source, source)]
+        while queue:
+            cost, current, parent = heapq.heappop(queue)
+            if current in settled:
+                continue
+            sigma[current] += sigma[parent] if current != source else 1.0
+            order.append(current)
+            settled[current] = cost
+
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                new_cost = cost + weights[j]
+                if neighbor in settled:
+                    continue
+                if neighbor not in seen or new_cost < seen[neighbor]:
+                    seen[neighbor] = new_cost
+                    sigma[neighbor] = 0.0
+                    predecessors[neighbor] = [current]
+                    heapq.heappush(queue, (new_cost, neighbor, current))
+                elif new_cost == seen[neighbor]:
+                    sigma[neighbor] += sigma[current]
+                    predecessors[neighbor].append(current)
+
+        # Bağımlılıklar en uzaktan kaynağa doğru geri toplanır
+        dependency = dict.fromkeys(order, 0.0)
+        for w in reversed(order):
+            coefficient = (1.0 + dependency[w]) / sigma[w]
+            for v in predecessors[w]:
+                dependency[v] += sigma[v] * coefficient
+            if w != source:
+                betweenness[w] += dependency[w]
+                cost = settled[w]
+                distance_sum[w] += cost
+                harmonic[w] += 1.0 / cost if cost > 0 else 0.0
+                reach[w] += 1
+
+    return betweenness, distance_sum, harmonic, reach
+
+
+def sample_size(n, epsilon, delta=0.1):
+    """
+    Rastgele pivot sayısı: Hoeffding eşitsizliği ve tüm düğümler için birleşim sınırı ile
+    normalize arasındalık tahminleri 1 - delta olasılıkla gerçek değerden en fazla epsilon sapar.
+    """
+    if n < 2:
+        return n
+    return min(n, math.ceil(math.log(2 * n / delta) / (2 * epsilon ** 2)))
+
+
+class CentralityEngine:
+    """
+    Ağırlıklı (Edge.weight = mesafe) arasındalık (Brandes), yakınlık ve harmonik merkezilik.
+    Kaynak düğümler parçalara bölünüp süreç havuzunda taranır, kısmi sonuçlar toplanır.
+    samples ya da epsilon verilirse yalnızca rastgele seçilen pivotlardan tarama yapılır ve
+    değerler ölçeklenerek tahmin edilir (yaklaşık mod).
+    """
+
+    METRICS = ("betweenness", "closeness", "harmonic")
+
+    def __init__(self, samples=None, epsilon=None, delta=0.1, seed=42, processes=None):
+        self.samples = samples
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.processes = processes
+
+        self.pivot_count = 0
+        self.exact = True
+
+    def _pivots(self, n):
+        k = n
+        if self.samples is not None:
+            k = min(n, self.samples)
+        elif self.epsilon is not None:
+            k = sample_size(n, self.epsilon, self.delta)
+
+        self.pivot_count = k
+        self.exact = k >= n
+        if self.exact:
+            return list(range(n))
+        rng = np.random.default_rng(self.seed)
+        return sorted(rng.choice(n, size=k, replace=False).tolist())
+
+    def run(self, csr):
+        """{metrik: CSR indeks sırasıyla np.ndarray} döndürür."""
+        n = len(csr)
+        pivots = self._pivots(n)
+
+        processes = self.processes
+        if processes is None:
+            processes = default_processes()
+        parts = max(1, min(len(pivots), processes * 4))
+        chunks = [chunk.tolist() for chunk in np.array_split(np.array(pivots, dtype=np.int64), parts)]
+
+        totals = np.zeros((4, n))
+        for partial in map_over_graph(csr, _accumulate, chunks, processes):
+            totals += np.array(partial, dtype=np.float64)
+        betweenness, distance_sum, harmonic, reach = totals
+
+        # Yaklaşık modda pivotlardan elde edilen toplamlar tüm kaynaklara ölçeklenir
+        scale = n / len(pivots) if pivots else 1.0
+        betweenness *= scale
+        distance_sum *= scale
+        harmonic *= scale
+        reach *= scale
+
+        if n > 2:
+            betweenness /= (n - 1) * (n - 2)
+
+        # Wasserman-Faust: bağlantısız graflarda ulaşılabilen düğüm oranıyla düzeltilmiş yakınlık
+        closeness = np.zeros(n)
+        reachable = distance_sum > 0
+        if n > 1:
+            closeness[reachable] = (reach[reachable] / distance_sum[reachable]) * (reach[reachable] / (n - 1))
+
+        return {"betweenness": betweenness, "closeness": closeness, "harmonic": harmonic}
+
+
+class PowerIterationCentrality:
+    """
+    PageRank ve özvektör (eigenvector) merkeziliği, ağırlıklı komşuluk matrisi üzerinde kuvvet
+    yinelemesi (power iteration) ile. Matris CSR dizileridir; her yineleme tek bir seyrek
+    matris-vektör çarpımıdır (np.bincount), düğümler üzerinde Python döngüsü yoktur.
+    Son skorlar saklanır: graf az değiştiyse yineleme önceki skorlardan başlar (sıcak başlangıç).
+    """
+
+    METRICS = ("pagerank", "eigenvector")
+
+    def __init__(self, alpha=0.85, tolerance=1e-10, max_iter=500):
+        self.alpha = alpha
+        self.tolerance = tolerance
+        self.max_iter = max_iter
+
+        self._previous = {}  # {metrik: (uni_id dizisi, skorlar)}
+        self.iterations = 0
+
+    def _start_vector(self, metric, csr):
+        n = len(csr)
+        start = np.full(n, 1.0 / n)
+        if metric not in self._previous:
+            return start
+
+        # Önceki skorlar uni_id üzerinden yeni indekslere taşınır; yeni düğümler 1/n ile başlar
+        old_ids, old_scores = self._previous[metric]
+        ids = np.array(csr.ids)
+        if old_ids.size == 0 or ids.dtype.kind not in "iu":
+            return start
+        positions = np.clip(np.searchsorted(old_ids, ids), 0, old_ids.size - 1)
+        found = old_ids[positions] == ids
+        start[found] = old_scores[positions[found]]
+        return start / start.sum()
+
+    def run(self, csr, metric="pagerank"):
+        """Skorları CSR indeks sırasıyla np.ndarray olarak döndürür (toplamları 1)."""
+        n = len(csr)
+        if n == 0:
+            return np.zeros(0)
+
+        offsets, targets, weights, rows = csr.numpy_arrays()
+        x = self._start_vector(metric, csr)
+
+        if metric not in self.METRICS:
+            raise ValueError(f"Bilinmeyen metrik: {metric}")
+        strength = np.bincount(rows, weights=weights, minlength=n)
+        dangling = strength == 0
+        inverse_strength = np.where(dangling, 0.0, 1.0 / np.where(dangling, 1.0, strength))
+
+        # Özvektör için kaydırma: A + cI (c = en büyük düğüm ağırlığı ≥ spektral yarıçap) negatif
+        # özdeğer içermez; iki parçalıya yakın graflarda yineleme salınmaz, özvektörler aynıdır
+        shift = float(strength.max())
+
+        self.iterations = 0
+        for self.iterations in range(1, self.max_iter + 1):
+            if metric == "pagerank":
+                # x'[i] = α Σ_j w_ij x_j / s_j + (α · asılı düğümlerin payı + 1 - α) / n
+                spread = np.bincount(rows, weights=weights * (x * inverse_strength)[targets], minlength=n)
+                new_x = self.alpha * spread + (self.alpha * x[dangling].sum() + 1 - self.alpha) / n
+            else:
+                new_x = shift * x + np.bincount(rows, weights=weights * x[targets], minlength=n)
+            total = new_x.sum()
+            if total > 0:
+                new_x /= total
+
+            converged = np.abs(new_x - x).sum() < n * self.tolerance
+            x = new_x
+            if converged:
+                break
+
+        self._previous[metric] = (np.array(csr.ids), x.copy())
+        return x
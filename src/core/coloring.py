@@ -0,0 +1,251 @@
+import heapq
+
+import numpy as np
+
+from .algorithms import ColoringStrategy
+
+
+def _as_dict(csr, order, colors):
+    """{uni_id: renk} sözlüğü, düğümlerin boyanma sırasıyla."""
+    return dict(zip(map(csr.ids.__getitem__, order), map(colors.__getitem__, order)))
+
+
+def degree_order(csr):
+    """
+    Düğüm indekslerini dereceye göre azalan sırada döndürür (kova sıralaması, O(n + maks_derece)).
+    Aynı derecedeki düğümler indeks sırasını korur.
+    """
+    degrees = np.diff(csr.numpy_arrays()[0]).tolist()
+    buckets = [[] for _ in range(max(degrees, default=0) + 1)]
+    append = [bucket.append for bucket in buckets]
+    for i, degree in enumerate(degrees):
+        append[degree](i)
+
+    order = []
+    for bucket in reversed(buckets):
+        order.extend(bucket)
+    return order
+
+
+class WelshPowellAlgorithm(ColoringStrategy):
+    """
+    Welsh-Powell: düğümler dereceye göre azalan sırada, komşularında kullanılmayan en küçük
+    renkle boyanır. Yasak renkler her düğüm için yeniden kurulan bir küme yerine tek bir dizide
+    düğüm damgasıyla (stamp) işaretlenir; dizi hiç temizlenmez.
+    """
+    def execute(self, graph):
+        csr = graph.freeze()
+        offsets, targets = csr.offsets, csr.targets
+        order = degree_order(csr)
+
+        colors = [0] * len(csr)  # 0 = henüz boyanmadı
+        forbidden = [-1] * (len(order) + 2)  # forbidden[renk] == i ise renk i. düğümün komşusunda var
+        for i in order:
+            for neighbor in targets[offsets[i]:offsets[i + 1]]:
+                forbidden[colors[neighbor]] = i
+            color = 1
+            while forbidden[color] == i:
+                color += 1
+            colors[i] = color
+        return _as_dict(csr, order, colors)
+
+
+class DSaturAlgorithm(ColoringStrategy):
+    """
+    DSatur: her adımda komşularında en çok farklı renk bulunan (doygunluğu en yüksek) düğüm
+    boyanır; eşitlikte derecesi yüksek olan seçilir. Genelde Welsh-Powell'dan daha az renk kullanır.
+    Komşu renk kümeleri bit maskesi (Python int) olarak tutulur; öncelikler tembel güncellenen bir
+    yığındadır. Yığın kaydı tek bir tamsayıdır: -(doygunluk, derece) önceliği ve düğüm indeksi.
+    """
+    def execute(self, graph):
+        csr = graph.freeze()
+        offsets, targets = csr.offsets, csr.targets
+        n = len(csr)
+        degrees = np.diff(csr.numpy_arrays()[0]).tolist()
+        stride = max(degrees, default=0) + 1
+
+        colors = [0] * n
+        masks = [1] * n  # bit c: komşularda c rengi var (0. bit boyanmamışı temsil eder, hep dolu)
+        saturation = [0] * n
+        queue = [-degrees[i] * n + i for i in range(n)]
+        heapq.heapify(queue)
+
+        order = []
+        while queue:
+            key = heapq.heappop(queue)
+            i = key % n
+            if colors[i] or key // n != -(saturation[i] * stride + degrees[i]):
+                continue  # Eski kayıt
+
+            # Maskedeki en düşük sıfır bit: kullanılabilecek en küçük renk
+            mask = masks[i]
+            color = (~mask & (mask + 1)).bit_length() - 1
+            colors[i] = color
+            order.append(i)
+
+            bit = 1 << color
+            for neighbor in targets[offsets[i]:offsets[i + 1]]:
+                if not colors[neighbor] and not masks[neighbor] & bit:
+                    masks[neighbor] |= bit
+                    saturation[neighbor] += 1
+                    heapq.heappush(queue, -(saturation[neighbor] * stride + degrees[neighbor]) * n + neighbor)
+        return _as_dict(csr, order, colors)
+
+
+class ColoringSession:
+    """
+    Mevcut renklendirmeyi graf düzenlemeleri boyunca geçerli tutar. Graf değiştirildikten
+    sonra ilgili metot çağrılır; yalnızca etkilenen düğümler yeniden boyanır ve değişiklikler
+    {uni_id: renk} sözlüğü (fark) olarak döndürülür. Silinen düğümlerin değeri None'dır.
+    compact=True ise silmelerden sonra renkler mümkün olduğunca küçültülür ve boş kalan
+    renk numaraları kapatılır.
+    """
+
+    def __init__(self, graph, coloring, compact=True, max_blockers=2, budget=2000):
+        self.graph = graph
+        self.colors = dict(coloring)
+        self.compact = compact
+        self.max_blockers = max_blockers  # Yerel aramada bir rengi kullanan en fazla komşu sayısı
+        self.budget = budget  # Yerel aramada taranacak en fazla komşu sayısı
+
+        # {renk: o renkteki düğüm sayısı}
+        self.class_sizes = {}
+        for color in self.colors.values():
+            self.class_sizes[color] = self.class_sizes.get(color, 0) + 1
+
+    def color_count(self):
+        return len(self.class_sizes)
+
+    def _set(self, node_id, color, diff):
+        old = self.colors.get(node_id)
+        if old == color:
+            return
+        if old is not None:
+            self.class_sizes[old] -= 1
+            if not self.class_sizes[old]:
+                del self.class_sizes[old]
+        if color is None:
+            self.colors.pop(node_id, None)
+        else:
+            self.colors[node_id] = color
+            self.class_sizes[color] = self.class_sizes.get(color, 0) + 1
+        diff[node_id] = color
+
+    def _neighbor_colors(self, node_id):
+        colors = self.colors
+        return {colors[nb] for nb in self.graph.adj.get(node_id, ()) if nb in colors and nb != node_id}
+
+    def _smallest_free(self, node_id, limit=None, exclude=None):
+        """Komşularda olmayan en küçük renk; limit verilirse ondan büyük renk aranmaz."""
+        used = self._neighbor_colors(node_id)
+        if exclude is not None:
+            used.add(exclude)
+        color = 1
+        while color in used:
+            color += 1
+        if limit is not None and color > limit:
+            return None
+        return color
+
+    def _local_recolor(self, node_id, diff):
+        """
+        Düğümü yeni renk açmadan yeniden boyamayı dener. Boş renk yoksa, bir rengi kullanan az
+        sayıdaki komşu (en fazla max_blockers) başka boş renklere taşınarak o renk açılır.
+        Başarılıysa True döner.
+        """
+        limit = max(self.class_sizes, default=0)
+        current = self.colors[node_id]
+        free = self._smallest_free(node_id, limit, exclude=current)
+        if free is not None:
+            self._set(node_id, free, diff)
+            return True
+
+        # Rengi kullanan komşular (engelleyiciler) renge göre gruplanır
+        blockers = {}
+        for nb in self.graph.adj.get(node_id, ()):
+            color = self.colors.get(nb)
+            if color is not None and color != current:
+                blockers.setdefault(color, []).append(nb)
+
+        budget = self.budget
+        for color in sorted(blockers, key=lambda c: len(blockers[c])):
+            group = blockers[color]
+            if len(group) > self.max_blockers:
+                break
+
+            # Düğüm bu rengi alınca engelleyiciler color ve diğer komşularının renkleri dışında bir renge geçmeli
+            moves = []
+            for nb in group:
+                budget -= len(self.graph.adj.get(nb, ()))
+                if budget < 0:
+                    return False
+                target = self._smallest_free(nb, limit, exclude=color)
+                if target is None:
+                    break
+                moves.append((nb, target))
+            else:
+                # Engelleyiciler aynı renkte olduğu için birbirine komşu değildir; taşımalar çakışmaz
+                for nb, target in moves:
+                    self._set(nb, target, diff)
+                self._set(node_id, color, diff)
+                return True
+        return False
+
+    def _lower(self, node_ids, diff):
+        """Düğümleri komşularında olmayan daha küçük bir renge indirir."""
+        for node_id in node_ids:
+            if node_id in self.colors:
+                color = self._smallest_free(node_id, self.colors[node_id] - 1)
+                if color is not None:
+                    self._set(node_id, color, diff)
+
+    def _close_gaps(self, diff):
+        """Boş kalan renk numaralarına en büyük numaralı renk sınıfı taşınır."""
+        if not self.class_sizes:
+            return
+        gaps = [c for c in range(1, len(self.class_sizes) + 1) if c not in self.class_sizes]
+        for gap in gaps:
+            top = max(self.class_sizes)
+            for node_id in [n for n, c in self.colors.items() if c == top]:
+                self._set(node_id, gap, diff)
+
+    def node_added(self, node_id):
+        """Yeni düğüm (kenarlarıyla birlikte eklendikten sonra) en küçük boş renkle boyanır."""
+        diff = {}
+        self._set(node_id, self._smallest_free(node_id), diff)
+        return diff
+
+    def edge_added(self, u_id, v_id):
+        """Uçlar aynı renkteyse derecesi küçük olan uçtan başlayarak yerel olarak yeniden boyanır."""
+        diff = {}
+        if u_id == v_id:
+            return diff
+        for node_id in (u_id, v_id):
+            if node_id not in self.colors:
+                self._set(node_id, self._smallest_free(node_id), diff)
+        if self.colors[u_id] != self.colors[v_id]:
+            return diff
+
+        ends = sorted((u_id, v_id), key=lambda n: len(self.graph.adj.get(n, ())))
+        for node_id in ends:
+            if self._local_recolor(node_id, diff):
+                return diff
+        self._set(ends[0], self._smallest_free(ends[0]), diff)
+        return diff
+
+    def edge_removed(self, u_id, v_id):
+        """Kenar silmek çakışma doğurmaz; compact ise uçlar daha küçük renklere indirilir."""
+        diff = {}
+        if self.compact:
+            self._lower((u_id, v_id), diff)
+            self._close_gaps(diff)
+        return diff
+
+    def node_removed(self, node_id, neighbors=()):
+        """neighbors: düğümün silinmeden önceki komşuları (compact için)."""
+        diff = {}
+        self._set(node_id, None, diff)
+        if self.compact:
+            self._lower(neighbors, diff)
+            self._close_gaps(diff)
+        return diff
@@ -0,0 +1,252 @@
+import numpy as np
+
+from .csr import entry_positions
+from .parallel import default_processes, graph_pool, pool_map
+
+# Bu kadar kayıttan (yönlü kenar) küçük graflarda süreç başlatmak hesaplamadan pahalıya gelir
+POOL_MIN_ENTRIES = 500_000
+
+
+def _label_sums(offsets, targets, weights, nodes, labels):
+    """
+    Verilen (sıralı) düğümlerin her biri için komşu etiketlerine (topluluklarına) giden toplam ağırlık.
+    Dönüş: (düğüm, etiket, ağırlık) dizileri, düğüm ve etiket sırasına göre. Öz döngüler sayılmaz.
+    """
+    positions, counts = entry_positions(offsets, nodes)
+    rows = np.repeat(nodes, counts)
+    neighbors = targets[positions]
+    keep = rows != neighbors
+    rows, neighbors, positions = rows[keep], neighbors[keep], positions[keep]
+    if rows.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+
+    n_labels = int(labels.max()) + 1
+    keys, inverse = np.unique(rows * n_labels + labels[neighbors], return_inverse=True)
+    sums = np.bincount(inverse, weights=weights[positions])
+    return keys // n_labels, keys % n_labels, sums
+
+
+def _pick_best(nodes, candidates, scores, preference):
+    """
+    Her düğüm için en yüksek puanlı aday; eşit puanlarda preference değeri büyük olan seçilir.
+    nodes sıralı olmalıdır (_label_sums çıktısı gibi); sıralama yapılmaz, tüm işlem doğrusaldır.
+    """
+    starts = np.flatnonzero(np.r_[True, nodes[1:] != nodes[:-1]])
+    counts = np.diff(np.append(starts, scores.size))
+    is_max = scores >= np.repeat(np.maximum.reduceat(scores, starts), counts)
+
+    ranked = np.where(is_max, preference, -np.inf)
+    is_best = ranked >= np.repeat(np.maximum.reduceat(ranked, starts), counts)
+    best = np.minimum.reduceat(np.where(is_best, np.arange(scores.size), scores.size), starts)
+    return nodes[best], candidates[best], scores[best]
+
+
+def _best_moves(arrays, task):
+    """
+    Louvain yerel taşıma adımı: verilen düğümlerin her biri için modülerlik kazancı en yüksek
+    komşu topluluk. Dönüş: kalmaktan daha iyi hamlesi olan (düğüm, topluluk) dizileri ve
+    bu hamlelerin tek tek uygulansalar getireceği toplam modülerlik artışı.
+    Süreç havuzunda da çalışabilmesi için modül seviyesinde tanımlıdır.
+    """
+    offsets, targets, weights, strength = arrays
+    nodes, communities, totals, total_weight, resolution = task
+
+    nodes, candidates, k_in = _label_sums(offsets, targets, weights, nodes, communities)
+    if nodes.size == 0:
+        return nodes, candidates, 0.0
+
+    # Düğüm kendi topluluğundan çıkarılmış gibi hesaplanır: tot(C) - k_i
+    k_i = strength[nodes]
+    own = candidates == communities[nodes]
+    tot = totals[candidates] - np.where(own, k_i, 0.0)
+    gains = k_in - resolution * tot * k_i / total_weight
+
+    # Mevcut toplulukta kalmanın puanı (topluluktaki komşu yoksa k_in = 0)
+    stay = -resolution * (totals[communities] - strength) * strength / total_weight
+    np.add.at(stay, nodes[own], k_in[own])
+
+    # Eşitlikte küçük numaralı topluluk seçilir (sonuç tekrarlanabilir olsun)
+    best_nodes, best_communities, best_gains = _pick_best(nodes, candidates, gains, -candidates.astype(np.float64))
+    improvement = best_gains - stay[best_nodes]
+    improving = improvement > 1e-12 * total_weight
+    return best_nodes[improving], best_communities[improving], 2 * float(improvement[improving].sum()) / total_weight
+
+
+def modularity(offsets, targets, weights, labels, resolution=1.0):
+    """Q = Σ_c [ iç_c / 2m - γ (tot_c / 2m)² ]; dizilerde her yönsüz kenar iki kez bulunur."""
+    total_weight = float(weights.sum())
+    if total_weight == 0:
+        return 0.0
+    rows = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+    inside = float(weights[labels[rows] == labels[targets]].sum())
+    totals = np.bincount(labels[rows], weights=weights)
+    return inside / total_weight - resolution * float((totals ** 2).sum()) / total_weight ** 2
+
+
+def _aggregate(offsets, targets, weights, communities, count):
+    """Her topluluğu tek düğüme indirger; iç kenarlar öz döngü olarak kalır."""
+    rows = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+    keys, inverse = np.unique(communities[rows] * count + communities[targets], return_inverse=True)
+    new_weights = np.bincount(inverse, weights=weights)
+    new_rows = keys // count
+    new_offsets = np.zeros(count + 1, dtype=np.int64)
+    new_offsets[1:] = np.cumsum(np.bincount(new_rows, minlength=count))
+    return new_offsets, keys % count, new_weights
+
+
+def _batches(active, batches, rng):
+    """Aktif düğümleri rastgele gruplara böler; her grup sıralı indeks dizisidir."""
+    nodes = rng.permutation(np.flatnonzero(active))
+    return [np.sort(part) for part in np.array_split(nodes, min(batches, max(1, nodes.size)))]
+
+
+def _activate_neighbors(offsets, targets, active, moved):
+    """Etiketi değişen düğümlerin komşuları bir sonraki turda yeniden değerlendirilir."""
+    positions, _ = entry_positions(offsets, moved)
+    active[targets[positions]] = True
+
+
+class LouvainCommunities:
+    """
+    Modülerlik tabanlı Louvain topluluk tespiti (ağırlık olarak Edge.weight).
+    Yerel taşıma adımında düğümler her turda rastgele gruplara bölünür: grup içindeki
+    hamleler tek vektörel işlemle hesaplanıp birlikte uygulanır, gruplar ise sırayla
+    işlenir. Yalnızca komşusu topluluk değiştiren düğümler tekrar değerlendirilir.
+    Büyük graflarda her grup süreç havuzundaki işçilere bölünür.
+    """
+
+    def __init__(self, resolution=1.0, seed=42, batches=16, max_sweeps=20, tolerance=1e-6, processes=None):
+        self.resolution = resolution
+        self.seed = seed
+        self.batches = batches
+        self.max_sweeps = max_sweeps
+        self.tolerance = tolerance
+        self.processes = processes
+
+    def _local_moving(self, offsets, targets, weights, rng, processes):
+        n = len(offsets) - 1
+        strength = np.bincount(np.repeat(np.arange(n), np.diff(offsets)), weights=weights, minlength=n)
+        total_weight = float(weights.sum())
+        communities = np.arange(n, dtype=np.int64)
+        totals = strength.copy()
+        active = np.ones(n, dtype=bool)
+
+        arrays = (offsets, targets, weights, strength)
+        pool = None
+        if processes > 1 and offsets[-1] >= POOL_MIN_ENTRIES:
+            pool = graph_pool(arrays, processes)
+
+        try:
+            for _ in range(self.max_sweeps):
+                improvement = 0.0
+                for batch in _batches(active, self.batches, rng):
+                    active[batch] = False
+                    if pool is None:
+                        movers, destinations, gain = _best_moves(arrays, (batch, communities, totals,
+                                                                          total_weight, self.resolution))
+                    else:
+                        tasks = [(part, communities, totals, total_weight, self.resolution)
+                                 for part in np.array_split(batch, processes)]
+                        results = list(pool_map(pool, _best_moves, tasks))
+                        movers = np.concatenate([r[0] for r in results])
+                        destinations = np.concatenate([r[1] for r in results])
+                        gain = sum(r[2] for r in results)
+                    if movers.size == 0:
+                        continue
+
+                    improvement += gain
+                    totals -= np.bincount(communities[movers], weights=strength[movers], minlength=n)
+                    totals += np.bincount(destinations, weights=strength[movers], minlength=n)
+                    communities[movers] = destinations
+                    _activate_neighbors(offsets, targets, active, movers)
+
+                # Turun modülerlik artışı ihmal edilebilir düzeydeyse bu seviye tamamlanmıştır
+                if improvement < self.tolerance:
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        labels, compact = np.unique(communities, return_inverse=True)
+        return compact.astype(np.int64), len(labels)
+
+    def run(self, csr):
+        """CSR indeks sırasıyla topluluk etiketleri (0..k-1) döndürür."""
+        offsets, targets, weights, _ = csr.numpy_arrays()
+        n = len(csr)
+        if n == 0 or weights.sum() == 0:
+            return np.arange(n, dtype=np.int64)
+
+        processes = self.processes
+        if processes is None:
+            processes = default_processes()
+
+        rng = np.random.default_rng(self.seed)
+        assignment = np.arange(n, dtype=np.int64)
+        while True:
+            communities, count = self._local_moving(offsets, targets, weights, rng, processes)
+            if count == len(offsets) - 1:
+                break
+            assignment = communities[assignment]
+            offsets, targets, weights = _aggregate(offsets, targets, weights, communities, count)
+        return assignment
+
+
+class LabelPropagationCommunities:
+    """
+    Asenkron etiket yayılımı: her düğüm komşuları arasında en ağır etiketi benimser.
+    Düğümler her turda rastgele gruplara bölünür; grup içinde güncelleme vektörel, gruplar
+    arasında sıralıdır (bir grup, önceki grupların yeni etiketlerini görür).
+    """
+
+    def __init__(self, seed=42, batches=16, max_sweeps=30):
+        self.seed = seed
+        self.batches = batches
+        self.max_sweeps = max_sweeps
+
+    def run(self, csr):
+        offsets, targets, weights, _ = csr.numpy_arrays()
+        n = len(csr)
+        labels = np.arange(n, dtype=np.int64)
+        if n == 0:
+            return labels
+
+        rng = np.random.default_rng(self.seed)
+        active = np.ones(n, dtype=bool)
+        for _ in range(self.max_sweeps):
+            if not active.any():
+                break
+            for batch in _batches(active, self.batches, rng):
+                active[batch] = False
+                nodes, candidates, sums = _label_sums(offsets, targets, weights, batch, labels)
+                if nodes.size == 0:
+                    continue
+
+                # Eşitlikte mevcut etiket korunur, yoksa rastgele biri seçilir
+                preference = np.where(candidates == labels[nodes], 2.0, rng.random(nodes.size))
+                best_nodes, best_labels, _ = _pick_best(nodes, candidates, sums, preference)
+                changed = best_labels != labels[best_nodes]
+                moved = best_nodes[changed]
+                labels[moved] = best_labels[changed]
+                _activate_neighbors(offsets, targets, active, moved)
+
+        _, compact = np.unique(labels, return_inverse=True)
+        return compact.astype(np.int64)
+
+
+COMMUNITY_METHODS = {
+    "louvain": LouvainCommunities,
+    "label_propagation": LabelPropagationCommunities,
+}
+
+
+def group_by_label(csr, labels):
+    """Etiketleri Node listelerine çevirir: büyükten küçüğe, üyeler id sırasıyla."""
+    if len(labels) == 0:
+        return []
+    order = np.argsort(labels, kind='stable')
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    groups = [[csr.node_list[i] for i in part] for part in np.split(order, bounds)]
+    groups.sort(key=len, reverse=True)
+    return groups
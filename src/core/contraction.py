@@ -0,0 +1,295 @@
+import heapq
+import json
+import os
+from bisect import bisect_left
+
+import numpy as np
+
+from .algorithms import PathFindingAlgorithm
+
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchy (CH) önişlemesi.
+    Düğümler "kenar farkı" (eklenecek kısayol sayısı - silinen kenar sayısı) sırasıyla
+    büzülür; en kısa yolları korumak için kısayol (shortcut) kenarları eklenir.
+    Sorgu yalnızca sıralamada yukarı giden kenarlar üzerinde çift yönlü arama yapar.
+    base_path verilmezse hiyerarşi yalnızca bellekte tutulur.
+    """
+
+    def __init__(self, base_path=None, witness_limit=64):
+        self.data_path = base_path + ".npz" if base_path else None
+        self.meta_path = base_path + "_meta.json" if base_path else None
+        self.witness_limit = witness_limit  # Tanık aramasında kesinleşecek en fazla düğüm
+
+        self.rank = None
+        # Yukarı graf (CSR): her kenar daha yüksek sıralı düğüme gider; middle = kısayolun ara düğümü (-1: gerçek kenar)
+        self.up_offsets = None
+        self.up_targets = None
+        self.up_weights = None
+        self.up_middles = None
+        self.version = None
+        self._csr = None
+
+    @classmethod
+    def for_database(cls, db_path):
+        return cls(os.path.join(os.path.dirname(os.path.abspath(db_path)), "contraction"))
+
+    # --- ÖNİŞLEME ---
+
+    def _witness_search(self, adj, source, excluded, max_cost, targets):
+        """
+        excluded düğümüne uğramadan source'tan başlayan sınırlı yerel Dijkstra.
+        max_cost'u aşan yollar hiç kuyruğa alınmaz; tüm hedefler kesinleşince durulur.
+        """
+        distances = {source: 0}
+        queue = [(0, source)]
+        remaining = len(targets)
+        settled = 0
+        while queue and settled < self.witness_limit:
+            cost, current = heapq.heappop(queue)
+            if cost > distances[current]:
+                continue
+            settled += 1
+            if current in targets:
+                remaining -= 1
+                if remaining == 0:
+                    break
+            for neighbor, (weight, _) in adj[current].items():
+                new_cost = cost + weight
+                if new_cost <= max_cost and neighbor != excluded and \
+                        new_cost < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_cost
+                    heapq.heappush(queue, (new_cost, neighbor))
+        return distances
+
+    def _shortcuts(self, adj, v):
+        """v büzülürse gereken kısayollar: [(u, w, maliyet), ...]"""
+        neighbors = list(adj[v].items())
+        result = []
+        for idx, (u, (weight_u, _)) in enumerate(neighbors):
+            rest = neighbors[idx + 1:]
+            if not rest:
+                break
+            max_cost = weight_u + max(weight for _, (weight, _) in rest)
+            distances = self._witness_search(adj, u, v, max_cost, {w for w, _ in rest})
+            for w, (weight_w, _) in rest:
+                via = weight_u + weight_w
+                if distances.get(w, float('inf')) > via:
+                    result.append((u, w, via))
+        return result
+
+    def build(self, graph):
+        """
+        Düğüm sıralamasını ve kısayolları hesaplar, sonucu diske yazar. graph bir CSR görüntüsü de
+        olabilir (arka planda hesaplarken graf değişse bile hiyerarşi görüntünün sürümüne ait kalır).
+        """
+        csr = graph.freeze()
+        version = csr.version  # Hesaptan önce alınır; hiyerarşi başladığı görüntünün sürümüne aittir
+        n = len(csr)
+
+        # Büzülmemiş düğümler arasındaki dinamik graf: {komşu: (ağırlık, ara_düğüm)}
+        adj = [dict() for _ in range(n)]
+        for i in range(n):
+            for j in range(csr.offsets[i], csr.offsets[i + 1]):
+                t = csr.targets[j]
+                if t != i:
+                    adj[i][t] = (csr.weights[j], -1)
+
+        deleted_neighbors = [0] * n
+        contracted = bytearray(n)
+        rank = [0] * n
+        up = [[] for _ in range(n)]
+
+        def priority(v):
+            shortcuts = self._shortcuts(adj, v)
+            return len(shortcuts) - len(adj[v]) + deleted_neighbors[v], shortcuts
+
+        queue = [(priority(v)[0], v) for v in range(n)]
+        heapq.heapify(queue)
+
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            if contracted[v]:
+                continue
+
+            # Tembel güncelleme: öncelik kötüleştiyse sıraya geri koy
+            new_priority, shortcuts = priority(v)
+            if queue and new_priority > queue[0][0]:
+                heapq.heappush(queue, (new_priority, v))
+                continue
+
+            rank[v] = order
+            order += 1
+            contracted[v] = 1
+
+            # v'nin kalan tüm komşuları daha yüksek sıralı olacak: yukarı kenarlar
+            for u, (weight, middle) in adj[v].items():
+                up[v].append((u, weight, middle))
+                del adj[u][v]
+                deleted_neighbors[u] += 1
+            adj[v] = {}
+
+            for a, b, via in shortcuts:
+                if via < adj[a].get(b, (float('inf'),))[0]:
+                    adj[a][b] = (via, v)
+                    adj[b][a] = (via, v)
+
+        offsets, targets, weights, middles = [0], [], [], []
+        for v in range(n):
+            for u, weight, middle in sorted(up[v]):
+                targets.append(u)
+                weights.append(weight)
+                middles.append(middle)
+            offsets.append(len(targets))
+
+        self.rank = rank
+        self.up_offsets, self.up_targets = offsets, targets
+        self.up_weights, self.up_middles = weights, middles
+        self._csr = csr
+        self.version = version
+        self.save(csr.fingerprint())
+
+    def save(self, fingerprint):
+        if self.data_path is None:
+            return
+        np.savez(self.data_path,
+                 rank=np.array(self.rank, dtype=np.int64),
+                 up_offsets=np.array(self.up_offsets, dtype=np.int64),
+                 up_targets=np.array(self.up_targets, dtype=np.int64),
+                 up_weights=np.array(self.up_weights, dtype=np.float64),
+                 up_middles=np.array(self.up_middles, dtype=np.int64))
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": fingerprint}, f)
+
+    def load(self, graph):
+        """Diskteki hiyerarşi mevcut grafla uyumluysa yükler. Başarılıysa True döner."""
+        if self.data_path is None or not (os.path.exists(self.data_path) and os.path.exists(self.meta_path)):
+            return False
+        csr = graph.freeze()
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("fingerprint") != csr.fingerprint():
+                return False
+            with np.load(self.data_path) as data:
+                self.rank = data["rank"].tolist()
+                self.up_offsets = data["up_offsets"].tolist()
+                self.up_targets = data["up_targets"].tolist()
+                self.up_weights = data["up_weights"].tolist()
+                self.up_middles = data["up_middles"].tolist()
+        except (OSError, ValueError, KeyError):
+            return False
+
+        self._csr = csr
+        self.version = graph.version
+        return True
+
+    def is_fresh(self, graph):
+        return self.rank is not None and self.version == graph.version
+
+    def ensure_fresh(self, graph):
+        if not self.is_fresh(graph):
+            self.build(graph)
+
+    # --- SORGU ---
+
+    def _middle(self, low, high):
+        """low -> high yukarı kenarının ara düğümü (-1: gerçek kenar)."""
+        start, end = self.up_offsets[low], self.up_offsets[low + 1]
+        j = bisect_left(self.up_targets, high, start, end)
+        return self.up_middles[j]
+
+    def _unpack(self, x, y):
+        """x-y (kısayol olabilir) kenarını gerçek düğüm dizisine açar; x hariç, y dahil."""
+        rank = self.rank
+        out = []
+        stack = [(x, y)]
+        while stack:
+            a, b = stack.pop()
+            low, high = (a, b) if rank[a] < rank[b] else (b, a)
+            middle = self._middle(low, high)
+            if middle == -1:
+                out.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return out
+
+    def query(self, start, end):
+        """CSR indeksleriyle (maliyet, [indeks...]) döndürür."""
+        if start == end:
+            return 0, [start]
+
+        offsets, targets, weights = self.up_offsets, self.up_targets, self.up_weights
+        distances = ({start: 0}, {end: 0})
+        predecessors = ({start: -1}, {end: -1})
+        queues = ([(0, start)], [(0, end)])
+        best, meet = float('inf'), -1
+
+        while queues[0] or queues[1]:
+            # Kuyruğunun en küçüğü en iyi maliyeti geçen taraf artık bir şey bulamaz
+            sides = [s for s in (0, 1) if queues[s] and queues[s][0][0] < best]
+            if not sides:
+                break
+            side = min(sides, key=lambda s: queues[s][0][0])
+            dist, pred, other = distances[side], predecessors[side], distances[1 - side]
+
+            cost, current = heapq.heappop(queues[side])
+            if cost > dist[current]:
+                continue
+            if current in other and cost + other[current] < best:
+                best = cost + other[current]
+                meet = current
+
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                new_cost = cost + weights[j]
+                if new_cost < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = new_cost
+                    pred[neighbor] = current
+                    heapq.heappush(queues[side], (new_cost, neighbor))
+
+        if meet == -1:
+            return float('inf'), []
+
+        # Yukarı zincirleri birleştir: start ... meet ... end
+        chain = []
+        curr = meet
+        while curr != -1:
+            chain.append(curr)
+            curr = predecessors[0][curr]
+        chain.reverse()
+        curr = predecessors[1][meet]
+        while curr != -1:
+            chain.append(curr)
+            curr = predecessors[1][curr]
+
+        path = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            path.extend(self._unpack(a, b))
+        return best, path
+
+
+class ContractionHierarchyAlgorithm(PathFindingAlgorithm):
+    """
+    Contraction Hierarchy sorgu motoru. Graf üzerindeki hiyerarşi (graph.contraction)
+    kullanılır; yoksa ya da graf değiştiyse önce önişleme yapılır.
+    """
+    def execute(self, graph, start_id, end_id):
+        csr = graph.freeze()
+        if start_id not in csr.index or end_id not in csr.index:
+            return float('inf'), []
+
+        hierarchy = getattr(graph, 'contraction', None)
+        if hierarchy is None:
+            # Kayıt yeri tanımlı değilse hiyerarşi bellekte kurulur ve sonraki sorgular için grafa bağlanır
+            hierarchy = graph.contraction = ContractionHierarchy()
+        hierarchy.ensure_fresh(graph)
+
+        cost, path = hierarchy.query(csr.index[start_id], csr.index[end_id])
+        return cost, [csr.node_list[i] for i in path]
+
+    def calculate_distance(self, n1, n2):
+        pass
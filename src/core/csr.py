@@ -0,0 +1,194 @@
+import copy
+import hashlib
+import heapq
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Graph'ın dizi tabanlı (CSR - Compressed Sparse Row) salt okunur görüntüsü.
+    uni_id'ler 0..n-1 arası yoğun indekslere eşlenir; komşular ve ağırlıklar
+    bitişik dizilerde tutulur. Her düğümün komşuları uni_id sırasına göre dizilidir.
+    """
+
+    def __init__(self, graph):
+        self.version = graph.version
+
+        # indeks -> uni_id / Node ve uni_id -> indeks eşlemeleri
+        self.ids = sorted(graph.nodes)
+        self.index = {nid: i for i, nid in enumerate(self.ids)}
+        self.node_list = [graph.nodes[nid] for nid in self.ids]
+
+        # offsets[i]..offsets[i+1] aralığı i. düğümün komşularını gösterir
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        self.weights = array('d')
+
+        for nid in self.ids:
+            incident = graph.incident_edges(nid)
+            for other in sorted(incident):
+                self.targets.append(self.index[other])
+                self.weights.append(incident[other].weight)
+            self.offsets.append(len(self.targets))
+
+        self._numpy = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def freeze(self):
+        """Graph ile aynı arayüz: algoritmalar her ikisini de kabul edebilsin."""
+        return self
+
+    def arrays(self):
+        """Alt süreçlere gönderilebilen (pickle edilebilir) ham diziler."""
+        return self.offsets, self.targets, self.weights
+
+    def numpy_arrays(self):
+        """
+        Aynı belleği paylaşan NumPy görünümleri: (offsets, targets, weights, rows).
+        rows[j], j. kaydın ait olduğu düğümün indeksidir (vektörel işlemler için).
+        """
+        if self._numpy is None:
+            offsets = np.frombuffer(self.offsets, dtype=np.int64)
+            targets = np.frombuffer(self.targets, dtype=np.int64)
+            weights = np.frombuffer(self.weights, dtype=np.float64)
+            rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(offsets))
+            self._numpy = (offsets, targets, weights, rows)
+        return self._numpy
+
+    def fingerprint(self):
+        """Düğüm, kenar ve ağırlıkların içerik özeti; diske yazılan önhesaplamaların tazelik kontrolü için."""
+        h = hashlib.sha1()
+        h.update(array('q', self.ids).tobytes())
+        h.update(self.offsets.tobytes())
+        h.update(self.targets.tobytes())
+        h.update(self.weights.tobytes())
+        return h.hexdigest()
+
+    def degree(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def neighbors(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbor_weights(self, i):
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def slot(self, i, k):
+        """i -> k kenarının targets/weights içindeki konumu (komşular sıralı olduğu için ikili arama)."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        j = bisect_left(self.targets, k, start, end)
+        return j if j < end and self.targets[j] == k else -1
+
+    def with_weights(self, changes, version):
+        """
+        Yapısı aynı, yalnızca verilen kenar ağırlıkları farklı yeni bir görüntü döndürür.
+        Bu görüntü değiştirilmez (arka plan hesapları ve önbellekteki ağaçlar ona başvuruyor
+        olabilir); yalnızca ağırlık dizisi kopyalanır. changes: (u_id, v_id, ağırlık) üçlüleri.
+        """
+        clone = copy.copy(self)
+        clone.version = version
+        clone.weights = array('d', self.weights)
+        clone._numpy = None
+        for u_id, v_id, weight in changes:
+            u, v = clone.index[u_id], clone.index[v_id]
+            clone.weights[clone.slot(u, v)] = weight
+            clone.weights[clone.slot(v, u)] = weight
+        return clone
+
+    def build_path(self, predecessors, end):
+        """Öncül dizisinden (indeks, -1 = yok) Node listesi olarak yolu çıkarır."""
+        path = []
+        curr = end
+        while curr != -1:
+            path.append(self.node_list[curr])
+            curr = predecessors[curr]
+        path.reverse()
+        return path
+
+
+def entry_positions(offsets, vertices):
+    """
+    Verilen düğümlerin CSR kayıtlarının konumları (NumPy, tek vektörel işlem).
+    Dönüş: (konumlar, düğüm başına kayıt sayısı); konumlar düğüm sırasıyla ardışıktır.
+    """
+    starts = offsets[vertices]
+    counts = offsets[vertices + 1] - starts
+    # Her düğümün kendi aralığında 0, 1, 2, ... sayan konumlar
+    shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.arange(shifts.size, dtype=np.int64) + shifts, counts
+
+
+def shortest_path_tree(arrays, source):
+    """
+    Tek kaynaklı tam Dijkstra (erken durma yok). CSR ham dizileri üzerinde çalışır,
+    böylece süreç havuzundaki işçilerde Node nesnelerine gerek kalmaz.
+    Dönüş: (mesafeler, öncüller) -> array('d'), array('q'); ulaşılamayan: inf / -1
+    """
+    offsets, targets, weights = arrays
+    n = len(offsets) - 1
+    distances = [float('inf')] * n
+    predecessors = [-1] * n
+    distances[source] = 0.0
+
+    queue = [(0.0, source)]
+    while queue:
+        current_cost, current = heapq.heappop(queue)
+        if current_cost > distances[current]:
+            continue
+        for j in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[j]
+            distance = current_cost + weights[j]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = current
+                heapq.heappush(queue, (distance, neighbor))
+
+    return array('d', distances), array('q', predecessors)
+
+
+def shortest_paths_to(arrays, task):
+    """
+    Tek kaynaktan birden çok hedefe Dijkstra; tüm hedefler kesinleşince durur.
+    task = (kaynak, [hedef, ...]) -> {hedef: (maliyet, [indeks...])}
+    """
+    offsets, targets, weights = arrays
+    source, wanted = task
+    n = len(offsets) - 1
+    distances = [float('inf')] * n
+    predecessors = [-1] * n
+    distances[source] = 0.0
+
+    remaining = set(wanted)
+    queue = [(0.0, source)]
+    while queue and remaining:
+        current_cost, current = heapq.heappop(queue)
+        if current_cost > distances[current]:
+            continue
+        remaining.discard(current)
+        for j in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[j]
+            distance = current_cost + weights[j]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = current
+                heapq.heappush(queue, (distance, neighbor))
+
+    results = {}
+    for target in wanted:
+        if distances[target] == float('inf'):
+            results[target] = (float('inf'), [])
+            continue
+        path = []
+        curr = target
+        while curr != -1:
+            path.append(curr)
+            curr = predecessors[curr]
+        path.reverse()
+        results[target] = (distances[target], path)
+    return results
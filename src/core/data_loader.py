@@ -1,177 +1,325 @@
-import sqlite3
-import networkx as nx
 from .node import Node
 from .graph import Graph
-import json
+from .db import Database
+from .bulk_import import BulkImporter, ImportFailed, REQUIRED_FIELDS
+from .json_stream import iter_json_arrays
+from .layout import force_layout
+
+# Akışlı CSV içe aktarmada bir parçadaki satır sayısı
+CSV_CHUNK_SIZE = 5000
+# Akışlı JSON içe aktarmada bir grupta birleştirilen üniversite / ilişki sayısı
+JSON_BATCH_SIZE = 5000
+# Yerleşim algoritması ya da parametreleri değişirse artırılır; eski sürümle kaydedilen konumlar kullanılmaz
+LAYOUT_VERSION = 2
+# Bileşenlerin dikey merkezi; konumlar bu çizgiye ve bileşenin yatay merkezine göre kaydedilir
+LAYOUT_CENTER_Y = 1000
+
 
 class DataLoader:
     def __init__(self, db_path):
         self.db_path = db_path
+        # Uygulama boyunca açık kalan bağlantılar (WAL yazıcı + salt okunur havuz)
+        self.db = Database(db_path)
+        self.last_import_report = None
         self.init_db()
 
+    def close(self):
+        self.db.close()
+
     def init_db(self):
         """Veritabanı tablolarını (yoksa) oluşturur."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Üniversiteler Tablosu
-        cursor.execute("""
-                       CREATE TABLE IF NOT EXISTS Üniversiteler
-                       (
-                           uni_id
-                           INTEGER
-                           PRIMARY
-                           KEY
-                           AUTOINCREMENT,
-                           adi
-                           TEXT,
-                           sehir
-                           TEXT,
-                           ilce
-                           TEXT,
-                           kurulus_yil
-                           INTEGER,
-                           ogrenci_sayisi
-                           INTEGER,
-                           fakulte_sayisi
-                           TEXT,
-                           akademik_sayisi
-                           INTEGER,
-                           tr_siralama
-                           INTEGER
-                       )
-                       """)
-
-        # İlişkiler (Edges) Tablosu
-        cursor.execute("""
-                       CREATE TABLE IF NOT EXISTS Iliskiler
-                       (
-                           source_id
-                           INTEGER,
-                           target_id
-                           INTEGER,
-                           PRIMARY
-                           KEY
-                       (
-                           source_id,
-                           target_id
-                       )
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+
+            # Üniversiteler Tablosu
+            cursor.execute("""
+                           CREATE TABLE IF NOT EXISTS Üniversiteler
+                           (
+                               uni_id
+                               INTEGER
+                               PRIMARY
+                               KEY
+                               AUTOINCREMENT,
+                               adi
+                               TEXT,
+                               sehir
+                               TEXT,
+                               ilce
+                               TEXT,
+                               kurulus_yil
+                               INTEGER,
+                               ogrenci_sayisi
+                               INTEGER,
+                               fakulte_sayisi
+                               TEXT,
+                               akademik_sayisi
+                               INTEGER,
+                               tr_siralama
+                               INTEGER
+                           )
+                           """)
+
+            # İlişkiler (Edges) Tablosu
+            cursor.execute("""
+                           CREATE TABLE IF NOT EXISTS Iliskiler
+                           (
+                               source_id
+                               INTEGER,
+                               target_id
+                               INTEGER,
+                               PRIMARY
+                               KEY
+                           (
+                               source_id,
+                               target_id
+                           )
+                               )
+                           """)
+
+            # Sıralama çakışması kontrolleri (is_ranking_taken, içe aktarma) tablo taraması yapmasın
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_universiteler_siralama ON Üniversiteler (tr_siralama)")
+
+            # Kaydedilmiş düğüm konumları: bileşen merkezine göre koordinatlar. Bileşenin topolojisi
+            # (bilesen_ozeti) ve yerleşim sürümü aynıysa açılışta yerleşim yeniden hesaplanmaz.
+            cursor.execute("""
+                           CREATE TABLE IF NOT EXISTS Konumlar
+                           (
+                               uni_id INTEGER PRIMARY KEY,
+                               x REAL,
+                               y REAL,
+                               bilesen_ozeti TEXT,
+                               yerlesim_surumu INTEGER
                            )
-                       """)
-        conn.commit()
-        conn.close()
+                           """)
 
     def load_graph(self, graph: Graph):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        G_nx = nx.Graph()
+        # Düğümler ve kenarlar salt okunur bağlantıda, aynı okuma işleminde okunur (tutarlı görüntü)
+        with self.db.snapshot() as conn:
+            rows = conn.execute("SELECT * FROM Üniversiteler").fetchall()
+            edges = conn.execute("SELECT source_id, target_id FROM Iliskiler").fetchall()
 
         # 1. Node'ları Yükle
-        cursor.execute("SELECT * FROM Üniversiteler")
-        rows = cursor.fetchall()
-
         if not rows:
-            conn.close()
             print("DataLoader: Veritabanında üniversite kaydı bulunamadı.")
             return graph
 
         for row in rows:
-            # row[6] fakülte sayısı, int beklenir
-            try:
-                fakulte_sayisi = int(row[6]) if row[6] is not None else 0
-            except ValueError:
-                fakulte_sayisi = 0
-
-            node = Node(row[0], row[1], row[2], row[3], row[4], row[5], fakulte_sayisi, row[7], row[8])
-            graph.add_node(node)
-            G_nx.add_node(node.uni_id)
+            graph.add_node(self._row_to_node(row))
 
         # 2. Edge'leri (İlişkileri) Yükle
-        cursor.execute("SELECT source_id, target_id FROM Iliskiler")
-        edges = cursor.fetchall()
-
-        for u, v in edges:
-            if u in graph.nodes and v in graph.nodes:
-                n1 = graph.nodes[u]
-                n2 = graph.nodes[v]
-                weight = graph.calculate_weight(n1, n2)
-
-                #GRAPH VE NETWORKX İKİSİNE DE KENAR EKLENİR
-                graph.add_edge(u, v)
-                G_nx.add_edge(u, v, weight=weight)
-
-        conn.close()
-
-        if not G_nx.nodes:
-            # Eğer düğümler bir nedenden dolayı G_nx'e eklenmediyse, layout atlanır.
-            return graph
+        # Ağırlıklar tek seferde (vektörel) hesaplanır
+        graph.add_edges_bulk(edges)
 
         # 3. Pozisyonlama (Layout)
-        if len(G_nx.nodes) > 0:
+        if len(graph.nodes) > 0:
             try:
-                import math
-
-                components = list(nx.connected_components(G_nx))
-
+                # Bileşenler graf tarafından zaten tutuluyor (büyükten küçüğe)
+                components = graph.component_sets()
 
-                components.sort(key=len, reverse=True)
+                # Topolojisi değişmeyen bileşenlerin kayıtlı konumları kullanılır
+                stored = self._stored_positions()
+                new_rows = []
 
                 current_x_offset = 0  # X ekseninde nerede kaldığımızı tutar
 
-                # Ekranın dikey merkezi (Y ekseni)
-                center_y = 1000
-
                 for component in components:
-                    subgraph = G_nx.subgraph(component)
-                    n_count = len(subgraph)
-
-                    # --- FORMÜL: DÜĞÜM SAYISINA GÖRE BOYUT ---
-                    # Her topluluğun kaplayacağı alan (yarıçap) düğüm sayısıyla orantılı olsun.
-                    # Base (100): En küçük grup bile en az 100 birim yer kaplasın.
-                    # Çarpan (20): Her bir düğüm için alanı 20 birim genişlet.
-                    # Örn: 3 düğüm -> 160 birim yarıçap.
-                    #      75 düğüm -> 1600 birim yarıçap.
-                    radius = 100 + (n_count * 20)
-
-                    # İtme kuvvetini (k) de kalabalığa göre ayarla
-                    k_val = 15.0 / math.sqrt(n_count) if n_count > 0 else 1.0
+                    digest = self._component_hash(graph, component)
+                    layout = self._stored_layout(stored, component, digest)
+                    if layout is None:
+                        layout = self._component_layout(graph, component)
+                        new_rows.extend((nid, x, y, digest, LAYOUT_VERSION) for nid, (x, y) in layout.items())
+                    current_x_offset = self._place_component(graph, layout, current_x_offset)
 
-                    # Layout hesapla
-                    pos = nx.spring_layout(subgraph, seed=42, k=k_val, iterations=100, scale=radius, weight=None)
-
-                    # Koordinatları Ana Sisteme Ekle
-                    # current_x_offset: Önceki grupların bittiği yer
-                    # radius: Bu grubun kendi yarıçapı (Merkezi kaydırmak için ekliyoruz)
-                    group_center_x = current_x_offset + radius
-
-                    for nid, p in pos.items():
-                        if nid in graph.nodes:
-                            # p[0] ve p[1] zaten radius ile çarpılmış halde gelir (nx scale parametresi sayesinde)
-                            # Sadece X ekseninde öteleme yapıyoruz
-                            graph.nodes[nid].x = int(group_center_x + p[0])
-
-                            # Y ekseninde hepsi aynı hizada (ortada) dursun
-                            graph.nodes[nid].y = int(center_y + p[1])
-
-                    # Bir sonraki grup için imleci (offset) kaydır
-                    current_x_offset += (radius * 2) + 200
+                self._save_positions(new_rows)
 
             except Exception as e:
                 print(f"Layout Hatası: {e}")
 
+    @staticmethod
+    def _row_to_node(row):
+        # row[6] fakülte sayısı, int beklenir
+        try:
+            fakulte_sayisi = int(row[6]) if row[6] is not None else 0
+        except ValueError:
+            fakulte_sayisi = 0
+        return Node(row[0], row[1], row[2], row[3], row[4], row[5], fakulte_sayisi, row[7], row[8])
+
+    @staticmethod
+    def _component_layout(graph, component):
+        """Bileşenin kendi merkezine göre konumları: {id: (x, y)}."""
+        import math
+
+        nodes = sorted(component)
+        index = {nid: i for i, nid in enumerate(nodes)}
+        pairs = [(index[u], index[v]) for u in nodes for v in graph.adj[u] if u < v]
+        n_count = len(nodes)
+
+        # --- FORMÜL: DÜĞÜM SAYISINA GÖRE BOYUT ---
+        # Her topluluğun kaplayacağı alan (yarıçap) düğüm sayısıyla orantılı olsun.
+        # Base (100): En küçük grup bile en az 100 birim yer kaplasın.
+        # Çarpan (20): Her bir düğüm için alanı 20 birim genişlet.
+        # Örn: 3 düğüm -> 160 birim yarıçap.
+        #      75 düğüm -> 1600 birim yarıçap.
+        radius = 100 + (n_count * 20)
+
+        # İtme kuvvetini (k) de kalabalığa göre ayarla
+        k_val = 15.0 / math.sqrt(n_count) if n_count > 0 else 1.0
+
+        # Layout hesapla (Barnes-Hut kuvvet yönelimli; koordinatlar scale sayesinde radius ile çarpılmış gelir)
+        pos = force_layout(n_count, [u for u, _ in pairs], [v for _, v in pairs],
+                           k=k_val, scale=radius, iterations=100, seed=42)
+        return dict(zip(nodes, map(tuple, pos.tolist())))
+
+    @staticmethod
+    def _place_component(graph, layout, current_x_offset):
+        """
+        Bileşeni current_x_offset'ten başlayan kendi alanına yerleştirir;
+        bir sonraki bileşenin başlayacağı x konumunu döndürür.
+        """
+        # Ekranın dikey merkezi (Y ekseni)
+        center_y = LAYOUT_CENTER_Y
+        radius = 100 + (len(layout) * 20)
+
+        # Koordinatları Ana Sisteme Ekle
+        # current_x_offset: Önceki grupların bittiği yer
+        # radius: Bu grubun kendi yarıçapı (Merkezi kaydırmak için ekliyoruz)
+        group_center_x = current_x_offset + radius
+
+        for nid, (x, y) in layout.items():
+            if nid in graph.nodes:
+                # Sadece X ekseninde öteleme yapıyoruz
+                graph.nodes[nid].x = int(group_center_x + x)
+
+                # Y ekseninde hepsi aynı hizada (ortada) dursun
+                graph.nodes[nid].y = int(center_y + y)
+
+        # Bir sonraki grup için imleci (offset) kaydır
+        return current_x_offset + (radius * 2) + 200
+
+    @staticmethod
+    def _component_hash(graph, component):
+        """Bileşenin topolojisinin (düğümler ve kenarlar) özeti; ağırlıklar yerleşimi etkilemez."""
+        import hashlib
+        from array import array
+
+        nodes = sorted(component)
+        adj = graph.adj
+        digest = hashlib.blake2b(array('q', nodes).tobytes(), digest_size=16)
+        for u in nodes:
+            digest.update(array('q', [u] + sorted(v for v in adj[u] if v >= u)).tobytes())
+        return digest.hexdigest()
+
+    def _stored_positions(self):
+        """Geçerli yerleşim sürümüyle kaydedilmiş konumlar: {id: (x, y, bileşen_özeti)}."""
+        rows = self.db.query("SELECT uni_id, x, y, bilesen_ozeti FROM Konumlar WHERE yerlesim_surumu = ?",
+                             (LAYOUT_VERSION,))
+        return {uni_id: (x, y, digest) for uni_id, x, y, digest in rows}
+
+    @staticmethod
+    def _stored_layout(stored, component, digest):
+        """Bileşenin tüm düğümleri aynı özetle kayıtlıysa kayıtlı konumlar, değilse None."""
+        layout = {}
+        for nid in component:
+            entry = stored.get(nid)
+            if entry is None or entry[2] != digest:
+                return None
+            layout[nid] = entry[:2]
+        return layout
+
+    def _save_positions(self, rows):
+        """Yeni hesaplanan bileşen konumlarını kaydeder; silinmiş düğümlerin ve eski sürümün kayıtları atılır."""
+        with self.db.transaction() as conn:
+            if rows:
+                conn.executemany("INSERT OR REPLACE INTO Konumlar VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("""
+                DELETE FROM Konumlar
+                WHERE yerlesim_surumu != ? OR uni_id NOT IN (SELECT uni_id FROM Üniversiteler)
+            """, (LAYOUT_VERSION,))
+
+    def apply_delta(self, graph: Graph, delta):
+        """
+        İçe aktarma farkını (ImportDelta) grafa uygular: yalnızca eklenen/güncellenen satırlar
+        okunur, konumu yalnızca yeni düğümler için hesaplanır. Yeni düğüm id'lerini döndürür.
+        """
+        changed = list(delta.inserted | delta.updated)
+        nodes = []
+        for i in range(0, len(changed), 500):
+            batch = changed[i:i + 500]
+            rows = self.db.query(
+                f"SELECT * FROM Üniversiteler WHERE uni_id IN ({', '.join('?' * len(batch))})", batch)
+            nodes.extend(map(self._row_to_node, rows))
+
+        new_ids = graph.apply_delta(nodes, delta.added_relations)
+        try:
+            self._place_new_nodes(graph, new_ids)
+            # Topolojisi değişen bileşenlerin kayıtlı özeti artık tutmuyor: yeni konumlar kaydedilir
+            self._save_component_positions(graph, set(new_ids).union(*delta.added_relations))
+        except Exception as e:
+            print(f"Layout Hatası: {e}")
+        return new_ids
+
+    def _place_new_nodes(self, graph, node_ids):
+        """
+        Yeni düğümlere konum verir; var olan düğümler yerinden oynamaz. Konumu belli bir komşusu
+        olan düğüm, komşularının ortasına yakın bir noktaya konur (mevcut düğümlerden dışarı doğru).
+        Grafın geri kalanına bağlanmayan yeni bileşenler, yüklemedeki düzenle çizimin sağına eklenir.
+        """
+        import math
+        import random
+
+        pending = set(node_ids)
+        rng = random.Random(42)
+        frontier = [nid for nid in node_ids if any(nb not in pending for nb in graph.adj[nid])]
+        while frontier:
+            next_frontier = []
+            for nid in frontier:
+                if nid not in pending:
+                    continue
+                anchors = [graph.nodes[nb] for nb in graph.adj[nid] if nb not in pending]
+                angle = rng.uniform(0, 2 * math.pi)
+                node = graph.nodes[nid]
+                node.x = int(sum(a.x for a in anchors) / len(anchors) + 80 * math.cos(angle))
+                node.y = int(sum(a.y for a in anchors) / len(anchors) + 80 * math.sin(angle))
+                pending.discard(nid)
+                next_frontier.extend(nb for nb in graph.adj[nid] if nb in pending)
+            frontier = next_frontier
+
+        if not pending:
+            return
+        placed = [n.x for nid, n in graph.nodes.items() if nid not in pending]
+        current_x_offset = max(placed) + 200 if placed else 0
+        for nid in node_ids:
+            if nid not in pending:
+                continue
+            component = graph.component_of(nid)
+            current_x_offset = self._place_component(graph, self._component_layout(graph, component),
+                                                     current_x_offset)
+            pending -= component
+
+    def _save_component_positions(self, graph, node_ids):
+        """
+        node_ids'in bileşenlerinin güncel konumlarını yeni bileşen özetleriyle, load_graph'in
+        biçiminde (bileşenin merkezine göre) kaydeder; sonraki yüklemede yerleşim yeniden hesaplanmaz.
+        """
+        rows = []
+        saved = set()
+        for nid in node_ids:
+            if nid in saved or nid not in graph.nodes:
+                continue
+            component = graph.component_of(nid)
+            saved |= component
+            digest = self._component_hash(graph, component)
+            xs = [graph.nodes[c].x for c in component]
+            center_x = (min(xs) + max(xs)) / 2
+            rows.extend((c, graph.nodes[c].x - center_x, graph.nodes[c].y - LAYOUT_CENTER_Y, digest, LAYOUT_VERSION)
+                        for c in component)
+        self._save_positions(rows)
 
     def get_university_names(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT uni_id, adi FROM Üniversiteler ORDER BY adi ASC")
-        data = cursor.fetchall()
-        conn.close()
-        return data
+        with self.db.reader() as conn:
+            return conn.execute("SELECT uni_id, adi FROM Üniversiteler ORDER BY adi ASC").fetchall()
 
     def add_university(self, info_dict):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         query = """
                 INSERT INTO Üniversiteler
                 (adi, sehir, ilce, kurulus_yil, ogrenci_sayisi, fakulte_sayisi, akademik_sayisi, tr_siralama)
@@ -183,11 +331,7 @@ class DataLoader:
             info_dict["fakulte_sayisi"], info_dict["akademik_sayisi"],
             info_dict["tr_siralama"]
         )
-        cursor.execute(query, values)
-        new_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return new_id
+        return self.db.execute(query, values).lastrowid
 
     # def add_relation(self, u_id, v_id):
     #     """İki üniversite arasındaki ilişkiyi DB'ye kaydeder."""
@@ -204,18 +348,14 @@ class DataLoader:
     #     conn.close()
 
     def delete_university(self, uni_id):
-        """Üniversiteyi ve ilişkilerini siler."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM Üniversiteler WHERE uni_id = ?", (uni_id,))
-        cursor.execute("DELETE FROM Iliskiler WHERE source_id = ? OR target_id = ?", (uni_id, uni_id))
-        conn.commit()
-        conn.close()
+        """Üniversiteyi ve ilişkilerini siler (tek işlem)."""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM Üniversiteler WHERE uni_id = ?", (uni_id,))
+            conn.execute("DELETE FROM Iliskiler WHERE source_id = ? OR target_id = ?", (uni_id, uni_id))
+            conn.execute("DELETE FROM Konumlar WHERE uni_id = ?", (uni_id,))
 
     def update_university(self, uni_id, info):
         """Üniversite bilgilerini günceller."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         query = """
                 UPDATE Üniversiteler \
                 SET adi=?, \
@@ -234,24 +374,17 @@ class DataLoader:
             info["fakulte_sayisi"], info["akademik_sayisi"],
             info["tr_siralama"], uni_id
         )
-        cursor.execute(query, values)
-        conn.commit()
-        conn.close()
+        self.db.execute(query, values)
 
     def delete_relation(self, id1, id2):
         """Veritabanından iki üniversite arasındaki bağı siler."""
-        # 1. Diğer metotlardaki gibi yeni bir bağlantı oluşturuyoruz
-        conn = sqlite3.connect(self.db_path)
-
-        # 2. Tablo adınız 'Iliskiler', sütunlarınız 'source_id' ve 'target_id'
+        # Tablo adı 'Iliskiler', sütunlar 'source_id' ve 'target_id'
         s, t = sorted((id1, id2))
 
         query = "DELETE FROM Iliskiler WHERE source_id = ? AND target_id = ?"
 
         try:
-            cursor = conn.cursor()
-            cursor.execute(query, (s, t))
-            conn.commit()
+            cursor = self.db.execute(query, (s, t))
 
             if cursor.rowcount > 0:
                 print(f"DB: {s} ve {t} arasındaki bağlantı başarıyla silindi.")
@@ -261,20 +394,14 @@ class DataLoader:
         except Exception as e:
             print(f"Bağlantı silinirken DB hatası: {e}")
             raise e  # Hatayı MainWindow'un yakalaması için yukarı fırlatıyoruz
-        finally:
-            conn.close()
 
     def add_relation(self, u_id, v_id):
         """İki üniversite arasındaki ilişkiyi DB'ye kaydeder."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         try:
             s, t = sorted((u_id, v_id))
             query = "INSERT OR IGNORE INTO Iliskiler (source_id, target_id) VALUES (?, ?)"
 
-            cursor.execute(query, (s, t))
-            conn.commit()
+            cursor = self.db.execute(query, (s, t))
 
             # Eğer etkilenen satır sayısı 0'dan büyükse yeni eklenmiştir
             if cursor.rowcount > 0:
@@ -287,24 +414,17 @@ class DataLoader:
         except Exception as e:
             print(f"Bağlantı eklenirken DB hatası: {e}")
             return None
-        finally:
-            conn.close()
 
     def is_ranking_taken(self, ranking, exclude_id=None):
         """Belirtilen sıralamanın başka bir üniversite tarafından kullanılıp kullanılmadığını kontrol eder."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         if exclude_id:
             # Düzenleme modunda, kendi ID'si dışındaki kayıtları kontrol et
-            cursor.execute("SELECT 1 FROM Üniversiteler WHERE tr_siralama = ? AND uni_id != ?", (ranking, exclude_id))
+            row = self.db.query_one("SELECT 1 FROM Üniversiteler WHERE tr_siralama = ? AND uni_id != ?",
+                                    (ranking, exclude_id))
         else:
             # Yeni ekleme modunda direkt kontrol et
-            cursor.execute("SELECT 1 FROM Üniversiteler WHERE tr_siralama = ?", (ranking,))
-
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
+            row = self.db.query_one("SELECT 1 FROM Üniversiteler WHERE tr_siralama = ?", (ranking,))
+        return row is not None
 
     # def import_from_json(self, file_path):
     #     """JSON dosyasındaki verileri DB'ye aktarır."""
@@ -337,165 +457,169 @@ class DataLoader:
     #     finally:
     #         conn.close()
 
-    def import_from_json(self, file_path):
-        """JSON dosyasındaki verileri doğrulayarak DB'ye aktarır."""
-        import json
-        import sqlite3
-
+    def import_from_json(self, file_path, progress=None, batch_size=JSON_BATCH_SIZE):
+        """
+        JSON dosyasındaki verileri doğrulayarak DB'ye aktarır. Dosya belleğe tamamen alınmaz
+        (iter_json_arrays): üniversiteler batch_size'lık gruplar halinde kendi SAVEPOINT'lerinde
+        doğrulanıp yazılır, ilişkiler hazırlık tablosunda biriktirilip en sonda birleştirilir
+        (dosyada üniversitelerden önce gelebilirler). Hata olursa hiçbir şey yazılmaz ve tüm
+        hatalar raporlanır. Tam rapor self.last_import_report içindedir.
+        (başarılı, mesaj, fark) döndürür; fark (ImportDelta) apply_delta ile grafa uygulanır.
+        progress(1, okunan_bayt, toplam_bayt): False dönerse iptal.
+        """
+        import os
+
+        self.last_import_report = None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            if 'universiteler' in data:
-                for uni in data['universiteler']:
-                    # 1. EKSİK BİLGİ KONTROLÜ
-                    required_fields = ['adi', 'sehir', 'ilce', 'tr_siralama']
-                    if not all(uni.get(field) for field in required_fields):
-                        raise ValueError(f"Eksik alan: {uni.get('adi', 'Bilinmiyor')}")
-
-                    ranking = uni['tr_siralama']
-                    uni_id = uni.get('uni_id')
-
-                    # 2. SIRALAMA ÇAKIŞMASI KONTROLÜ
-                    # Sadece ID farklı olup sıralama aynı olan bir kayıt var mı bakıyoruz
-                    if uni_id is not None:
-                        cursor.execute(
-                            "SELECT adi FROM Üniversiteler WHERE tr_siralama = ? AND uni_id != ?",
-                            (ranking, uni_id)
-                        )
+            total = os.path.getsize(file_path)
+            with open(file_path, 'r', encoding='utf-8') as f, self.db.transaction() as conn:
+                importer = BulkImporter(conn)
+                self.last_import_report = importer.report
+                importer.begin()
+
+                universities, relations = [], []
+                for key, item in self._json_items(f, importer.report):
+                    if key == 'universiteler':
+                        universities.append(self._json_university(item))
+                        if len(universities) == batch_size:
+                            self._merge_batch(importer, universities)
+                            universities = []
+                            self._report_progress(progress, importer.report, 1, f.buffer.tell(), total)
                     else:
-                        cursor.execute(
-                            "SELECT adi FROM Üniversiteler WHERE tr_siralama = ?",
-                            (ranking,)
-                        )
-
-                    conflict = cursor.fetchone()
-
-                    if conflict:
-                        conn.close()
-                        return False, f"Sıralama Çakışması: {ranking}. sıra zaten '{conflict[0]}' üniversitesine ait."
-
-                    # 3. VERİ EKLEME (INSERT OR REPLACE yerine INSERT INTO ve UPDATE kontrolü)
-                    # Eğer ID zaten varsa bilgilerini güncelle, yoksa yeni ekle
-                    cursor.execute("""
-                        INSERT INTO Üniversiteler 
-                        (uni_id, adi, sehir, ilce, kurulus_yil, ogrenci_sayisi, fakulte_sayisi, akademik_sayisi, tr_siralama)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(uni_id) DO UPDATE SET
-                        adi=excluded.adi, sehir=excluded.sehir, ilce=excluded.ilce, 
-                        kurulus_yil=excluded.kurulus_yil, ogrenci_sayisi=excluded.ogrenci_sayisi,
-                        fakulte_sayisi=excluded.fakulte_sayisi, akademik_sayisi=excluded.akademik_sayisi,
-                        tr_siralama=excluded.tr_siralama
-                    """, (
-                        uni_id, uni['adi'], uni['sehir'], uni['ilce'],
-                        uni.get('kurulus_yil', 0), uni.get('ogrenci_sayisi', 0),
-                        uni.get('fakulte_sayisi', 0), uni.get('akademik_sayisi', 0), ranking
-                    ))
-
-            # 4. İlişkileri Ekle
-            if 'iliskiler' in data:
-                for rel in data['iliskiler']:
-                    s, t = sorted((rel['source_id'], rel['target_id']))
-                    cursor.execute("INSERT OR IGNORE INTO Iliskiler (source_id, target_id) VALUES (?, ?)", (s, t))
-
-            conn.commit()
-            conn.close()
-            return True, "Başarıyla eklendi."
+                        relations.append((item['source_id'], item['target_id']))
+                        if len(relations) == batch_size:
+                            importer.stage_relations(relations)
+                            relations = []
+                if universities:
+                    self._merge_batch(importer, universities)
+                importer.stage_relations(relations)
+                self._report_progress(progress, importer.report, 1, total, total)
+
+                importer.finish()
+
+            return True, self.last_import_report.summary(), importer.delta
         except Exception as e:
-            if 'conn' in locals(): conn.close()
-            return False, str(e)
-
-    def import_from_csv(self, file_path):
-        """CSV dosyasındaki verileri ve İLİŞKİLERİ doğrulayarak DB'ye aktarır."""
-        import csv
-        import sqlite3
-
+            return False, str(e), None
+
+    def import_from_csv(self, file_path, progress=None, chunk_size=CSV_CHUNK_SIZE):
+        """
+        CSV dosyasındaki verileri ve İLİŞKİLERİ doğrulayarak DB'ye aktarır. Dosya sabit boyutlu
+        parçalar halinde okunur (bellek kullanımı dosya boyutundan bağımsızdır):
+        1. geçişte her parçanın üniversiteleri kendi SAVEPOINT'inde doğrulanıp yazılır,
+        2. geçişte 'iliskili_idleri' sütunu satır numarası -> id eşlemesiyle ilişkilere çevrilir.
+        Zorunlu alanı boş satırlar atlanır; var olan üniversitelerde yalnızca ad, şehir ve sıralama
+        güncellenir. Hatalı parça olursa hepsi raporlanır ve içe aktarmanın tamamı geri alınır.
+        Dönüş değeri import_from_json ile aynıdır: (başarılı, mesaj, fark).
+        progress(aşama, okunan_bayt, toplam_bayt): aşama 1 üniversiteler, 2 ilişkiler; False dönerse iptal.
+        """
+        import os
+
+        self.last_import_report = None
         try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                # Ayırıcıyı otomatik algıla
-                sample = f.read(1024)
-                f.seek(0)
-                dialect = csv.Sniffer().sniff(sample)
-
-                reader = csv.DictReader(f, dialect=dialect)
-
-                # Verileri hafızaya alalım (Dosyayı iki kere okumamak için)
-                rows = list(reader)
-
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            required_fields = ['adi', 'sehir', 'ilce', 'tr_siralama']
-            pending_relations = []
+            dialect, fieldnames = self._sniff_csv(file_path)
+            if not all(field in fieldnames for field in REQUIRED_FIELDS):
+                return False, f"CSV sütunları eksik. Zorunlu: {', '.join(REQUIRED_FIELDS)}", None
+            total = os.path.getsize(file_path)
+
+            with self.db.transaction() as conn:
+                importer = BulkImporter(conn, update_columns=("adi", "sehir", "tr_siralama"), skip_incomplete=True)
+                self.last_import_report = importer.report
+                importer.begin()
+
+                # --- 1. GEÇİŞ: Üniversiteler ---
+                for rows, position in self._read_csv_chunks(file_path, dialect, chunk_size):
+                    self._merge_batch(importer, map(self._csv_university, rows))
+                    self._report_progress(progress, importer.report, 1, position, total)
+
+                # --- 2. GEÇİŞ: İlişkiler (Sütun: 'iliskili_idleri' -> Format: "1|5|12") ---
+                if importer.report.ok and 'iliskili_idleri' in fieldnames:
+                    row_no = 0
+                    for rows, position in self._read_csv_chunks(file_path, dialect, chunk_size):
+                        pairs = []
+                        for row in rows:
+                            row_no += 1
+                            pairs.extend((row_no, target) for target in self._csv_targets(row))
+                        importer.stage_row_relations(pairs)
+                        importer.merge_relations()
+                        self._report_progress(progress, importer.report, 2, position, total)
+
+                importer.finish()
+
+            return True, self.last_import_report.summary(), importer.delta
+        except Exception as e:
+            # Doğrulama hataları raporun özetiyle, diğerleri okuma hatası olarak gösterilir
+            message = str(e) if isinstance(e, ImportFailed) else f"CSV Okuma Hatası: {str(e)}"
+            return False, message, None
 
-            # --- 1. AŞAMA: Üniversiteleri (Düğümleri) Ekle ---
-            for row in rows:
-                if not all(field in row for field in required_fields):
-                    conn.close()
-                    return False, f"CSV sütunları eksik. Zorunlu: {', '.join(required_fields)}"
+    def _merge_batch(self, importer, rows):
+        """Bir grup üniversiteyi kendi SAVEPOINT'inde hazırlayıp birleştirir."""
+        try:
+            with self.db.transaction():
+                importer.stage_universities(rows)
+                importer.merge_universities()
+        except ImportFailed:
+            pass  # Grup geri alındı, hataları raporda; kalan gruplar yine de doğrulanır
+
+    @staticmethod
+    def _json_items(f, report):
+        """iter_json_arrays; JSON biçim hataları rapora yazılır ve içe aktarma geri alınır."""
+        try:
+            yield from iter_json_arrays(f, ('universiteler', 'iliskiler'))
+        except ValueError as e:
+            report.error(str(e))
+            raise ImportFailed(report) from None
+
+    @staticmethod
+    def _report_progress(progress, report, phase, position, total):
+        if progress is not None and progress(phase, position, total) is False:
+            report.error("İçe aktarma kullanıcı tarafından iptal edildi.")
+            raise ImportFailed(report)
+
+    @staticmethod
+    def _sniff_csv(file_path):
+        """Ayırıcıyı otomatik algılar; (dialect, sütun adları) döndürür."""
+        import csv
 
-                if not all(row.get(field) for field in required_fields):
-                    continue
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            dialect = csv.Sniffer().sniff(f.read(1024))
+            f.seek(0)
+            return dialect, csv.DictReader(f, dialect=dialect).fieldnames or []
 
-                try:
-                    ranking = int(row['tr_siralama'])
-
-                    # Sayısal verileri güvenli al
-                    kurulus = int(row.get('kurulus_yil')) if row.get('kurulus_yil') and row.get(
-                        'kurulus_yil').isdigit() else 2000
-                    ogrenci = int(row.get('ogrenci_sayisi')) if row.get('ogrenci_sayisi') and row.get(
-                        'ogrenci_sayisi').isdigit() else 0
-                    akademik = int(row.get('akademik_sayisi')) if row.get('akademik_sayisi') and row.get(
-                        'akademik_sayisi').isdigit() else 0
-                    fakulte = str(row.get('fakulte_sayisi', "0"))
-
-                    # ID varsa al, yoksa None
-                    uni_id = row.get('uni_id')
-                    if uni_id and uni_id.strip() == "": uni_id = None
-
-                    # Üniversiteyi Ekle/Güncelle
-                    cursor.execute("""
-                                   INSERT INTO Üniversiteler
-                                   (uni_id, adi, sehir, ilce, kurulus_yil, ogrenci_sayisi, fakulte_sayisi,
-                                    akademik_sayisi, tr_siralama)
-                                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(uni_id) DO
-                                   UPDATE SET
-                                       adi=excluded.adi, sehir=excluded.sehir, tr_siralama=excluded.tr_siralama
-                                   """,
-                                   (uni_id, row['adi'], row['sehir'], row['ilce'], kurulus, ogrenci, fakulte, akademik,
-                                    ranking))
-
-
-                    # İlişkileri listeye at (Sonra işleyeceğiz)
-                    # Sütun adı: 'iliskili_idleri' -> Format: "1|5|12" (Dik çizgi ile ayrılmış ID'ler)
-                    if 'iliskili_idleri' in row and row['iliskili_idleri']:
-                        source_id = uni_id if uni_id else cursor.lastrowid
-                        targets = row['iliskili_idleri'].split('|')
-                        for t in targets:
-                            if t.strip().isdigit():
-                                pending_relations.append((source_id, int(t.strip())))
-
-                except ValueError as ve:
-                    conn.close()
-                    return False, f"Veri Hatası: {ve}"
-
-            # --- 2. AŞAMA: İlişkileri (Kenarları) Ekle ---
-            count_edges = 0
-            for u, v in pending_relations:
-                # Kendine ilişki eklemeyi engelle
-                if u != v:
-                    # İki yönlü ekle (Source -> Target ve Target -> Source çakışmasını önlemek için IGNORE)
-                    # ID'leri sıralayıp eklersek çift kaydı önleriz ama Graph yapısı çift yönlü olabilir.
-                    cursor.execute("INSERT OR IGNORE INTO Iliskiler (source_id, target_id) VALUES (?, ?)", (u, v))
-                    count_edges += 1
-
-            conn.commit()
-            conn.close()
-            return True, f"Başarılı! Üniversiteler güncellendi ve {count_edges} bağlantı kuruldu."
+    @staticmethod
+    def _read_csv_chunks(file_path, dialect, chunk_size):
+        """CSV satırlarını chunk_size'lık listeler halinde okur: (satırlar, okunan bayt) üretir."""
+        import csv
 
-        except Exception as e:
-            if 'conn' in locals(): conn.close()
-            return False, f"CSV Okuma Hatası: {str(e)}"
\ No newline at end of file
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            chunk = []
+            for row in csv.DictReader(f, dialect=dialect):
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    yield chunk, f.buffer.tell()
+                    chunk = []
+            if chunk:
+                yield chunk, f.buffer.tell()
+
+    @staticmethod
+    def _json_university(uni):
+        """JSON nesnesini hazırlık demetine çevirir."""
+        return (uni.get('uni_id'), uni.get('adi'), uni.get('sehir'), uni.get('ilce'),
+                uni.get('kurulus_yil', 0), uni.get('ogrenci_sayisi', 0),
+                uni.get('fakulte_sayisi', 0), uni.get('akademik_sayisi', 0), uni.get('tr_siralama'))
+
+    @staticmethod
+    def _csv_university(row):
+        """CSV satırını hazırlık demetine çevirir (sayısal alanlar geçersizse varsayılan değer alır)."""
+        def number(value, default):
+            return int(value) if value and value.isdigit() else default
+
+        uni_id = (row.get('uni_id') or '').strip() or None
+        return (uni_id, row['adi'], row['sehir'], row['ilce'],
+                number(row.get('kurulus_yil'), 2000), number(row.get('ogrenci_sayisi'), 0),
+                str(row.get('fakulte_sayisi', "0")), number(row.get('akademik_sayisi'), 0),
+                (row['tr_siralama'] or '').strip())
+
+    @staticmethod
+    def _csv_targets(row):
+        targets = (row.get('iliskili_idleri') or '').split('|')
+        return [int(t.strip()) for t in targets if t.strip().isdigit()]
@@ -0,0 +1,148 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+# sqlite3.connect(cached_statements=...) değeri: modülün bağlantı başına SQL metnine göre sakladığı
+# derlenmiş ifade sayısı (varsayılan 128). Sorgular sabit metinlerle yazıldığı için tekrar derlenmez.
+STATEMENT_CACHE_SIZE = 256
+
+# Her bağlantıda uygulanan ayarlar
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",  # WAL ile güvenli, her işlemde fsync yapılmaz
+    "PRAGMA cache_size = -65536",  # ~64 MB sayfa önbelleği
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+class Database:
+    """
+    SQLite bağlantı yöneticisi. Uygulama boyunca açık kalan tek bir yazıcı bağlantı (WAL modunda)
+    ve arka plan analiz iş parçacıkları için küçük bir salt okunur bağlantı havuzu tutar.
+    Yazıcı bağlantı otomatik commit modundadır: tek ifadeler hemen yazılır, birden fazla ifade
+    transaction() bloğunda tek commit ile yazılır. Yazıcı bağlantı kilitle korunur.
+    """
+
+    def __init__(self, path, readers=4):
+        self.path = path
+        self.max_readers = readers
+
+        self._lock = threading.RLock()
+        self._depth = 0  # İç içe transaction derinliği (iç bloklar SAVEPOINT kullanır)
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode = WAL")
+
+        self._idle_readers = queue.LifoQueue()
+        self._readers = []  # Açılan tüm okuyucular (kullanımda olanlar dahil), close() hepsini kapatır
+
+    def _connect(self, read_only=False):
+        if read_only:
+            uri = "file:" + quote(os.path.abspath(self.path)) + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    # --- Yazıcı bağlantı ---
+    def execute(self, sql, params=()):
+        """Tek ifadeyi yazıcı bağlantıda çalıştırır; transaction dışındaysa hemen kalıcı olur."""
+        with self._lock:
+            return self._writer.execute(sql, params)
+
+    def executemany(self, sql, rows):
+        with self._lock:
+            return self._writer.executemany(sql, rows)
+
+    def query(self, sql, params=()):
+        """Sorgu sonucunu liste olarak döndürür (yazıcı bağlantı, kendi yazdıklarını hemen görür)."""
+        with self._lock:
+            return self._writer.execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        with self._lock:
+            return self._writer.execute(sql, params).fetchone()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Blok içindeki tüm ifadeler tek commit ile yazılır, hata olursa geri alınır.
+        İç içe kullanımda iç blok bir SAVEPOINT'tir; yalnızca kendi değişikliklerini geri alır.
+        """
+        with self._lock:
+            conn = self._writer
+            savepoint = f"sp_{self._depth}" if self._depth else None
+            conn.execute(f"SAVEPOINT {savepoint}" if savepoint else "BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield conn
+            except BaseException:
+                if savepoint:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                else:
+                    conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute(f"RELEASE {savepoint}" if savepoint else "COMMIT")
+            finally:
+                self._depth -= 1
+
+    # --- Salt okunur havuz ---
+    @contextmanager
+    def reader(self):
+        """
+        Havuzdan salt okunur bir bağlantı verir (arka plan iş parçacıkları için). WAL sayesinde
+        okuyucular yazıcıyı beklemez. Havuz doluysa bir bağlantı boşalana kadar beklenir.
+        """
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            # close() sonrasında geri gelen (kapatılmış) bağlantı havuza konmaz
+            with self._lock:
+                if conn in self._readers:
+                    self._idle_readers.put(conn)
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Salt okunur bir bağlantıda okuma işlemi açar: blok içindeki tüm sorgular veritabanının
+        aynı hâlini görür, arada yazıcının yaptığı commit'ler bloğun sonuna kadar görünmez.
+        """
+        with self.reader() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("COMMIT")
+
+    def _acquire_reader(self):
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._readers) < self.max_readers:
+                conn = self._connect(read_only=True)
+                self._readers.append(conn)
+                return conn
+        return self._idle_readers.get()
+
+    def close(self):
+        """Tüm bağlantıları kapatır (WAL dosyası ana veritabanına aktarılır)."""
+        with self._lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+            self._idle_readers = queue.LifoQueue()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
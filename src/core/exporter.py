@@ -47,9 +47,10 @@ class Exporter:
         except Exception as e:
             raise Exception(f"CSV hatası: {e}")
 
-    def export_centrality_to_csv(self, data, filename="etki_analizi.csv"):
+    def export_centrality_to_csv(self, data, filename="etki_analizi.csv", metric_name=None):
         """
         Merkezilik analizi sonuçlarını (derece ve ağırlıklar) CSV olarak dışa aktarır.
+        metric_name verilirse satırlardaki 'skor' değeri bu başlıkla ayrı bir sütuna yazılır.
         """
         # Gerekli kütüphaneleri garantiye alalım
         import os
@@ -60,26 +61,34 @@ class Exporter:
         try:
             with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
                 fieldnames = ['Sıra', 'Üniversite Adı', 'Şehir', 'Derece (Bağlantı Sayısı)', 'Toplam Ağırlık']
+                if metric_name:
+                    fieldnames.append(metric_name)
 
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=';')
 
                 writer.writeheader()
                 for i, row in enumerate(data, 1):
-                    writer.writerow({
+                    record = {
                         'Sıra': i,
                         'Üniversite Adı': row['adi'],
                         'Şehir': row['sehir'],
                         'Derece (Bağlantı Sayısı)': row['derece'],
                         'Toplam Ağırlık': row['toplam_agirlik']
-                    })
+                    }
+                    if metric_name:
+                        record[metric_name] = row.get('skor')
+                    writer.writerow(record)
             return output_path
         except Exception as e:
             raise Exception(f"Merkezilik CSV hatası: {e}")
 
-    def export_communities_to_csv(self, graph, components, filename="topluluk_analizi.csv"):
+    def export_communities_to_csv(self, graph, components=None, filename="topluluk_analizi.csv"):
+        """components verilmezse topluluklar Louvain yöntemiyle hesaplanır."""
         output_path = os.path.join(self.output_dir, filename)
 
         try:
+            if components is None:
+                components, _ = graph.detect_communities("louvain")
             with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
                 fieldnames = ['Topluluk No', 'Üniversite ID', 'Üniversite Adı', 'Şehir', 'Komşular']
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=';')
@@ -141,4 +150,75 @@ class Exporter:
                     })
             return output_path
         except Exception as e:
-            raise Exception(f"Rapor oluşturulurken hata: {e}")
\ No newline at end of file
+            raise Exception(f"Rapor oluşturulurken hata: {e}")
+
+    def export_hop_levels_to_csv(self, graph, source, ids, levels, filename="sekme_uzakliklari.csv"):
+        """source'tan her üniversiteye sekme (hop) sayıları; ids ve levels Graph.hop_levels sırasıyla."""
+        output_path = os.path.join(self.output_dir, filename)
+
+        try:
+            rows = sorted(zip(levels.tolist(), ids), key=lambda r: (r[0] < 0, r[0], graph.nodes[r[1]].adi))
+            with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
+                fieldnames = ['Başlangıç', 'Üniversite ID', 'Üniversite Adı', 'Şehir', 'Sekme Sayısı']
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=';')
+
+                writer.writeheader()
+                for level, uni_id in rows:
+                    node = graph.nodes[uni_id]
+                    writer.writerow({
+                        'Başlangıç': source.adi,
+                        'Üniversite ID': uni_id,
+                        'Üniversite Adı': node.adi,
+                        'Şehir': node.sehir,
+                        'Sekme Sayısı': level if level >= 0 else 'Ulaşılamaz'
+                    })
+            return output_path
+        except Exception as e:
+            raise Exception(f"Sekme uzaklığı CSV hatası: {e}")
+
+    def import_pairs_from_csv(self, file_path):
+        """
+        Toplu yol sorgusu için (başlangıç_id, hedef_id) çiftlerini CSV'den okur.
+        Sütunlar: 'source_id'/'target_id' ya da 'Başlangıç ID'/'Hedef ID'. Ayırıcı otomatik algılanır.
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                sample = f.read(1024)
+                f.seek(0)
+                dialect = csv.Sniffer().sniff(sample, delimiters=";,")
+                reader = csv.DictReader(f, dialect=dialect)
+
+                pairs = []
+                for row in reader:
+                    source = row.get('source_id') or row.get('Başlangıç ID')
+                    target = row.get('target_id') or row.get('Hedef ID')
+                    if source and target and source.strip().isdigit() and target.strip().isdigit():
+                        pairs.append((int(source), int(target)))
+            return pairs
+        except Exception as e:
+            raise Exception(f"Yol çiftleri okunamadı: {e}")
+
+    def export_path_batch_to_csv(self, pairs, results, filename="toplu_yol_maliyetleri.csv"):
+        """Toplu en kısa yol sonuçlarını (maliyet matrisi satırları) CSV olarak dışa aktarır."""
+        output_path = os.path.join(self.output_dir, filename)
+
+        try:
+            with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
+                fieldnames = ['Başlangıç ID', 'Başlangıç', 'Hedef ID', 'Hedef', 'Maliyet', 'Adım Sayısı', 'Yol']
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=';')
+
+                writer.writeheader()
+                for (start_id, end_id), (cost, path) in zip(pairs, results):
+                    found = cost != float('inf')
+                    writer.writerow({
+                        'Başlangıç ID': start_id,
+                        'Başlangıç': path[0].adi if path else '',
+                        'Hedef ID': end_id,
+                        'Hedef': path[-1].adi if path else '',
+                        'Maliyet': round(cost, 4) if found else 'Yol yok',
+                        'Adım Sayısı': len(path) - 1 if found else '',
+                        'Yol': " -> ".join(n.adi for n in path)
+                    })
+            return output_path
+        except Exception as e:
+            raise Exception(f"Toplu yol CSV hatası: {e}")
@@ -1,57 +1,262 @@
 import math
-import heapq
+
+import numpy as np
+
 from .edge import Edge
+from .csr import CSRGraph, shortest_paths_to
+from .parallel import map_over_graph
+from .weights import edge_weights
+from .level_bfs import bfs_levels
+from .union_find import ComponentIndex
+from .community import COMMUNITY_METHODS, group_by_label, modularity
+from .centrality import CentralityEngine, PowerIterationCentrality
+from .path_cache import ShortestPathTreeCache
+from .algorithms import (
+    PathFindingAlgorithm,
+    DijkstraAlgorithm,
+    AStarAlgorithm,
+    BFSAlgorithm,
+    DFSAlgorithm
+)
+from .coloring import WelshPowellAlgorithm
 
 
 class Graph:
     def __init__(self):
         self.nodes = {}  # {id: Node}
-        self.edges = []  # [Edge, Edge, ...]
         self.adj = {}  # {id: {neighbor_id, ...}}
 
+        # Kenar indeksleri: {(küçük_id, büyük_id): Edge} ve {id: {komşu_id: Edge}}
+        self._edge_index = {}
+        self._incident = {}
+
+        # Bağlı bileşenler, ekleme/silme sırasında artımlı olarak güncellenir
+        self.components = ComponentIndex()
+
+        # Her değişiklikte artan sürüm numarası ve CSR görüntüsü önbelleği
+        self.version = 0
+        self._frozen = None
+
+        # İsteğe bağlı tüm çiftler en kısa yol önhesaplaması (AllPairsShortestPaths)
+        self.path_index = None
+
+        # A* için landmark (ALT) mesafe tabloları (LandmarkIndex), isteğe bağlı
+        self.landmarks = None
+
+        # Contraction Hierarchy önişlemesi (ContractionHierarchy), isteğe bağlı
+        self.contraction = None
+
+        # Kaynak düğüme göre en kısa yol ağaçları (Dijkstra sorgularını hızlandırır)
+        self.path_cache = ShortestPathTreeCache()
+
+        # Merkezilik skorları: {(metrik, seçenekler): dizi}, graf sürümü değişince boşaltılır
+        self._centrality_cache = {}
+        self._centrality_version = None
+
+        # PageRank / özvektör: son skorları saklayarak bir sonraki hesaplamaya sıcak başlangıç sağlar
+        self.influence = PowerIterationCentrality()
+
+    @property
+    def edges(self):
+        """Tüm kenarlar (eklenme sırasıyla). Ekleme/silme için add_edge/remove_edge kullanılmalı."""
+        return self._edge_index.values()
+
+    @staticmethod
+    def edge_key(u_id, v_id):
+        """Yönsüz kenar için kanonik anahtar: (küçük_id, büyük_id)."""
+        return (u_id, v_id) if u_id <= v_id else (v_id, u_id)
+
+    def mark_changed(self):
+        """Graf yapısı değiştiğinde çağrılır; dizi tabanlı görüntü bir sonraki freeze'de yeniden kurulur."""
+        self.version += 1
+        if self.path_cache:
+            self.path_cache.clear()
+
+    def freeze(self):
+        """Algoritmaların çalıştığı CSR görüntüsünü döndürür (graf değişmediyse önbellekten)."""
+        if self._frozen is None or self._frozen.version != self.version:
+            self._frozen = CSRGraph(self)
+        return self._frozen
+
+    def clear(self):
+        self.nodes = {}
+        self.adj = {}
+        self._edge_index = {}
+        self._incident = {}
+        self.components.clear()
+        self.mark_changed()
+
     def add_node(self, node):
         self.nodes[node.uni_id] = node
         if node.uni_id not in self.adj:
             self.adj[node.uni_id] = set()
+            self._incident[node.uni_id] = {}
+            self.components.add(node.uni_id)
+        self.mark_changed()
 
     def add_edge(self, u_id, v_id):
         if u_id not in self.nodes or v_id not in self.nodes:
             return
 
+        # Aynı kenar daha önce eklendiyse bir şey yapma (O(1) kontrol)
+        key = self.edge_key(u_id, v_id)
+        if key in self._edge_index:
+            return
+
         # Komşuluk listesine ekle
         self.adj[u_id].add(v_id)
         self.adj[v_id].add(u_id)
 
-        # Edge nesnesi oluştur ve listeye ekle
+        # Edge nesnesi oluştur ve indekslere ekle
         n1 = self.nodes[u_id]
         n2 = self.nodes[v_id]
-        weight = self.calculate_weight(n1, n2)
-
-        # Aynı kenar daha önce eklendi mi kontrol et
-        exists = False
-        for e in self.edges:
-            if (e.node1.uni_id == u_id and e.node2.uni_id == v_id) or \
-                    (e.node1.uni_id == v_id and e.node2.uni_id == u_id):
-                exists = True
-                break
-
-        if not exists:
-            new_edge = Edge(n1, n2, weight)
-            self.edges.append(new_edge)
+        new_edge = Edge(n1, n2, self.calculate_weight(n1, n2))
+        self._edge_index[key] = new_edge
+        self._incident[u_id][v_id] = new_edge
+        self._incident[v_id][u_id] = new_edge
+        self.components.union(u_id, v_id)
+        self.mark_changed()
+
+    def add_edges_bulk(self, pairs):
+        """
+        Çok sayıda kenarı tek seferde ekler (veritabanından yükleme gibi).
+        Ağırlıklar tek tek değil, tek bir vektörel işlemle hesaplanır. Eklenen Edge listesini döndürür.
+        """
+        new_pairs = {}
+        for u_id, v_id in pairs:
+            if u_id not in self.nodes or v_id not in self.nodes:
+                continue
+            key = self.edge_key(u_id, v_id)
+            if key not in self._edge_index and key not in new_pairs:
+                new_pairs[key] = (u_id, v_id)
+
+        weights = edge_weights(self.nodes, list(new_pairs.values())).tolist()
+
+        added = []
+        for key, (u_id, v_id), weight in zip(new_pairs, new_pairs.values(), weights):
+            new_edge = Edge(self.nodes[u_id], self.nodes[v_id], weight)
+            self.adj[u_id].add(v_id)
+            self.adj[v_id].add(u_id)
+            self._edge_index[key] = new_edge
+            self._incident[u_id][v_id] = new_edge
+            self._incident[v_id][u_id] = new_edge
+            self.components.union(u_id, v_id)
+            added.append(new_edge)
+
+        self.mark_changed()
+        return added
+
+    def get_edge(self, u_id, v_id):
+        """İki üniversite arasındaki Edge nesnesini döndürür, yoksa None."""
+        return self._edge_index.get(self.edge_key(u_id, v_id))
+
+    def has_edge(self, u_id, v_id):
+        return self.edge_key(u_id, v_id) in self._edge_index
+
+    def incident_edges(self, node_id):
+        """Düğüme bağlı kenarlar: {komşu_id: Edge}"""
+        return self._incident.get(node_id, {})
+
+    def _detach_edge(self, u_id, v_id):
+        edge = self._edge_index.pop(self.edge_key(u_id, v_id), None)
+        if edge is None:
+            return None
+
+        self.adj[u_id].discard(v_id)
+        self.adj[v_id].discard(u_id)
+        self._incident[u_id].pop(v_id, None)
+        self._incident[v_id].pop(u_id, None)
+        return edge
+
+    def remove_edge(self, u_id, v_id):
+        """Kenarı graf yapısından siler; silinen Edge nesnesini (yoksa None) döndürür."""
+        edge = self._detach_edge(u_id, v_id)
+        if edge is None:
+            return None
+
+        # Bileşen bölündüyse yalnızca o bileşen yeniden etiketlenir
+        self.components.edge_removed(self.adj, u_id, v_id)
+        self.mark_changed()
+        return edge
 
     def remove_node(self, node_id):
-        if node_id in self.nodes:
-            del self.nodes[node_id]
-        if node_id in self.adj:
-            del self.adj[node_id]
-
-        # Diğerlerinin komşuluklarından sil
-        for nid in self.adj:
-            if node_id in self.adj[nid]:
-                self.adj[nid].remove(node_id)
+        if node_id not in self.nodes:
+            return
 
-        # Kenarları sil
-        self.edges = [e for e in self.edges if e.node1.uni_id != node_id and e.node2.uni_id != node_id]
+        # Sadece komşuların listelerine dokunulur: O(derece)
+        for neighbor_id in list(self._incident.get(node_id, {})):
+            self._detach_edge(node_id, neighbor_id)
+
+        del self.nodes[node_id]
+        self.adj.pop(node_id, None)
+        self._incident.pop(node_id, None)
+        self.components.node_removed(self.adj, node_id)
+        self.mark_changed()
+
+    def update_node(self, node_id, info):
+        """Üniversite bilgilerini günceller ve sadece o düğüme bağlı kenarların ağırlıklarını yeniler."""
+        self._set_info(self.nodes[node_id], info)
+        self.recompute_weights([node_id])
+
+    @staticmethod
+    def _set_info(n, info):
+        n.adi = info["adi"]
+        n.sehir = info["sehir"]
+        n.ilce = info["ilce"]
+        n.kurulus_yil = info["kurulus_yil"]
+        n.ogrenci_sayisi = info["ogrenci_sayisi"]
+        n.fakulte_sayisi = int(info["fakulte_sayisi"])
+        n.akademik_sayisi = info["akademik_sayisi"]
+        n.tr_siralama = info["tr_siralama"]
+
+    def apply_delta(self, nodes=(), added_edges=()):
+        """
+        Toplu bir değişikliği (içe aktarma farkı) grafı yeniden kurmadan uygular.
+        nodes: yeni ya da bilgileri değişen Node nesneleri; var olan düğümlerin yalnızca bilgileri
+        (konumu değil) güncellenir. Ağırlıklar sadece bilgisi değişen düğümlerin kenarları ve yeni
+        kenarlar için hesaplanır. Yeni eklenen düğümlerin id'lerini döndürür.
+        """
+        added, updated = [], []
+        for node in nodes:
+            current = self.nodes.get(node.uni_id)
+            if current is None:
+                self.add_node(node)
+                added.append(node.uni_id)
+            else:
+                self._set_info(current, node.to_dict())
+                updated.append(node.uni_id)
+
+        if updated:
+            self.recompute_weights(updated)
+        self.add_edges_bulk(added_edges)
+        return added
+
+    def recompute_weights(self, node_ids=None):
+        """
+        Kenar ağırlıklarını toplu (vektörel) olarak yeniden hesaplar.
+        node_ids verilirse yalnızca bu düğümlere bağlı kenarlar yenilenir ve güncel
+        CSR görüntüsü yeniden kurulmak yerine ağırlıkları düzeltilmiş bir kopyası alınır (eski görüntüyü
+        kullanan arka plan hesapları ve önbellekler etkilenmez).
+        """
+        if node_ids is None:
+            edges = dict(self._edge_index)
+        else:
+            edges = {}
+            for nid in node_ids:
+                for neighbor_id, edge in self.incident_edges(nid).items():
+                    edges[self.edge_key(nid, neighbor_id)] = edge
+
+        frozen = self._frozen
+        patch = node_ids is not None and frozen is not None and frozen.version == self.version
+
+        weights = edge_weights(self.nodes, list(edges)).tolist()
+        for edge, weight in zip(edges.values(), weights):
+            edge.weight = weight
+
+        self.mark_changed()
+        if patch:
+            self._frozen = frozen.with_weights(
+                [(u_id, v_id, weight) for (u_id, v_id), weight in zip(edges, weights)], self.version)
 
     def calculate_weight(self, n1, n2):
         # PROJE İSTERİ: Formül -> Weight = 1 + Sqrt(Farklar Kareleri Toplamı)
@@ -68,121 +273,86 @@ class Graph:
     # --- STRATEJİ DESENİ KÖPRÜSÜ ---
     def run_algorithm(self, strategy, start_id, end_id=None):
         """MainWindow'dan gelen algoritma nesnesini çalıştırır."""
+        # Önhesaplama güncelse yol sorguları doğrudan matristen cevaplanır
+        if isinstance(strategy, PathFindingAlgorithm):
+            # Farklı bileşenlerdeki düğümler arasında yol yoktur: arama yapmaya gerek yok
+            if not self.same_component(start_id, end_id):
+                return float('inf'), []
+            if self.has_fresh_path_index():
+                return self.path_index.query(start_id, end_id)
         return strategy.execute(self, start_id, end_id)
 
+    def shortest_paths_batch(self, pairs, processes=None):
+        """
+        Çok sayıda (başlangıç_id, hedef_id) çifti için en kısa yolları hesaplar.
+        Çiftler kaynağa göre gruplanır: her kaynak için tek bir arama o kaynağın tüm
+        hedeflerini cevaplar. Bağımsız kaynaklar süreç havuzuna dağıtılır.
+        Dönüş: girdi sırasıyla [(maliyet, [Node...]), ...]
+        """
+        return self.prepare_paths_batch(pairs, processes)()
+
+    def prepare_paths_batch(self, pairs, processes=None):
+        """
+        shortest_paths_batch'in iki aşamalı hâli: grafı okuyan hazırlık (gruplama, bileşen kontrolü)
+        burada yapılır; dönen fonksiyon yalnızca o anki CSR görüntüsünü ya da önhesaplama matrisini
+        kullanır, bu yüzden arka plan iş parçacığında çalıştırılabilir.
+        """
+        pairs = list(pairs)
+        if self.has_fresh_path_index():
+            index = self.path_index
+            return lambda: [index.query(s, t) for s, t in pairs]
+
+        csr = self.freeze()
+        groups = {}
+        for start_id, end_id in pairs:
+            if self.same_component(start_id, end_id):
+                groups.setdefault(csr.index[start_id], set()).add(csr.index[end_id])
+
+        # Az sayıda kaynak için süreç başlatmak hesaplamadan pahalıya gelir
+        if processes is None and len(groups) < 32:
+            processes = 1
+
+        tasks = [(source, sorted(targets)) for source, targets in groups.items()]
+
+        def run():
+            answers = {}
+            for (source, _), results in zip(tasks, map_over_graph(csr, shortest_paths_to, tasks, processes)):
+                for target, (cost, path) in results.items():
+                    answers[(source, target)] = (cost, [csr.node_list[i] for i in path])
+
+            output = []
+            for start_id, end_id in pairs:
+                key = (csr.index.get(start_id), csr.index.get(end_id))
+                output.append(answers.get(key, (float('inf'), [])))
+            return output
+
+        return run
+
+    def has_fresh_path_index(self):
+        return self.path_index is not None and self.path_index.is_fresh(self)
+
     # --- ALGORİTMALAR ---
+    # Hepsi CSR görüntüsü üzerinde çalışan strateji sınıflarına yönlendirilir.
 
     def bfs(self, start_id):
-        if start_id not in self.nodes: return []
-        visited = set()
-        queue = [start_id]
-        visited.add(start_id)
-        order = []
-        while queue:
-            curr_id = queue.pop(0)
-            order.append(self.nodes[curr_id])
-            neighbors = sorted(list(self.adj.get(curr_id, set())))
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-        return order
+        return BFSAlgorithm().execute(self, start_id)
 
     def dfs(self, start_id):
-        if start_id not in self.nodes: return []
-        visited = set()
-        stack = [start_id]
-        order = []
-        while stack:
-            curr_id = stack.pop()
-            if curr_id not in visited:
-                visited.add(curr_id)
-                order.append(self.nodes[curr_id])
-                neighbors = sorted(list(self.adj.get(curr_id, set())), reverse=True)
-                for neighbor in neighbors:
-                    if neighbor not in visited:
-                        stack.append(neighbor)
-        return order
+        return DFSAlgorithm().execute(self, start_id)
 
     def dijkstra(self, start_id, end_id):
-        if start_id not in self.nodes or end_id not in self.nodes:
-            return float('inf'), []
-
-        queue = [(0, start_id)]
-        distances = {node_id: float('inf') for node_id in self.nodes}
-        distances[start_id] = 0
-        predecessors = {node_id: None for node_id in self.nodes}
-
-        while queue:
-            current_cost, current_id = heapq.heappop(queue)
-            if current_id == end_id: break
-            if current_cost > distances[current_id]: continue
-
-            for neighbor_id in self.adj.get(current_id, set()):
-                weight = self.calculate_weight(self.nodes[current_id], self.nodes[neighbor_id])
-                new_cost = current_cost + weight
-                if new_cost < distances[neighbor_id]:
-                    distances[neighbor_id] = new_cost
-                    predecessors[neighbor_id] = current_id
-                    heapq.heappush(queue, (new_cost, neighbor_id))
-
-        path = []
-        if distances[end_id] == float('inf'): return float('inf'), []
-        curr = end_id
-        while curr is not None:
-            path.insert(0, self.nodes[curr])
-            curr = predecessors[curr]
-        return distances[end_id], path
+        return DijkstraAlgorithm().execute(self, start_id, end_id)
 
     def a_star(self, start_id, end_id):
         """A* Algoritması: Dijkstra + Heuristic"""
-        if start_id not in self.nodes or end_id not in self.nodes:
-            return float('inf'), []
-
-        target_node = self.nodes[end_id]
-
-        def heuristic(nid):
-            # Öklid Mesafesi (Kuş uçuşu uzaklık)
-            n = self.nodes[nid]
-            return math.sqrt((n.x - target_node.x) ** 2 + (n.y - target_node.y) ** 2)
-
-        open_set = [(heuristic(start_id), start_id)]
-        g_score = {node_id: float('inf') for node_id in self.nodes}
-        g_score[start_id] = 0
-        predecessors = {node_id: None for node_id in self.nodes}
-
-        while open_set:
-            _, current_id = heapq.heappop(open_set)
-            if current_id == end_id: break
-
-            for neighbor_id in self.adj.get(current_id, set()):
-                weight = self.calculate_weight(self.nodes[current_id], self.nodes[neighbor_id])
-                tentative_g = g_score[current_id] + weight
-                if tentative_g < g_score[neighbor_id]:
-                    predecessors[neighbor_id] = current_id
-                    g_score[neighbor_id] = tentative_g
-                    f_score = tentative_g + heuristic(neighbor_id)
-                    heapq.heappush(open_set, (f_score, neighbor_id))
-
-        path = []
-        if g_score[end_id] == float('inf'): return float('inf'), []
-        curr = end_id
-        while curr is not None:
-            path.insert(0, self.nodes[curr])
-            curr = predecessors[curr]
-        return g_score[end_id], path
+        return AStarAlgorithm().execute(self, start_id, end_id)
 
     def welsh_powell_coloring(self):
-        sorted_nodes = sorted(self.nodes.keys(),
-                              key=lambda nid: len(self.adj.get(nid, set())),
-                              reverse=True)
-        coloring = {}
-        for node_id in sorted_nodes:
-            neighbor_colors = {coloring.get(neigh) for neigh in self.adj.get(node_id, set()) if neigh in coloring}
-            color = 1
-            while color in neighbor_colors: color += 1
-            coloring[node_id] = color
-        return coloring
+        return WelshPowellAlgorithm().execute(self)
+
+    def iterate_algorithm(self, strategy, start_id):
+        """Gezinme stratejisinin ziyaret olaylarını (VisitEvent) tembel olarak döndürür."""
+        return strategy.iterate(self, start_id)
 
     def run_coloring_algorithm(self, strategy):
         """
@@ -190,33 +360,90 @@ class Graph:
         """
         return strategy.execute(self)
 
+    def hop_levels(self, start_id):
+        """
+        start_id'den tüm düğümlere sekme (hop) sayıları. Dönüş: (id listesi, np.int32 seviyeler);
+        ikisi de CSR indeks sırasıyla, ulaşılamayan düğümler -1.
+        """
+        csr = self.freeze()
+        return csr.ids, bfs_levels(csr, csr.index[start_id])
+
+    # --- BAĞLI BİLEŞENLER ---
+    # Union-find indeksinden cevaplanır; graf üzerinde arama yapılmaz.
+
+    def same_component(self, u_id, v_id):
+        return self.components.connected(u_id, v_id)
+
+    def component_of(self, node_id):
+        """Düğümün bileşenindeki üniversite id'leri (küme)."""
+        return self.components.component_of(node_id)
+
+    def component_count(self):
+        return self.components.count()
+
+    def component_sets(self):
+        """Bileşenlerin id kümeleri, büyükten küçüğe."""
+        return sorted(self.components.components(), key=len, reverse=True)
+
     def find_connected_components(self):
-        visited = set()
-        components = []
-        for nid in self.nodes:
-            if nid not in visited:
-                comp = []
-                queue = [nid]
-                visited.add(nid)
-                while queue:
-                    curr = queue.pop(0)
-                    comp.append(self.nodes[curr])
-                    for neighbor in self.adj.get(curr, set()):
-                        if neighbor not in visited:
-                            visited.add(neighbor)
-                            queue.append(neighbor)
-                components.append(comp)
-        return components
+        """Bileşenler (Node listeleri), büyükten küçüğe; üyeler id sırasıyla."""
+        return [[self.nodes[nid] for nid in sorted(ids)] for ids in self.component_sets()]
+
+    def detect_communities(self, method="louvain", **options):
+        """
+        Topluluk tespiti (Edge.weight ağırlıklı). method: "louvain" ya da "label_propagation".
+        Dönüş: (topluluklar [Node listeleri, büyükten küçüğe], modülerlik)
+        """
+        csr = self.freeze()
+        labels = COMMUNITY_METHODS[method](**options).run(csr)
+        offsets, targets, weights, _ = csr.numpy_arrays()
+        return group_by_label(csr, labels), modularity(offsets, targets, weights, labels)
+
+    # --- MERKEZİLİK ---
+
+    def centrality_scores(self, metric="degree", **options):
+        """
+        Metrik skorlarını CSR indeks sırasıyla np.ndarray olarak döndürür.
+        metric: "degree", "strength", "pagerank", "eigenvector", "betweenness", "closeness", "harmonic".
+        Son üçü için options CentralityEngine'e iletilir (samples, epsilon, delta, seed, processes).
+        """
+        if self._centrality_version != self.version:
+            self._centrality_cache = {}
+            self._centrality_version = self.version
+
+        key = (metric, tuple(sorted(options.items())))
+        if key in self._centrality_cache:
+            return self._centrality_cache[key]
+
+        csr = self.freeze()
+        offsets, _, weights, rows = csr.numpy_arrays()
+        if metric == "degree":
+            scores = np.diff(offsets).astype(np.float64)
+        elif metric == "strength":
+            scores = np.bincount(rows, weights=weights, minlength=len(csr))
+        elif metric in PowerIterationCentrality.METRICS:
+            scores = self.influence.run(csr, metric)
+        else:
+            # Tek tarama üç metriği birden üretir; hepsi önbelleğe alınır
+            for name, values in CentralityEngine(**options).run(csr).items():
+                self._centrality_cache[(name, key[1])] = values
+            return self._centrality_cache[key]
+
+        self._centrality_cache[key] = scores
+        return scores
+
+    def top_influential(self, metric="degree", k=5, **options):
+        """En yüksek skorlu k üniversite: [{"adi", "sehir", "derece", "toplam_agirlik", "skor"}, ...]"""
+        csr = self.freeze()
+        scores = self.centrality_scores(metric, **options)
+        degrees = self.centrality_scores("degree")
+        strengths = self.centrality_scores("strength")
+
+        # Eşit skorlarda daha küçük id önce gelir
+        order = np.lexsort((np.arange(len(csr)), -scores))[:k]
+        return [{"id": csr.ids[i], "adi": csr.node_list[i].adi, "sehir": csr.node_list[i].sehir,
+                 "derece": int(degrees[i]), "toplam_agirlik": round(float(strengths[i]), 2),
+                 "skor": float(scores[i])} for i in order]
 
     def get_top_5_influential_unis(self):
-        data = []
-        for nid, node in self.nodes.items():
-            degree = len(self.adj.get(nid, set()))
-            total_weight = 0
-            for edge in self.edges:
-                if edge.node1.uni_id == nid or edge.node2.uni_id == nid:
-                    total_weight += edge.weight
-            data.append(
-                {"adi": node.adi, "sehir": node.sehir, "derece": degree, "toplam_agirlik": round(total_weight, 2)})
-        data.sort(key=lambda x: x["derece"], reverse=True)
-        return data[:5]
\ No newline at end of file
+        return self.top_influential("degree", 5)
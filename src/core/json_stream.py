@@ -0,0 +1,286 @@
+import json
+import re
+
+_WHITESPACE = " \t\n\r"
+_STRUCTURE = re.compile(r'["{}\[\],:]')  # String dışında taranan karakterler
+_STRING_SPECIAL = re.compile(r'["\\]')  # String içinde taranan karakterler
+_SCALAR_END = re.compile(r'[\s,\]}:]')  # Sayı / true / false / null bitişi
+# json modülünün kabul ettiği sabitler (NaN ve Infinity dahil) ve sayılar
+_SCALAR = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null|NaN|-?Infinity')
+# Geçerli string içeriği: kontrol karakteri olmayan karakterler ve tam kaçış dizileri
+_STRING_BODY = re.compile(r'(?:[^"\\\x00-\x1f]+|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*')
+_OPENERS = {"}": "{", "]": "["}
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Dosyadan parça parça okunan metin; tüketilen kısım ara sıra atılır."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.offset = 0  # Atılan karakter sayısı (hata mesajlarında dosya konumu için)
+        self.eof = False
+
+    def fill(self):
+        """Bir parça daha okur; dosya bittiyse False döndürür."""
+        if self.eof:
+            return False
+        if self.pos > len(self.text) // 2:
+            self.offset += self.pos
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text += chunk
+        return True
+
+    def error(self, pos, msg):
+        return ValueError(f"JSON biçim hatası: {self.offset + pos}. karakterde {msg}")
+
+    def peek(self):
+        """Boşlukları atlayıp sıradaki karakteri döndürür (dosya sonunda '')."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise self.error(self.pos, f"'{chars}' bekleniyordu, '{char}' bulundu")
+        self.pos += 1
+        return char
+
+    def scan(self):
+        """
+        Sıradaki JSON değerinin bittiği konumu çözmeden bulur. Parantez yığını ve string durumu
+        okumalar arasında korunduğu için her karakter bir kez taranır. Tampon her iki katına
+        çıktığında eldeki kısım denenerek çözülür; hata tamamen okunmuş bir yerdeyse hemen bildirilir.
+        """
+        char = self.peek()
+        if not char:
+            raise self.error(self.pos, "değer bekleniyordu, dosya bitti")
+
+        i = self.pos
+        if char not in '"{[':
+            while True:
+                match = _SCALAR_END.search(self.text, i)
+                if match:
+                    return match.start()
+                if self.eof:
+                    return len(self.text)
+                i = self._extend(len(self.text))
+
+        stack = []
+        in_string = False
+        structural = i - 1  # String dışındaki son yapısal karakter (deneme çözümlemesi için)
+        trial = 2 * self.chunk_size
+        while True:
+            text = self.text
+            n = len(text)
+            while i < n:
+                if in_string:
+                    match = _STRING_SPECIAL.search(text, i)
+                    if not match:
+                        i = n
+                        break
+                    i = match.end()
+                    if match.group() == "\\":
+                        if i >= n:  # Kaçış karakteri parçanın sonunda: sonraki parçayla tekrar bakılır
+                            i -= 1
+                            break
+                        i += 1
+                        continue
+                    in_string = False
+                    if not stack:
+                        return i
+                    continue
+
+                match = _STRUCTURE.search(text, i)
+                if not match:
+                    i = n
+                    break
+                char, i = match.group(), match.end()
+                if char == '"':
+                    in_string = True
+                    continue
+                structural = match.start()
+                if char in "{[":
+                    stack.append(char)
+                elif char in "}]":
+                    if not stack or stack.pop() != _OPENERS[char]:
+                        raise self.error(match.start(), f"beklenmeyen '{char}'")
+                    if not stack:
+                        return i
+
+            if self.eof:
+                raise self.error(len(self.text), "değer tamamlanmadan dosya bitti")
+            if n - self.pos >= trial:
+                trial *= 2
+                self._check_prefix(structural)
+            shift = self.offset
+            i = self._extend(i)
+            structural -= self.offset - shift
+
+    def _extend(self, i, keep=True):
+        """Tampona bir parça ekler ve i konumunu (tamponun başı atılmış olabilir) yeni tampona taşır."""
+        if not keep:
+            self.pos = i
+        absolute = self.offset + i
+        self.fill()
+        return absolute - self.offset
+
+    def _check_prefix(self, structural):
+        """
+        Yarım değeri çözmeyi dener. Yarım kalmaktan doğan hatalar son yapısal karakterden sonra
+        (yarım string, sayı ya da sabit) konumlanır; daha önceki bir konumdaki hata gerçektir.
+        """
+        try:
+            _decoder.raw_decode(self.text, self.pos)
+        except json.JSONDecodeError as e:
+            if e.pos <= structural:
+                raise self.error(e.pos, e.msg) from None
+
+    def value(self):
+        """Sıradaki JSON değerini sonu bulunduktan sonra tek seferde çözer."""
+        end = self.scan()
+        try:
+            obj, stop = _decoder.raw_decode(self.text, self.pos)
+        except json.JSONDecodeError as e:
+            raise self.error(e.pos, e.msg) from None
+        if stop != end:
+            raise self.error(stop, "beklenmeyen karakter")
+        self.pos = end
+        return obj
+
+    def skip(self):
+        """
+        Sıradaki değeri çözmeden atlar; taranan metin bellekte tutulmaz. Yine de geçerli JSON
+        olmalıdır: parantezler, ':' / ',' sırası, string kaçışları ve sabitler küçük bir durum
+        makinesiyle denetlenir. Tamamı tampondaki değerler doğrudan C çözücüyle doğrulanır;
+        durum makinesi yalnızca parçalar arasına taşan kapsayıcıların içine iner.
+        """
+        stack = []
+        state = "value"  # value, key, colon, after (değerden sonra ',' ya da kapanış beklenir)
+        while state != "after" or stack:
+            char = self.peek()
+            if not char:
+                raise self.error(self.pos, "değer tamamlanmadan dosya bitti")
+
+            if state == "after":
+                closer = "}" if stack[-1] == "{" else "]"
+                if char == ",":
+                    state = "key" if closer == "}" else "value"
+                elif char == closer:
+                    stack.pop()
+                else:
+                    raise self.error(self.pos, f"',' ya da '{closer}' bekleniyordu, '{char}' bulundu")
+                self.pos += 1
+            elif state == "colon":
+                self.expect(":")
+                state = "value"
+            elif state == "value" and char in '{["' and self._skip_decoded():
+                state = "after"
+            elif state == "key" or char not in "{[":
+                if char == '"':
+                    self._skip_string()
+                    state = "colon" if state == "key" else "after"
+                elif state == "key":
+                    raise self.error(self.pos, f"anahtar (string) bekleniyordu, '{char}' bulundu")
+                else:
+                    self._skip_scalar()
+                    state = "after"
+            else:
+                stack.append(char)
+                self.pos += 1
+                # Boş nesne / dizi hemen kapanabilir
+                if self.peek() == ("}" if char == "{" else "]"):
+                    stack.pop()
+                    self.pos += 1
+                    state = "after"
+                else:
+                    state = "key" if char == "{" else "value"
+
+    def _skip_decoded(self):
+        """
+        Sıradaki kapsayıcı ya da string tamamen tampondaysa çözerek doğrular ve atlar; değilse
+        False döndürür. Sayılar için kullanılmaz: parçanın sonunda kesilmiş bir sayı ("2.") da çözülebilir.
+        """
+        try:
+            _, self.pos = _decoder.raw_decode(self.text, self.pos)
+        except json.JSONDecodeError:
+            return False  # Yarım değer ya da hata: durum makinesi karar verir
+        return True
+
+    def _skip_string(self):
+        """self.pos'taki stringi atlar; uzun stringler de parça parça taranır."""
+        start = self.offset + self.pos
+        i = self.pos + 1
+        while True:
+            i = _STRING_BODY.match(self.text, i).end()
+            n = len(self.text)
+            if i < n and self.text[i] == '"':
+                self.pos = i + 1
+                return
+            # Parçanın sonunda yarım kalmış bir kaçış dizisi olabilir; değilse geçersiz karakter
+            if i < n and (self.text[i] != "\\" or n - i >= 6 or self.eof):
+                raise self.error(i, "string içinde geçersiz karakter ya da kaçış dizisi")
+            if self.eof:
+                raise self.error(start - self.offset, "string kapanmadan dosya bitti")
+            i = self._extend(i, keep=False)
+
+    def _skip_scalar(self):
+        """self.pos'taki sayıyı ya da true / false / null sabitini atlar."""
+        while True:
+            match = _SCALAR_END.search(self.text, self.pos)
+            if match or not self.fill():
+                break
+        end = match.start() if match else len(self.text)
+        if not _SCALAR.fullmatch(self.text, self.pos, end):
+            raise self.error(self.pos, "geçersiz değer")
+        self.pos = end
+
+
+def iter_json_arrays(f, keys, chunk_size=1 << 16):
+    """
+    Kökü nesne olan JSON dosyasını belleğe tamamen almadan okur: keys içindeki üst düzey
+    dizilerin elemanlarını (anahtar, eleman) olarak tek tek üretir. Bellek kullanımı dosya
+    boyutuna değil en büyük tek elemana bağlıdır. Diğer üst düzey anahtarların değerleri
+    çözülmeden ama biçimleri denetlenerek atlanır. keys içindeki bir anahtarın değeri dizi
+    değilse ValueError yükseltilir.
+    Yalnızca standart kütüphane: her elemanın sonu taranır, sonra json.JSONDecoder.raw_decode ile çözülür.
+    """
+    buffer = _Buffer(f, chunk_size)
+    buffer.expect("{")
+    more = buffer.peek() != "}"
+    if not more:
+        buffer.expect("}")
+
+    while more:
+        key = buffer.value()
+        buffer.expect(":")
+        if key in keys:
+            if buffer.peek() != "[":
+                raise buffer.error(buffer.pos, f"'{key}' bir dizi olmalı")
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.expect("]")
+            else:
+                while True:
+                    yield key, buffer.value()
+                    if buffer.expect(",]") == "]":
+                        break
+        else:
+            buffer.skip()
+        more = buffer.expect(",}") == ","
+
+    if buffer.peek():
+        raise buffer.error(buffer.pos, "fazladan veri var (kök nesne bitti)")
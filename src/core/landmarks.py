@@ -0,0 +1,117 @@
+import json
+import os
+from operator import sub
+
+import numpy as np
+
+from .csr import shortest_path_tree
+
+
+class LandmarkIndex:
+    """
+    A* için ALT (A*, Landmark, Triangle inequality) sezgisi.
+    K adet referans düğümden (landmark) tüm düğümlere olan mesafeler önceden hesaplanır.
+    Üçgen eşitsizliğinden h(v) = max_L |d(L, t) - d(L, v)| gerçek mesafeyi asla aşmaz,
+    bu yüzden A* hem tutarlı hem de kesin (optimal) sonuç verir.
+    """
+
+    def __init__(self, base_path, count=8):
+        self.dist_path = base_path + ".npy"
+        self.meta_path = base_path + "_meta.json"
+        self.count = count
+
+        self.dist = None  # (K, n) mesafe matrisi, CSR indeks sırasıyla
+        self._columns = None  # dist'in düğüm başına sütunları (sorgularda düz liste erişimi için)
+        self.landmark_ids = []
+        self.version = None
+
+    @classmethod
+    def for_database(cls, db_path, count=8):
+        return cls(os.path.join(os.path.dirname(os.path.abspath(db_path)), "landmarks"), count)
+
+    def build(self, graph):
+        """
+        Landmark'ları en uzak nokta yöntemiyle seçer: her yeni landmark, seçilmiş olanlara
+        en uzak düğümdür. Ulaşılamayan düğümler en uzak sayıldığı için farklı bileşenler de kapsanır.
+        """
+        csr = graph.freeze()
+        version = csr.version  # Hesaptan önce alınır; tablolar başladığı görüntünün sürümüne aittir
+        n = len(csr)
+        if n == 0:
+            self.dist = np.empty((0, 0))
+            self._columns = None
+            self.landmark_ids = []
+            self.version = version
+            return
+
+        arrays = csr.arrays()
+        rows = []
+        landmarks = []
+        closest = np.full(n, np.inf)
+
+        # İlk landmark: en yüksek dereceli düğüm
+        candidate = max(range(n), key=csr.degree)
+        for _ in range(min(self.count, n)):
+            distances, _ = shortest_path_tree(arrays, candidate)
+            row = np.frombuffer(distances, dtype=np.float64).copy()
+            rows.append(row)
+            landmarks.append(candidate)
+
+            closest = np.minimum(closest, row)
+            closest[landmarks] = -1
+            candidate = int(np.argmax(closest))
+            if closest[candidate] <= 0:
+                break
+
+        self.dist = np.vstack(rows)
+        self._columns = None
+        self.landmark_ids = [csr.ids[i] for i in landmarks]
+        self.version = version
+
+        np.save(self.dist_path, self.dist)
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": csr.fingerprint(), "landmarks": self.landmark_ids}, f)
+
+    def load(self, graph):
+        """Diskteki tablolar mevcut grafla uyumluysa yükler. Başarılıysa True döner."""
+        if not (os.path.exists(self.dist_path) and os.path.exists(self.meta_path)):
+            return False
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            dist = np.load(self.dist_path)
+        except (OSError, ValueError):
+            return False
+
+        if meta.get("fingerprint") != graph.freeze().fingerprint():
+            return False
+
+        self.dist = dist
+        self._columns = None
+        self.landmark_ids = meta.get("landmarks", [])
+        self.version = graph.version
+        return True
+
+    def is_fresh(self, graph):
+        return self.dist is not None and self.version == graph.version
+
+    def ensure_fresh(self, graph):
+        """Graf değiştiyse tabloları yeniden hesaplar ve diske yazar."""
+        if not self.is_fresh(graph):
+            self.build(graph)
+
+    def heuristic_for(self, target):
+        """
+        target (CSR indeksi) için h(v) = max_L |d(L, t) - d(L, v)| fonksiyonunu döndürür.
+        Tüm düğümler için önceden hesaplama yapılmaz: h(v) yalnızca v'nin K mesafesinden, çağrıldığında
+        hesaplanır (A* her düğüm için en fazla bir kez çağırır ve sonucu sorgu boyunca saklar).
+        """
+        if self.dist.size == 0:
+            return lambda v: 0.0
+        if self._columns is None:
+            # Ulaşılamayan kayıtlar 0 sayılır: hedefin bileşenindeki düğümler için bir landmark'a
+            # ya her ikisi de ulaşır ya da hiçbiri ulaşamaz (fark 0), sezgi yine kabul edilebilir kalır
+            self._columns = np.where(np.isfinite(self.dist), self.dist, 0.0).T.tolist()
+        columns = self._columns
+        to_target = columns[target]
+        return lambda v: max(map(abs, map(sub, to_target, columns[v])))
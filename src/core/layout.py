@@ -0,0 +1,177 @@
+import math
+
+import numpy as np
+
+# Bu düğüm sayısına kadar itme kuvvetleri doğrudan (tüm çiftler) hesaplanır
+DIRECT_LIMIT = 256
+# Dörtlü ağacın en fazla derinliği (en ince seviyede 4^derinlik hücre)
+MAX_DEPTH = 10
+# Dolu yaprak hücre başına hedeflenen en fazla ortalama düğüm sayısı
+LEAF_OCCUPANCY = 1.25
+
+
+def _interaction_offsets():
+    """
+    Hücrenin etkileşim listesi: ebeveyninin komşularının çocuklarından, hücreye komşu olmayan 27 hücre.
+    Göreli konumlar hücrenin x/y paritesine bağlıdır: [parite_x * 2 + parite_y] -> (27, 2).
+    """
+    tables = np.empty((4, 27, 2), dtype=np.int64)
+    for px in (0, 1):
+        for py in (0, 1):
+            tables[px * 2 + py] = [(dx, dy) for dx in range(-2 - px, 4 - px) for dy in range(-2 - py, 4 - py)
+                                   if max(abs(dx), abs(dy)) > 1]
+    return tables
+
+
+_INTERACTIONS = _interaction_offsets()
+_PAD = 3  # Etkileşim listesindeki en uzak hücre 3 hücre ötededir
+_NEIGHBORS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy], dtype=np.int64)
+
+
+def _direct_field(z):
+    """Her düğüm için Σ_j 1 / (z_i - z_j), j ≠ i (tüm çiftler)."""
+    diff = z[:, None] - z[None, :]
+    np.fill_diagonal(diff, np.inf)
+    return (1 / diff).sum(axis=1)
+
+
+def _tree_field(z):
+    """
+    _direct_field'in Barnes-Hut yaklaşığı. Düğümler her seviyesi ayrı bir ızgara olan bir dörtlü
+    ağaca yerleştirilir (hücre kütlesi ve kütle merkezi np.bincount ile). Her seviyede bir hücre,
+    etkileşim listesindeki (yeterince uzak) hücreleri kütle merkezlerinde tek nokta olarak görür;
+    bu katkı hücre merkezinde değeri ve türeviyle hesaplanıp hücredeki düğümlere dağıtılır.
+    En ince seviyede komşu hücreler ve düğümün kendi hücresi (kendisi hariç) yakın alanı oluşturur.
+    """
+    x, y = z.real, z.imag
+    lo_x, lo_y = x.min(), y.min()
+    size = max(x.max() - lo_x, y.max() - lo_y) * (1 + 1e-9) or 1.0
+    side = 1 << MAX_DEPTH
+    ix = np.minimum(((x - lo_x) * (side / size)).astype(np.int64), side - 1)
+    iy = np.minimum(((y - lo_y) * (side / size)).astype(np.int64), side - 1)
+
+    # Derinlik, dolu yaprak hücre başına ortalama düğüm sayısı küçük kalacak şekilde seçilir
+    # (düğümler kümelendiğinde yakın alandaki kütle merkezi yaklaşımı kaba kalmasın)
+    n = len(z)
+    depth = min(max(math.ceil(math.log(n, 4)), 2), MAX_DEPTH)
+    while depth < MAX_DEPTH:
+        shift = MAX_DEPTH - depth
+        occupied = np.count_nonzero(np.bincount(((ix >> shift) << depth) + (iy >> shift), minlength=1 << 2 * depth))
+        if n <= LEAF_OCCUPANCY * occupied:
+            break
+        depth += 1
+    ix, iy = ix >> (MAX_DEPTH - depth), iy >> (MAX_DEPTH - depth)
+
+    field = np.zeros(len(z), dtype=np.complex128)
+    for level in range(2, depth + 1):
+        # Izgaranın her yanına _PAD boş hücre eklenir; komşu hücre kodları sınır kontrolü gerekmeden
+        # hücre koduna sabit bir fark eklenerek bulunur
+        width = 1 << level
+        stride = width + 2 * _PAD
+        cx, cy = ix >> (depth - level), iy >> (depth - level)
+        code = (cx + _PAD) * stride + (cy + _PAD)
+
+        # Boş hücreler kütlesizdir ve kütle merkezleri çok uzaktadır (katkıları 0)
+        mass = np.bincount(code, minlength=stride * stride).astype(np.float64)
+        occupied = np.flatnonzero(mass)
+        com = np.full(stride * stride, 1e18, dtype=np.complex128)
+        com[occupied] = (np.bincount(code, x, stride * stride)[occupied]
+                         + 1j * np.bincount(code, y, stride * stride)[occupied]) / mass[occupied]
+
+        cell_width = size / width
+        ocx, ocy = occupied // stride - _PAD, occupied % stride - _PAD
+        center = lo_x + (ocx + 0.5) * cell_width + 1j * (lo_y + (ocy + 0.5) * cell_width)
+        parity = (ocx & 1) * 2 + (ocy & 1)
+
+        value = np.zeros(stride * stride, dtype=np.complex128)
+        slope = np.zeros(stride * stride, dtype=np.complex128)
+        for p, offsets in enumerate(_INTERACTIONS):
+            group = np.flatnonzero(parity == p)
+            cells = occupied[group]
+            targets = cells[:, None] + (offsets[:, 0] * stride + offsets[:, 1])
+            inverse = 1 / (center[group, None] - com[targets])
+            terms = mass[targets] * inverse
+            value[cells] = terms.sum(axis=1)
+            slope[cells] = -(terms * inverse).sum(axis=1)
+
+        # Birinci dereceden açılım: f(z) ≈ f(merkez) + f'(merkez) * (z - merkez)
+        node_center = lo_x + (cx + 0.5) * cell_width + 1j * (lo_y + (cy + 0.5) * cell_width)
+        field += value[code] + slope[code] * (z - node_center)
+
+    # Yakın alan: 8 komşu hücre kütle merkezlerinde, kendi hücresi düğümün kendisi çıkarılarak
+    # (m kütleli hücreden düğüm çıkınca kalanların merkezi (m * c - z) / (m - 1) olur)
+    targets = code[:, None] + (_NEIGHBORS[:, 0] * stride + _NEIGHBORS[:, 1])
+    field += (mass[targets] / (z[:, None] - com[targets])).sum(axis=1)
+    own = mass[code]
+    field += (own - 1) ** 2 / (own * np.where(own > 1, z - com[code], 1))
+    return field
+
+
+def force_layout(n, sources, targets, k=None, scale=1.0, iterations=100, seed=42, threshold=1e-4):
+    """
+    Fruchterman-Reingold kuvvet yönelimli yerleşim (nx.spring_layout ile aynı kuvvetler ve ölçekleme).
+    İtme Barnes-Hut dörtlü ağacıyla O(n log n), çekme kenar dizileri üzerinde vektörel hesaplanır.
+    Adım uzunluğu uyarlamalıdır (Hu, 2005): enerji art arda azalırsa büyür, azalmazsa küçülür.
+    Aynı girdi ve seed ile sonuç aynıdır.
+
+    sources, targets: 0..n-1 aralığında kenar uçları. Dönüş: merkezi 0, en büyük mutlak koordinatı
+    scale olan (n, 2) konum dizisi.
+    """
+    if n == 0:
+        return np.zeros((0, 2))
+    if n == 1:
+        return np.zeros((1, 2))
+
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    loops = sources == targets
+    if loops.any():
+        sources, targets = sources[~loops], targets[~loops]
+
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    z = pos[:, 0] + 1j * pos[:, 1]
+    if k is None:
+        k = math.sqrt(1.0 / n)
+
+    step = 0.1 * max(np.ptp(z.real), np.ptp(z.imag))
+    energy = np.inf
+    progress = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(iterations):
+            field = _direct_field(z) if n <= DIRECT_LIMIT else _tree_field(z)
+            finite = np.isfinite(field)
+            if not finite.all():
+                field[~finite] = 0  # Üst üste binen düğümler
+
+            # İtme: Σ k² (z_i - z_j) / |z_i - z_j|² = k² * eşlenik(Σ 1 / (z_i - z_j))
+            displacement = k * k * np.conj(field)
+
+            # Çekme: her kenar uçlarını |d| * d / k kuvvetiyle birbirine yaklaştırır
+            delta = z[sources] - z[targets]
+            pull = np.abs(delta) * delta / k
+            displacement += (np.bincount(targets, pull.real, n) - np.bincount(sources, pull.real, n)
+                             + 1j * (np.bincount(targets, pull.imag, n) - np.bincount(sources, pull.imag, n)))
+
+            length = np.abs(displacement)
+            new_energy = float(np.dot(length, length))
+            if new_energy < energy:
+                progress += 1
+                if progress >= 5:
+                    progress = 0
+                    step /= 0.9
+            else:
+                progress = 0
+                step *= 0.9
+            energy = new_energy
+
+            move = displacement * (step / np.where(length < 0.01, 0.1, length))
+            z += move
+            if math.sqrt(np.vdot(move, move).real) / n < threshold:
+                break
+
+    z -= z.mean()
+    limit = max(np.abs(z.real).max(), np.abs(z.imag).max())
+    if limit > 0:
+        z *= scale / limit
+    return np.column_stack((z.real, z.imag))
@@ -0,0 +1,62 @@
+import numpy as np
+
+from .csr import entry_positions
+
+
+def _gather(offsets, targets, vertices):
+    """Verilen düğümlerin tüm komşularını tek vektörel işlemle toplar: (sahip, komşu) dizileri."""
+    positions, counts = entry_positions(offsets, vertices)
+    return np.repeat(vertices, counts), targets[positions]
+
+
+def bfs_levels(csr, source, alpha=14, beta=24):
+    """
+    Yön değiştiren (direction-optimizing), seviye senkron BFS.
+    Sınır küçükken yukarıdan aşağı (sınırdaki düğümlerin komşuları), sınır büyüyünce
+    aşağıdan yukarı (ziyaret edilmemiş düğümler sınırda komşu arar) genişletilir.
+    Ziyaret ve sınır kümeleri CSR indeksleri üzerinde NumPy boolean dizileridir.
+
+    Dönüş: CSR indeks sırasıyla np.int32 sekme (hop) seviyeleri; ulaşılamayan düğümler -1.
+    """
+    offsets, targets, _, _ = csr.numpy_arrays()
+    n = len(csr)
+    levels = np.full(n, -1, dtype=np.int32)
+    if n == 0:
+        return levels
+
+    degrees = np.diff(offsets)
+    visited = np.zeros(n, dtype=bool)
+    visited[source] = True
+    levels[source] = 0
+
+    frontier = np.array([source], dtype=np.int64)
+    unexplored_edges = int(degrees.sum()) - int(degrees[source])
+    bottom_up = False
+    level = 0
+
+    while frontier.size:
+        level += 1
+        frontier_edges = int(degrees[frontier].sum())
+
+        # Beamer sezgisi: sınırın kenarları kalan kenarlara göre büyükse aşağıdan yukarıya geç
+        if not bottom_up and frontier_edges > unexplored_edges / alpha:
+            bottom_up = True
+        elif bottom_up and frontier.size < n / beta:
+            bottom_up = False
+
+        if bottom_up:
+            in_frontier = np.zeros(n, dtype=bool)
+            in_frontier[frontier] = True
+            candidates = np.flatnonzero(~visited)
+            owners, neighbors = _gather(offsets, targets, candidates)
+            next_frontier = np.unique(owners[in_frontier[neighbors]])
+        else:
+            _, neighbors = _gather(offsets, targets, frontier)
+            next_frontier = np.unique(neighbors[~visited[neighbors]])
+
+        visited[next_frontier] = True
+        levels[next_frontier] = level
+        unexplored_edges -= int(degrees[next_frontier].sum())
+        frontier = next_frontier
+
+    return levels
@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# İşçi süreçte bir kez yüklenen CSR dizileri (her görevde tekrar gönderilmesin diye)
+_worker_arrays = None
+
+
+def _init_worker(arrays):
+    global _worker_arrays
+    _worker_arrays = arrays
+
+
+def _call(func, item):
+    return func(_worker_arrays, item)
+
+
+def default_processes():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def graph_pool(arrays, processes):
+    """Dizileri her işçiye başlangıçta bir kez yükleyen süreç havuzu (with ile kullanılır)."""
+    return ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(arrays,))
+
+
+def pool_map(pool, func, items, chunksize=1):
+    """graph_pool ile açılmış havuzda func(arrays, item) çağrılarının sonuçları (sırayla)."""
+    return pool.map(partial(_call, func), items, chunksize=chunksize)
+
+
+def map_over_graph(csr, func, items, processes=None, chunksize=None):
+    """
+    func(arrays, item) fonksiyonunu her öğe için (genelde kaynak düğüm) çalıştırır ve
+    sonuçları sırayla üretir. processes=1 ise aynı süreçte çalışır; aksi halde CSR dizileri
+    işçilere başlangıçta bir kez gönderilir. func modül seviyesinde tanımlı olmalıdır (pickle).
+    """
+    items = list(items)
+    if processes is None:
+        processes = default_processes()
+
+    arrays = csr.arrays()
+    if processes <= 1 or len(items) < 2:
+        for item in items:
+            yield func(arrays, item)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (processes * 8))
+
+    with graph_pool(arrays, processes) as pool:
+        yield from pool_map(pool, func, items, chunksize)
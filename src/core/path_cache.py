@@ -0,0 +1,90 @@
+import heapq
+from collections import OrderedDict
+
+
+class ShortestPathTree:
+    """
+    Tek bir kaynaktan başlayan Dijkstra'nın kaydedilmiş durumu.
+    Hedefe ulaşınca durur ama yığın (heap) saklanır; aynı kaynaktan sonraki
+    sorgular aramaya baştan değil kaldığı yerden devam eder.
+    """
+
+    def __init__(self, csr, source):
+        self.csr = csr
+        self.source = source
+        self.distances = [float('inf')] * len(csr)
+        self.distances[source] = 0
+        self.predecessors = [-1] * len(csr)
+        self.settled = bytearray(len(csr))
+        self.queue = [(0, source)]
+
+    def settle(self, target):
+        """target kesinleşene (ya da erişilebilir düğümler bitene) kadar aramayı ilerletir."""
+        if self.settled[target]:
+            return
+
+        offsets, targets, weights = self.csr.offsets, self.csr.targets, self.csr.weights
+        distances, predecessors, settled = self.distances, self.predecessors, self.settled
+        queue = self.queue
+
+        while queue:
+            current_cost, current = heapq.heappop(queue)
+            if current_cost > distances[current]:
+                continue
+            settled[current] = 1
+
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                distance = current_cost + weights[j]
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current
+                    heapq.heappush(queue, (distance, neighbor))
+
+            if current == target:
+                return
+
+    def result(self, target):
+        """(maliyet, [Node...]) döndürür; settle(target) sonrasında çağrılmalıdır."""
+        if self.distances[target] == float('inf'):
+            return float('inf'), []
+        return self.distances[target], self.csr.build_path(self.predecessors, target)
+
+
+class ShortestPathTreeCache:
+    """Kaynak düğüme göre anahtarlanmış, sınırlı boyutlu (LRU) en kısa yol ağacı önbelleği."""
+
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self._trees = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, csr, source):
+        # Graf değiştiyse eski ağaçlar geçersizdir
+        if csr.version != self._version:
+            self.clear()
+            self._version = csr.version
+
+        tree = self._trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source)
+            return tree
+
+        self.misses += 1
+        tree = ShortestPathTree(csr, source)
+        self._trees[source] = tree
+        if len(self._trees) > self.capacity:
+            self._trees.popitem(last=False)
+        return tree
+
+    def clear(self):
+        self._trees.clear()
+
+    def __len__(self):
+        return len(self._trees)
+
+    def stats_text(self):
+        return f"Yol önbelleği: {self.hits} isabet / {self.misses} ıska ({len(self)}/{self.capacity})"
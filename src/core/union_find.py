@@ -0,0 +1,128 @@
+from collections import deque
+
+
+class ComponentIndex:
+    """
+    Bağlı bileşenlerin artımlı takibi (union-find / disjoint set).
+    Düğüm ve kenar eklemeleri birleştirme (union) ile anında yansır; her kök, bileşenin
+    üye kümesini tutar. Kenar ya da düğüm silindiğinde yalnızca etkilenen bileşen
+    yeniden etiketlenir.
+    """
+
+    def __init__(self):
+        self.parent = {}
+        self.members = {}  # {kök_id: {üye_id, ...}}
+
+    def clear(self):
+        self.parent = {}
+        self.members = {}
+
+    def add(self, node_id):
+        if node_id not in self.parent:
+            self.parent[node_id] = node_id
+            self.members[node_id] = {node_id}
+
+    def find(self, node_id):
+        parent = self.parent
+        while parent[node_id] != node_id:
+            # Yol yarılama: her adımda düğümü büyük ebeveynine bağla
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+
+        # Küçük bileşen büyüğüne bağlanır (boyuta göre birleştirme)
+        if len(self.members[root_a]) < len(self.members[root_b]):
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.members[root_a] |= self.members.pop(root_b)
+        return root_a
+
+    # --- SORGULAR ---
+
+    def component_of(self, node_id):
+        """Düğümün bileşenindeki tüm id'ler (salt okunur kullanılmalı)."""
+        return self.members[self.find(node_id)]
+
+    def size_of(self, node_id):
+        return len(self.members[self.find(node_id)])
+
+    def connected(self, a, b):
+        if a not in self.parent or b not in self.parent:
+            return False
+        return self.find(a) == self.find(b)
+
+    def count(self):
+        return len(self.members)
+
+    def components(self):
+        return list(self.members.values())
+
+    # --- SİLME ---
+
+    def _relabel(self, old_root, parts):
+        """Eski bileşeni verilen parçalara böler; her parçanın üyeleri doğrudan köke bağlanır."""
+        del self.members[old_root]
+        for part in parts:
+            root = next(iter(part))
+            for node_id in part:
+                self.parent[node_id] = root
+            self.members[root] = part
+
+    def edge_removed(self, adj, u_id, v_id):
+        """
+        u-v kenarı silindikten sonra çağrılır. İki uçtan sırayla birer düğüm genişleten
+        BFS'ler yürütülür: biri diğerine ulaşırsa bileşen bölünmemiştir; önce tükenen
+        taraf kopan (küçük) parçadır ve sadece bu bileşen yeniden etiketlenir.
+        """
+        if u_id == v_id:
+            return
+
+        seen = ({u_id}, {v_id})
+        queues = (deque([u_id]), deque([v_id]))
+        while queues[0] and queues[1]:
+            for side in (0, 1):
+                current = queues[side].popleft()
+                for neighbor in adj[current]:
+                    if neighbor in seen[1 - side]:
+                        return
+                    if neighbor not in seen[side]:
+                        seen[side].add(neighbor)
+                        queues[side].append(neighbor)
+                if not queues[side]:
+                    break
+
+        side = 0 if not queues[0] else 1
+        old_root = self.find(u_id)
+        detached = seen[side]
+        self._relabel(old_root, [self.members[old_root] - detached, detached])
+
+    def node_removed(self, adj, node_id):
+        """
+        Düğüm (ve kenarları) silindikten sonra çağrılır. Düğümün eski bileşeni,
+        kalan üyeler arasında BFS ile parçalara ayrılır.
+        """
+        old_root = self.find(node_id)
+        remaining = self.members[old_root]
+        remaining.discard(node_id)
+        del self.parent[node_id]
+
+        parts = []
+        unvisited = set(remaining)
+        while unvisited:
+            start = unvisited.pop()
+            part = {start}
+            queue = deque([start])
+            while queue:
+                current = queue.popleft()
+                for neighbor in adj[current]:
+                    if neighbor in unvisited:
+                        unvisited.discard(neighbor)
+                        part.add(neighbor)
+                        queue.append(neighbor)
+            parts.append(part)
+        self._relabel(old_root, parts)
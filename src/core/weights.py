@@ -0,0 +1,29 @@
+import numpy as np
+
+
+def attribute_matrix(nodes, ids):
+    """Ağırlık formülünde kullanılan özellikleri (öğrenci, sıralama, yıl) tek bir matriste toplar."""
+    return np.array(
+        [(nodes[nid].ogrenci_sayisi, nodes[nid].tr_siralama, nodes[nid].kurulus_yil) for nid in ids],
+        dtype=np.float64
+    ).reshape(len(ids), 3)
+
+
+def edge_weights(nodes, pairs):
+    """
+    Verilen (u_id, v_id) çiftlerinin ağırlıklarını tek bir vektörel ifadeyle hesaplar.
+    Formül Graph.calculate_weight ile aynıdır: 1 + sqrt(farkların kareleri toplamı / 100)
+    """
+    if len(pairs) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+    # Sadece çiftlerde geçen düğümlerin özellikleri okunur
+    ids = np.unique(pairs)
+    attrs = attribute_matrix(nodes, ids.tolist())
+    u = np.searchsorted(ids, pairs[:, 0])
+    v = np.searchsorted(ids, pairs[:, 1])
+
+    diff = attrs[u] - attrs[v]
+    return 1 + np.sqrt(np.einsum('ij,ij->i', diff, diff) / 100)
@@ -25,4 +25,6 @@ if __name__ == "__main__":
     window = MainWindow(graph, loader)
     window.show()
 
-    sys.exit(app.exec_())
\ No newline at end of file
+    exit_code = app.exec_()
+    loader.close()
+    sys.exit(exit_code)
\ No newline at end of file
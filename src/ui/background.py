@@ -0,0 +1,23 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class BackgroundTask(QThread):
+    """
+    Uzun süren bir hesaplamayı (önişleme, matris hesabı) arayüzü dondurmadan ayrı bir
+    iş parçacığında çalıştırır. Sonuç succeeded, hata mesajı failed sinyaliyle arayüz
+    iş parçacığına iletilir.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, func, parent=None):
+        super().__init__(parent)
+        self.func = func
+
+    def run(self):
+        try:
+            result = self.func()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.succeeded.emit(result)
@@ -0,0 +1,64 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QComboBox, QPushButton, QSpinBox,
+                             QCheckBox, QDoubleSpinBox)
+
+
+class CentralityDialog(QDialog):
+    # Görünen ad -> Graph.centrality_scores metrik adı
+    METRICS = {
+        "Derece (Bağlantı Sayısı)": "degree",
+        "Toplam Ağırlık": "strength",
+        "PageRank": "pagerank",
+        "Özvektör Merkeziliği (Eigenvector)": "eigenvector",
+        "Arasındalık (Betweenness)": "betweenness",
+        "Yakınlık (Closeness)": "closeness",
+        "Harmonik Merkezilik": "harmonic"
+    }
+
+    def __init__(self, node_count, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Merkezilik Analizi")
+        self.resize(350, 300)
+
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Metrik:"))
+        self.combo_metric = QComboBox()
+        self.combo_metric.addItems(list(self.METRICS))
+        layout.addWidget(self.combo_metric)
+
+        layout.addSpacing(10)
+
+        layout.addWidget(QLabel("Listelenecek Üniversite Sayısı (K):"))
+        self.spin_k = QSpinBox()
+        self.spin_k.setRange(1, max(1, node_count))
+        self.spin_k.setValue(min(5, max(1, node_count)))
+        layout.addWidget(self.spin_k)
+
+        layout.addSpacing(10)
+
+        # Yaklaşık mod: büyük graflarda tüm kaynaklar yerine rastgele pivotlar taranır
+        self.chk_approx = QCheckBox("Yaklaşık hesapla (rastgele pivot örneklemesi)")
+        layout.addWidget(self.chk_approx)
+        layout.addWidget(QLabel("Hata sınırı (ε):"))
+        self.spin_epsilon = QDoubleSpinBox()
+        self.spin_epsilon.setRange(0.005, 0.5)
+        self.spin_epsilon.setSingleStep(0.005)
+        self.spin_epsilon.setDecimals(3)
+        self.spin_epsilon.setValue(0.05)
+        self.spin_epsilon.setEnabled(False)
+        self.chk_approx.toggled.connect(self.spin_epsilon.setEnabled)
+        layout.addWidget(self.spin_epsilon)
+
+        btn_calc = QPushButton("Hesapla")
+        btn_calc.setStyleSheet("background-color: #2196F3; color: white; font-weight: bold; padding: 10px; border-radius: 5px;")
+        btn_calc.clicked.connect(self.accept)
+        layout.addWidget(btn_calc)
+
+    def get_selection(self):
+        """(metrik görünen adı, metrik, K, CentralityEngine seçenekleri)"""
+        name = self.combo_metric.currentText()
+        metric = self.METRICS[name]
+        options = {}
+        if self.chk_approx.isChecked() and metric in ("betweenness", "closeness", "harmonic"):
+            options["epsilon"] = self.spin_epsilon.value()
+        return name, metric, self.spin_k.value(), options
@@ -23,11 +23,11 @@ COLOR_NAMES = {
 class ColoringDialog(QDialog):
 
 
-    def __init__(self, graph: Graph, coloring: dict, parent=None):
+    def __init__(self, graph: Graph, coloring: dict, parent=None, title="Welsh-Powell Renklendirme Sonuçları"):
         super().__init__(parent)
         self.graph = graph
         self.coloring = coloring
-        self.setWindowTitle("Welsh-Powell Renklendirme Sonuçları")
+        self.setWindowTitle(title)
         self.setMinimumSize(800, 500)
         self.exporter = Exporter()
 
@@ -55,33 +55,62 @@ class ColoringDialog(QDialog):
     def _populate_table(self):
         """Tabloyu renklendirme verileriyle doldurur."""
         self.table_widget.setRowCount(len(self.coloring))
+        self._rows = {}  # {uni_id: satır}
         row = 0
 
         # Renk ID'sine göre sırala
         sorted_items = sorted(self.coloring.items(), key=lambda item: item[1])
 
         for uni_id, color_id in sorted_items:
-            node = self.graph.nodes.get(uni_id)
-            if not node:
+            if uni_id not in self.graph.nodes:
                 continue
-
-            color_name = COLOR_NAMES.get(color_id, f"Renk {color_id}")
-            # Komşu isimlerini al
-            neighbor_ids = self.graph.get_neighbors(uni_id)
-            neighbor_names = [self.graph.nodes[nid].adi for nid in neighbor_ids if nid in self.graph.nodes]
-            neighbors_str = ", ".join(sorted(neighbor_names))
-
-            self.table_widget.setItem(row, 0, QTableWidgetItem(str(node.uni_id)))
-            self.table_widget.setItem(row, 1, QTableWidgetItem(node.adi))
-            self.table_widget.setItem(row, 2, QTableWidgetItem(node.sehir))
-            self.table_widget.setItem(row, 3, QTableWidgetItem(str(color_id)))
-            self.table_widget.setItem(row, 4, QTableWidgetItem(color_name))
-            self.table_widget.setItem(row, 5, QTableWidgetItem(neighbors_str))
-
+            self._fill_row(row, uni_id, color_id)
+            self._rows[uni_id] = row
             row += 1
 
+        self.table_widget.setRowCount(row)
         self.table_widget.resizeColumnsToContents()
 
+    def _fill_row(self, row, uni_id, color_id):
+        node = self.graph.nodes[uni_id]
+        color_name = COLOR_NAMES.get(color_id, f"Renk {color_id}")
+        # Komşu isimlerini al
+        neighbor_ids = self.graph.get_neighbors(uni_id)
+        neighbor_names = [self.graph.nodes[nid].adi for nid in neighbor_ids if nid in self.graph.nodes]
+        neighbors_str = ", ".join(sorted(neighbor_names))
+
+        self.table_widget.setItem(row, 0, QTableWidgetItem(str(node.uni_id)))
+        self.table_widget.setItem(row, 1, QTableWidgetItem(node.adi))
+        self.table_widget.setItem(row, 2, QTableWidgetItem(node.sehir))
+        self.table_widget.setItem(row, 3, QTableWidgetItem(str(color_id)))
+        self.table_widget.setItem(row, 4, QTableWidgetItem(color_name))
+        self.table_widget.setItem(row, 5, QTableWidgetItem(neighbors_str))
+
+    def apply_diff(self, diff, touched=()):
+        """
+        Yalnızca değişen satırları yeniler: diff'teki düğümler (renk None ise satır silinir) ve
+        komşu listesi değişen touched düğümleri. Tablonun tamamı yeniden kurulmaz.
+        """
+        for uni_id in set(diff) | set(touched):
+            row = self._rows.get(uni_id)
+            if uni_id not in self.graph.nodes or diff.get(uni_id, 0) is None:
+                if row is not None:
+                    self.table_widget.removeRow(row)
+                    del self._rows[uni_id]
+                    for other, other_row in self._rows.items():
+                        if other_row > row:
+                            self._rows[other] = other_row - 1
+                continue
+
+            color_id = self.coloring.get(uni_id)
+            if color_id is None:
+                continue
+            if row is None:
+                row = self.table_widget.rowCount()
+                self.table_widget.insertRow(row)
+                self._rows[uni_id] = row
+            self._fill_row(row, uni_id, color_id)
+
     def _export_to_csv(self):
         try:
             print("EXPORT TIKLANDI")
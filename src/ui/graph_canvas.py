@@ -45,6 +45,15 @@ class GraphCanvas(QWidget):
         self.highlighted_path = []  # Renklendirme yapılırsa yolu temizle
         self.update()
 
+    def apply_coloring_diff(self, diff):
+        """Artımlı yeniden boyama farkını uygular: {uni_id: renk}; renk None ise düğüm silinmiştir."""
+        for uni_id, color in diff.items():
+            if color is None:
+                self.coloring_result.pop(uni_id, None)
+            else:
+                self.coloring_result[uni_id] = color
+        self.update()
+
     def set_path(self, path_nodes):
         """Dijkstra sonucunu çizmek için yolu ayarlar."""
         self.highlighted_path = path_nodes
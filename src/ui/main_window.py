@@ -1,5 +1,6 @@
 import sys
 import os
+import shutil
 import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -13,17 +14,23 @@ from PyQt5.QtWidgets import QDialog, QVBoxLayout, QComboBox, QLabel, QDialogButt
 from PyQt5.QtGui import  QFont, QPalette, QColor, QLinearGradient, QPainter
 from core.node import Node
 from core.graph import Graph
+from core.apsp import AllPairsShortestPaths, MAX_MATRIX_BYTES
+from core.landmarks import LandmarkIndex
+from core.contraction import ContractionHierarchy, ContractionHierarchyAlgorithm
 from core.algorithms import (
     DijkstraAlgorithm,
     BFSAlgorithm,
     DFSAlgorithm,
     AStarAlgorithm,
-    WelshPowellAlgorithm
+    BidirectionalDijkstraAlgorithm
 )
+from core.coloring import WelshPowellAlgorithm, DSaturAlgorithm, ColoringSession
 from .graph_canvas import GraphCanvas
+from .background import BackgroundTask
 from .add_node_dialog import AddNodeDialog
 from .coloring_dialog import ColoringDialog
 from .path_dialog import PathDialog
+from .centrality_dialog import CentralityDialog
 from .add_edge_dialog import AddEdgeDialog
 
 
@@ -120,19 +127,60 @@ class CardWidget(QFrame):
 
 
 class MainWindow(QMainWindow):
+    # Yol penceresinde seçilebilen algoritmalar
+    PATH_ALGORITHMS = {
+        "Dijkstra": DijkstraAlgorithm,
+        "A*": AStarAlgorithm,
+        "Çift Yönlü Dijkstra": BidirectionalDijkstraAlgorithm,
+        "Contraction Hierarchy": ContractionHierarchyAlgorithm
+    }
+
+    # Renklendirme penceresinde seçilebilen algoritmalar
+    COLORING_ALGORITHMS = {
+        "Welsh-Powell": WelshPowellAlgorithm,
+        "DSatur": DSaturAlgorithm
+    }
+
+    # Topluluk analizi yöntemleri (Graph.detect_communities adı; None: bağlı bileşenler)
+    COMMUNITY_METHODS = {
+        "Louvain (Modülerlik)": "louvain",
+        "Etiket Yayılımı": "label_propagation",
+        "Bağlı Bileşenler": None
+    }
+
     def __init__(self, graph, data_loader):
         super().__init__()
         self.graph = graph
         self.loader = data_loader
         self.selected_node = None
         self.coloring_result = {}
+        # Düzenlemelerde renklendirmeyi artımlı güncelleyen oturum ve açık sonuç penceresi
+        self.coloring_session = None
+        self.coloring_dialog = None
 
         self.setWindowTitle("Sosyal Ağ Analiz Platformu")
         self.setMinimumSize(1400, 850)
         self.apply_modern_theme()
 
-        self.animation_sequence = []
-        self.current_animation_step = 0
+        self.animation_sequence = iter(())
+        self.pending_event = None
+        self.animation_step_count = 0
+
+        # Arka planda süren önişleme / matris hesabı (aynı anda en fazla bir tane)
+        self.background_task = None
+
+        # Daha önce hesaplanmış tüm çiftler matrisi varsa ve graf değişmediyse kullan
+        self.path_index = AllPairsShortestPaths.for_database(self.loader.db_path)
+        if self.path_index.load(self.graph):
+            self.graph.path_index = self.path_index
+
+        # A* landmark tabloları: diskte güncel sürüm yoksa ilk A* sorgusunda arka planda hesaplanır
+        self.graph.landmarks = LandmarkIndex.for_database(self.loader.db_path)
+        self.graph.landmarks.load(self.graph)
+
+        # Contraction Hierarchy: diskte güncel sürüm yoksa ilk CH sorgusunda arka planda hesaplanıp kaydedilir
+        self.graph.contraction = ContractionHierarchy.for_database(self.loader.db_path)
+        self.graph.contraction.load(self.graph)
 
         self.init_ui()
 
@@ -292,8 +340,11 @@ class MainWindow(QMainWindow):
             ("Renklendir (W.Powell)", self.run_coloring),
             ("A* (En Kısa Yol)", lambda: self.open_path_dialog("A*")),
             ("Dijkstra (En Kısa Yol)", lambda: self.open_path_dialog("Dijkstra")),
+            ("Tüm Yolları Önhesapla", self.precompute_all_paths),
+            ("Toplu Yol Hesapla (CSV)", self.run_batch_paths),
             ("Toplulukları Bul", self.show_communities),
-            ("En Etkili 5 Üniversite", self.show_top_5),
+            ("Sekme Uzaklıkları", self.show_hop_distances),
+            ("En Etkili Üniversiteler", self.show_top_5),
             ("Tüm Verileri Dışa Aktar", self.export_full_graph_report)
         ]
         for text, func in algo_items:
@@ -447,6 +498,13 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("Sistem Hazır")
         self.status_bar.addWidget(self.status_label)
 
+        # Dijkstra önbelleği isabet/ıska sayaçları
+        self.cache_label = QLabel(self.graph.path_cache.stats_text())
+        self.status_bar.addPermanentWidget(self.cache_label)
+
+    def update_cache_status(self):
+        self.cache_label.setText(self.graph.path_cache.stats_text())
+
     def animate_sidebar(self):
         anim = QPropertyAnimation(self.sidebar, b"geometry")
         anim.setDuration(600)
@@ -525,17 +583,13 @@ class MainWindow(QMainWindow):
                     QMessageBox.warning(self, "Hata", "Bir üniversite kendine bağlanamaz.")
                     return
                 # Zaten var mı kontrolü
-                exists = False
-                for edge in self.graph.edges:
-                    ids = [edge.node1.uni_id, edge.node2.uni_id]
-                    if u1_id in ids and u2_id in ids:
-                        exists = True;
-                        break
-                if exists:
+                if self.graph.has_edge(u1_id, u2_id):
                     QMessageBox.warning(self, "Bilgi", "Bu bağlantı zaten mevcut.")
                     return
                 self.loader.add_relation(u1_id, u2_id)
                 self.graph.add_edge(u1_id, u2_id)
+                if self.coloring_session:
+                    self.apply_coloring_diff(self.coloring_session.edge_added(u1_id, u2_id), (u1_id, u2_id))
                 self.canvas.update()
                 QMessageBox.information(self, "Başarılı", "Bağlantı eklendi.")
         except Exception as e:
@@ -561,12 +615,7 @@ class MainWindow(QMainWindow):
                     return
 
                 # Bağlantıyı bulmaya çalış
-                edge_to_remove = None
-                for edge in self.graph.edges:
-                    ids = [edge.node1.uni_id, edge.node2.uni_id]
-                    if u1_id in ids and u2_id in ids:
-                        edge_to_remove = edge
-                        break
+                edge_to_remove = self.graph.get_edge(u1_id, u2_id)
 
                 if edge_to_remove:
                     #  Silme Onayı
@@ -576,16 +625,14 @@ class MainWindow(QMainWindow):
 
                     if reply == QMessageBox.Yes:
                         # Graf'tan sil
-                        self.graph.edges.remove(edge_to_remove)
-                        if u1_id in self.graph.adj:
-                            self.graph.adj[u1_id].discard(u2_id)
-                        if u2_id in self.graph.adj:
-                            self.graph.adj[u2_id].discard(u1_id)
+                        self.graph.remove_edge(u1_id, u2_id)
 
                         # Veritabanından sil
                         if hasattr(self.loader, 'delete_relation'):
                             self.loader.delete_relation(u1_id, u2_id)
 
+                        if self.coloring_session:
+                            self.apply_coloring_diff(self.coloring_session.edge_removed(u1_id, u2_id), (u1_id, u2_id))
                         self.canvas.update()
                         QMessageBox.information(self, "Başarılı", "Bağlantı başarıyla silindi.")
                 else:
@@ -612,6 +659,8 @@ class MainWindow(QMainWindow):
                 if pid in self.graph.nodes:
                     self.loader.add_relation(new_id, pid)
                     self.graph.add_edge(new_id, pid)
+            if self.coloring_session:
+                self.apply_coloring_diff(self.coloring_session.node_added(new_id), self.graph.get_neighbors(new_id))
             self.canvas.update()
             QMessageBox.information(self, "Başarılı", f"{info['adi']} eklendi.")
         except Exception as e:
@@ -625,17 +674,11 @@ class MainWindow(QMainWindow):
                 info, _ = dialog.get_data()
                 self.loader.update_university(self.selected_node.uni_id, info)
                 n = self.selected_node
-                n.adi = info["adi"]
-                n.sehir = info["sehir"]
-                n.ilce = info["ilce"]
-                n.kurulus_yil = info["kurulus_yil"]
-                n.ogrenci_sayisi = info["ogrenci_sayisi"]
-                n.fakulte_sayisi = int(info["fakulte_sayisi"])
-                n.akademik_sayisi = info["akademik_sayisi"]
-                n.tr_siralama = info["tr_siralama"]
-                for edge in self.graph.edges:
-                    if edge.node1 == n or edge.node2 == n:
-                        edge.weight = self.graph.calculate_weight(edge.node1, edge.node2)
+                # Sadece bu düğüme bağlı kenarların ağırlıkları yeniden hesaplanır
+                self.graph.update_node(n.uni_id, info)
+                if self.coloring_session:
+                    # Renk değişmez; yalnızca adı geçen satırlar yenilenir
+                    self.apply_coloring_diff({}, [n.uni_id] + self.graph.get_neighbors(n.uni_id))
                 self.show_node_details(n)
                 self.canvas.update()
                 QMessageBox.information(self, "Güncellendi", "Bilgiler başarıyla güncellendi.")
@@ -648,8 +691,12 @@ class MainWindow(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
             try:
-                self.loader.delete_university(self.selected_node.uni_id)
-                self.graph.remove_node(self.selected_node.uni_id)
+                node_id = self.selected_node.uni_id
+                neighbors = self.graph.get_neighbors(node_id)
+                self.loader.delete_university(node_id)
+                self.graph.remove_node(node_id)
+                if self.coloring_session:
+                    self.apply_coloring_diff(self.coloring_session.node_removed(node_id, neighbors), neighbors)
                 self.selected_node = None
                 self.btn_edit.setEnabled(False)
                 self.btn_delete.setEnabled(False)
@@ -665,86 +712,314 @@ class MainWindow(QMainWindow):
         """En Kısa Yol Penceresi"""
         try:
             uni_list = self.loader.get_university_names()
-            dialog = PathDialog(uni_list, self)
-            dialog.setWindowTitle(f"En Kısa Yol ({algo})")
+            dialog = PathDialog(uni_list, self, algorithms=list(self.PATH_ALGORITHMS), selected_algorithm=algo)
+            dialog.setWindowTitle("En Kısa Yol")
 
             if dialog.exec_():
                 start_id, end_id, s_name, e_name = dialog.get_selection()
+                algo = dialog.get_algorithm()
                 if start_id == end_id:
                     QMessageBox.warning(self, "Hata", "Başlangıç ve Bitiş aynı olamaz.")
                     return
                 self.reset_visuals()
 
-                start_time = time.perf_counter()
+                # Farklı topluluklardaki üniversiteler arasında yol olamaz
+                if not self.graph.same_component(start_id, end_id):
+                    QMessageBox.warning(self, "Sonuç",
+                                        f"Yol bulunamadı.\n\n{s_name} ve {e_name} farklı topluluklarda.")
+                    self.canvas.set_path([])
+                    return
 
-                # --- SOYUTLAMA KULLANIMI ---
-                if algo == "Dijkstra":
-                    strategy = DijkstraAlgorithm()
-                else:
-                    strategy = AStarAlgorithm()
+                strategy = self.PATH_ALGORITHMS.get(algo, DijkstraAlgorithm)()
+                self.start_path_query(strategy, algo, start_id, end_id)
 
-                # Graph içindeki soyut metodu çağırıyoruz
-                cost, path = self.graph.run_algorithm(strategy, start_id, end_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", str(e))
 
-                elapsed = time.perf_counter() - start_time
+    def stale_path_index(self, strategy):
+        """Algoritmanın önişleme tablosu güncel değilse (tablo, durum mesajı) döndürür."""
+        if isinstance(strategy, ContractionHierarchyAlgorithm):
+            index, message = self.graph.contraction, "Contraction Hierarchy önişlemesi yapılıyor..."
+        elif isinstance(strategy, AStarAlgorithm):
+            index, message = self.graph.landmarks, "A* landmark tabloları yeniden hesaplanıyor..."
+        else:
+            return None
+        if index is None or index.is_fresh(self.graph):
+            return None
+        return index, message
+
+    def start_path_query(self, strategy, algo, start_id, end_id):
+        """
+        Önişleme tablosu eskiyse önce arka planda yeniden hesaplanır, sorgu bittiğinde çalışır.
+        Hesap sırasında graf değişirse tablo yine eski kalır ve bir sonraki turda tekrar hesaplanır.
+        """
+        stale = self.stale_path_index(strategy)
+        if stale is None:
+            self.run_path_query(strategy, algo, start_id, end_id)
+            return
+        index, message = stale
+        csr = self.graph.freeze()
+        self.run_in_background(message, lambda: index.build(csr),
+                               lambda _: self.start_path_query(strategy, algo, start_id, end_id))
 
-                if cost == float('inf'):
-                    QMessageBox.warning(self, "Sonuç", "Yol bulunamadı.")
-                    self.canvas.set_path([])
-                else:
-                    self.canvas.set_path(path)
-                    msg = f"✅ Yol Başarıyla Bulundu!\n\n Algoritma: {algo}\n Süre: {elapsed:.6f} sn\n Maliyet: {cost:.2f}"
-                    QMessageBox.information(self, "Rota Sonucu", msg)
+    def run_path_query(self, strategy, algo, start_id, end_id):
+        try:
+            start_time = time.perf_counter()
+
+            # --- SOYUTLAMA KULLANIMI ---
+            # Graph içindeki soyut metodu çağırıyoruz
+            from_index = self.graph.has_fresh_path_index()
+            cost, path = self.graph.run_algorithm(strategy, start_id, end_id)
+
+            elapsed = time.perf_counter() - start_time
+            if from_index:
+                algo += " (Önhesaplama)"
+            self.update_cache_status()
+            self.status_label.setText("Sistem Hazır")
+
+            if cost == float('inf'):
+                QMessageBox.warning(self, "Sonuç", "Yol bulunamadı.")
+                self.canvas.set_path([])
+            else:
+                self.canvas.set_path(path)
+                msg = f"✅ Yol Başarıyla Bulundu!\n\n Algoritma: {algo}\n Süre: {elapsed:.6f} sn\n Maliyet: {cost:.2f}"
+                QMessageBox.information(self, "Rota Sonucu", msg)
 
         except Exception as e:
             QMessageBox.critical(self, "Hata", str(e))
 
+    def run_in_background(self, message, func, on_done):
+        """
+        func'ı arayüzü dondurmadan ayrı bir iş parçacığında çalıştırır; bitince on_done(sonuç)
+        arayüz iş parçacığında çağrılır. Aynı anda yalnızca bir arka plan işi çalışır.
+        """
+        if self.background_task is not None:
+            QMessageBox.information(self, "Meşgul", "Arka planda süren bir hesaplama var, lütfen bitmesini bekleyin.")
+            return False
+
+        task = BackgroundTask(func, self)
+        task.succeeded.connect(lambda result: self.background_task_done(on_done, result))
+        task.failed.connect(self.background_task_failed)
+        task.finished.connect(task.deleteLater)
+        self.background_task = task
+        self.status_label.setText(message)
+        task.start()
+        return True
+
+    def background_task_done(self, on_done, result):
+        # Önce serbest bırakılır: on_done yeni bir arka plan işi başlatabilir
+        self.background_task = None
+        on_done(result)
+
+    def background_task_failed(self, error):
+        self.background_task = None
+        self.status_label.setText("Sistem Hazır")
+        QMessageBox.critical(self, "Hata", error)
+
+    def closeEvent(self, event):
+        # Süren arka plan hesabı bitmeden iş parçacığı yok edilmesin
+        if self.background_task is not None:
+            self.status_label.setText("Arka plan hesabının bitmesi bekleniyor...")
+            self.background_task.wait()
+        super().closeEvent(event)
+
+    def run_batch_paths(self):
+        """CSV'deki üniversite çiftleri için en kısa yolları toplu hesaplayıp rapora yazar."""
+        from PyQt5.QtWidgets import QFileDialog
+        from core.exporter import Exporter
+
+        file_path, _ = QFileDialog.getOpenFileName(self, "Yol Çiftleri (CSV) Seç", "",
+                                                   "CSV Dosyaları (*.csv);;Tüm Dosyalar (*)")
+        if not file_path:
+            return
+
+        try:
+            exporter = Exporter()
+            pairs = exporter.import_pairs_from_csv(file_path)
+            if not pairs:
+                QMessageBox.warning(self, "Veri Yok", "Dosyada geçerli başlangıç/hedef çifti bulunamadı.")
+                return
+
+            # Gruplama arayüz iş parçacığında, yol aramaları arka planda yapılır
+            start_time = time.perf_counter()
+            batch = self.graph.prepare_paths_batch(pairs)
+            self.run_in_background(f"{len(pairs)} yol hesaplanıyor...", batch,
+                                   lambda results: self.batch_paths_finished(exporter, pairs, results, start_time))
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Toplu yol hesabı başarısız: {e}")
+
+    def batch_paths_finished(self, exporter, pairs, results, start_time):
+        elapsed = time.perf_counter() - start_time
+        try:
+            path = exporter.export_path_batch_to_csv(pairs, results)
+        except Exception as e:
+            self.status_label.setText("Sistem Hazır")
+            QMessageBox.critical(self, "Hata", f"Toplu yol raporu yazılamadı: {e}")
+            return
+
+        found = sum(1 for cost, _ in results if cost != float('inf'))
+        self.status_label.setText(f"Toplu yol hesabı bitti ({elapsed:.2f} sn)")
+        QMessageBox.information(self, "Toplu Yol Sonucu",
+                                f"{len(pairs)} çiftin {found} tanesi için yol bulundu.\n"
+                                f"⏱️ Geçen Süre: {elapsed:.6f} saniye\n\nRapor: {path}")
+
+    def precompute_all_paths(self):
+        """Tüm üniversite çiftleri için en kısa yolları arka planda hesaplayıp diske yazar."""
+        if not self.graph.nodes: return
+
+        n = len(self.graph.nodes)
+        size = AllPairsShortestPaths.estimated_bytes(n)
+        size_text = f"{size / 1024 ** 2:,.1f} MB"
+        if size > MAX_MATRIX_BYTES:
+            QMessageBox.warning(self, "Önhesaplama",
+                                f"{n} üniversite için mesafe matrisi {size_text} yer kaplar "
+                                f"(sınır {MAX_MATRIX_BYTES / 1024 ** 2:,.0f} MB).\n"
+                                f"Bu boyuttaki bir graf için yollar tek tek sorgulanmalıdır.")
+            return
+        free = shutil.disk_usage(os.path.dirname(self.path_index.dist_path)).free
+        if size > free:
+            QMessageBox.warning(self, "Önhesaplama",
+                                f"Mesafe matrisi için {size_text} gerekiyor, diskte {free / 1024 ** 2:,.1f} MB boş yer var.")
+            return
+
+        reply = QMessageBox.question(self, "Önhesaplama",
+                                     f"{n} üniversite için {n * n:,} çiftlik mesafe matrisi hesaplanacak.\n"
+                                     f"Matrisler diskte yaklaşık {size_text} yer kaplayacak.\n"
+                                     f"Devam edilsin mi?",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+
+        csr = self.graph.freeze()
+        start_time = time.perf_counter()
+        self.run_in_background("Tüm yollar hesaplanıyor...", lambda: self.path_index.build(csr),
+                               lambda _: self.precompute_finished(start_time))
+
+    def precompute_finished(self, start_time):
+        elapsed = time.perf_counter() - start_time
+        self.graph.path_index = self.path_index
+        self.status_label.setText(f"Önhesaplama hazır ({elapsed:.2f} sn)")
+        if self.path_index.is_fresh(self.graph):
+            note = "Graf değişene kadar yol sorguları bu matristen cevaplanacak."
+        else:
+            note = "Hesap sürerken graf değiştiği için matris kullanılmayacak; önhesaplamayı tekrarlayın."
+        QMessageBox.information(self, "Önhesaplama Bitti",
+                                f"En kısa yol matrisi hazır.\n\n⏱️ Geçen Süre: {elapsed:.6f} saniye\n{note}")
+
     def run_coloring(self):
-        """Welsh-Powell Renklendirme (Abstract/Strategy Yapısıyla)"""
+        """Graf Renklendirme (Abstract/Strategy Yapısıyla): Welsh-Powell veya DSatur"""
         if not self.graph.nodes: return
 
+        from PyQt5.QtWidgets import QInputDialog
+        algo_name, ok = QInputDialog.getItem(self, "Graf Renklendirme", "Algoritma:",
+                                             list(self.COLORING_ALGORITHMS), 0, False)
+        if not ok:
+            return
+
         self.reset_visuals()
 
         try:
             start_time = time.perf_counter()
 
             # Strategy Pattern Kullanımı
-            strategy = WelshPowellAlgorithm()
+            strategy = self.COLORING_ALGORITHMS[algo_name]()
             new_coloring = self.graph.run_coloring_algorithm(strategy)
             # ----------------------------------------------------
 
             elapsed = time.perf_counter() - start_time
 
             self.canvas.update_coloring(new_coloring)
-            self.coloring_result = new_coloring
+            self.coloring_session = ColoringSession(self.graph, new_coloring)
+            self.coloring_result = self.coloring_session.colors
+            color_count = self.coloring_session.color_count()
 
             QMessageBox.information(self, "Renklendirme Bitti",
-                                    f"Graf renklendirme işlemi tamamlandı.\n\n⏱️ Geçen Süre: {elapsed:.6f} saniye")
+                                    f"Graf renklendirme işlemi tamamlandı ({algo_name}).\n\n"
+                                    f"🎨 Renk Sayısı: {color_count}\n⏱️ Geçen Süre: {elapsed:.6f} saniye")
 
-            dialog = ColoringDialog(self.graph, self.coloring_result, self)
-            dialog.exec_()
+            # Pencere açık kalabilir; graf düzenlendikçe yalnızca değişen satırlar güncellenir
+            self.coloring_dialog = ColoringDialog(self.graph, self.coloring_result, self,
+                                                  title=f"{algo_name} Renklendirme Sonuçları")
+            self.coloring_dialog.show()
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Renklendirme hatası: {e}")
 
+    def show_hop_distances(self):
+        """Seçili üniversiteden tüm üniversitelere sekme (hop) uzaklıkları: özet ve CSV raporu."""
+        if not self.selected_node:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce haritadan bir Başlangıç Düğümü seçin.")
+            return
+
+        source = self.selected_node
+        start_time = time.perf_counter()
+        ids, levels = self.graph.hop_levels(source.uni_id)
+        elapsed = time.perf_counter() - start_time
+
+        reached = levels[levels > 0]
+        msg = f" Başlangıç: {source.adi}\n"
+        msg += f" Analiz Süresi: {elapsed:.6f} saniye\n"
+        msg += f"━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+        msg += f"Ulaşılabilen üniversite: {len(reached)} / {len(ids) - 1}\n"
+        if len(reached):
+            farthest = int(reached.max())
+            msg += f"En uzak üniversite: {farthest} sekme\n\n"
+            shown = 10
+            for level in range(1, min(farthest, shown) + 1):
+                msg += f"🔹 {level} sekme: {int((reached == level).sum())} üniversite\n"
+            if farthest > shown:
+                msg += f"... ve {farthest - shown} seviye daha (tamamı CSV raporunda)\n"
+
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("Sekme Uzaklıkları")
+        msg_box.setText(msg)
+        export_button = msg_box.addButton("CSV Olarak Dışarı Aktar", QMessageBox.ActionRole)
+        msg_box.addButton("Kapat", QMessageBox.RejectRole)
+        msg_box.exec_()
+
+        if msg_box.clickedButton() == export_button:
+            try:
+                from core.exporter import Exporter
+                path = Exporter().export_hop_levels_to_csv(self.graph, source, ids, levels)
+                QMessageBox.information(self, "Başarılı", f"Rapor tablo formatında dışa aktarıldı:\n{path}")
+            except Exception as e:
+                QMessageBox.critical(self, "Hata", str(e))
+
     def show_communities(self):
         """Topluluk Analizi Sonucu ve Doğrudan CSV Aktar Butonu"""
-        if not hasattr(self.graph, 'find_connected_components'):
-            QMessageBox.warning(self, "Eksik", "Graph sınıfında analiz metodu yok.")
+        from PyQt5.QtWidgets import QInputDialog
+        method_name, ok = QInputDialog.getItem(self, "Topluluk Analizi", "Yöntem:",
+                                               list(self.COMMUNITY_METHODS), 0, False)
+        if not ok:
             return
+        method = self.COMMUNITY_METHODS[method_name]
+
+        self.status_label.setText("Topluluklar hesaplanıyor...")
+        QApplication.processEvents()
 
-        import time
         start_time = time.perf_counter()
-        comps = self.graph.find_connected_components()
+        if method is None:
+            comps = self.graph.find_connected_components()
+            quality = None
+        else:
+            comps, quality = self.graph.detect_communities(method)
         elapsed = time.perf_counter() - start_time
+        self.status_label.setText("Sistem Hazır")
 
-        msg = f" Analiz Süresi: {elapsed:.6f} saniye\n"
+        msg = f" Yöntem: {method_name}\n"
+        msg += f" Analiz Süresi: {elapsed:.6f} saniye\n"
+        if quality is not None:
+            msg += f" Modülerlik (Q): {quality:.4f}\n"
         msg += f"━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        msg += f"Toplam {len(comps)} adet ayrık topluluk bulundu.\n\n"
+        msg += f"Toplam {len(comps)} adet topluluk bulundu.\n\n"
 
-        for i, comp in enumerate(comps, 1):
+        # Çok sayıda topluluk varsa yalnızca en büyükleri listelenir
+        shown = 20
+        for i, comp in enumerate(comps[:shown], 1):
             names = ", ".join([n.adi[:20] + "..." if len(n.adi) > 20 else n.adi for n in comp[:3]])
             if len(comp) > 3: names += f" ve {len(comp) - 3} diğer..."
             msg += f"🔹 Grup {i} ({len(comp)} Üni): {names}\n"
+        if len(comps) > shown:
+            msg += f"... ve {len(comps) - shown} topluluk daha (tamamı CSV raporunda)\n"
 
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("Topluluk Analizi Sonucu")
@@ -763,27 +1038,35 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Hata", f"Dışa aktarma başarısız: {e}")
 
     def show_top_5(self):
-        """En Etkili 5 Üniversite Gösterimi (YENİ)"""
-        if not hasattr(self.graph, 'get_top_5_influential_unis'):
-            QMessageBox.warning(self, "Eksik", "Metot bulunamadı.")
+        """En Etkili K Üniversite Gösterimi (seçilebilir merkezilik metriği)"""
+        dialog = CentralityDialog(len(self.graph.nodes), self)
+        if not dialog.exec_():
             return
+        metric_name, metric, k, options = dialog.get_selection()
+
+        self.status_label.setText("Merkezilik hesaplanıyor...")
+        QApplication.processEvents()
 
         start_time = time.perf_counter()
-        data = self.graph.get_top_5_influential_unis()
+        data = self.graph.top_influential(metric, k, **options)
         elapsed = time.perf_counter() - start_time
+        self.status_label.setText("Sistem Hazır")
 
         # Dialog oluştur
         dialog = QDialog(self)
-        dialog.setWindowTitle("En Etkili 5 Üniversite (Merkezilik)")
+        dialog.setWindowTitle(f"En Etkili {k} Üniversite ({metric_name})")
         dialog.resize(800, 500)
         layout = QVBoxLayout(dialog)
 
-        lbl_time = QLabel(f"Hesaplama Süresi: {elapsed:.6f} sn")
+        info = f"Hesaplama Süresi: {elapsed:.6f} sn"
+        if options:
+            info += f"  |  Yaklaşık (ε = {options['epsilon']:.3f})"
+        lbl_time = QLabel(info)
         layout.addWidget(lbl_time)
 
         table = QTableWidget()
-        table.setColumnCount(5)
-        table.setHorizontalHeaderLabels(["Sıra", "Üniversite", "Şehir", "Bağlantı Sayısı", "Toplam Ağırlık"])
+        table.setColumnCount(6)
+        table.setHorizontalHeaderLabels(["Sıra", "Üniversite", "Şehir", "Bağlantı Sayısı", "Toplam Ağırlık", metric_name])
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
         table.setRowCount(len(data))
@@ -793,29 +1076,28 @@ class MainWindow(QMainWindow):
             table.setItem(i, 2, QTableWidgetItem(row['sehir']))
             table.setItem(i, 3, QTableWidgetItem(str(row['derece'])))
             table.setItem(i, 4, QTableWidgetItem(str(row['toplam_agirlik'])))
+            table.setItem(i, 5, QTableWidgetItem(f"{row['skor']:.6g}"))
 
         layout.addWidget(table)
 
         # Dışa aktar butonu
         btn_export = QPushButton("Bu Raporu İndir (CSV)")
-        btn_export.clicked.connect(lambda: [self.export_centrality_report(), dialog.accept()])
+        btn_export.clicked.connect(lambda: [self.export_centrality_report(data, metric_name), dialog.accept()])
         layout.addWidget(btn_export)
 
         dialog.exec_()
 
-    def export_centrality_report(self):
-        """CSV Raporu Al"""
-        if hasattr(self.graph, 'get_top_5_influential_unis'):
-            try:
+    def export_centrality_report(self, data=None, metric_name=None):
+        """CSV Raporu Al (veri verilmezse derece merkeziliğine göre ilk 5)"""
+        try:
+            if data is None:
                 data = self.graph.get_top_5_influential_unis()
-                from core.exporter import Exporter
-                exporter = Exporter()
-                path = exporter.export_centrality_to_csv(data)
-                QMessageBox.information(self, "Başarılı", f"Dosya kaydedildi:\n{path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Hata", str(e))
-        else:
-            QMessageBox.warning(self, "Eksik", "Raporlama fonksiyonu bulunamadı.")
+            from core.exporter import Exporter
+            exporter = Exporter()
+            path = exporter.export_centrality_to_csv(data, metric_name=metric_name)
+            QMessageBox.information(self, "Başarılı", f"Dosya kaydedildi:\n{path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", str(e))
 
     def run_algo(self, algo_type):
         """BFS / DFS Animasyonu"""
@@ -834,32 +1116,39 @@ class MainWindow(QMainWindow):
         else:
             strategy = DFSAlgorithm()
 
-        # Algoritmayı soyut nesne üzerinden çalıştırıyoruz
-        self.animation_sequence = self.graph.run_algorithm(strategy, start_id)
+        # Algoritmayı soyut nesne üzerinden çalıştırıyoruz; ziyaretler animasyon ilerledikçe üretilir
+        self.animation_sequence = self.graph.iterate_algorithm(strategy, start_id)
+        self.animation_step_count = 0
+        self.pending_event = next(self.animation_sequence, None)
 
         elapsed = time.perf_counter() - start_time
 
-        msg = f"{algo_type} hesaplandı ({elapsed:.6f} sn).\nAnimasyon başlatılıyor..."
+        msg = f"{algo_type} başlatıldı (ilk adım {elapsed:.6f} sn).\nAnimasyon başlatılıyor..."
         QMessageBox.information(self, "Hazır", msg)
 
+        self.animation_name = algo_type
         self.status_label.setText(f"{algo_type} oynatılıyor...")
         self.timer = QTimer()
         self.timer.timeout.connect(self.next_animation_step)
         self.timer.start(150)
 
     def next_animation_step(self):
-        if self.animation_sequence:
-            node = self.animation_sequence.pop(0)
-            self.canvas.algo_nodes.append(node)
+        event = self.pending_event
+        if event is not None:
+            self.canvas.algo_nodes.append(event.node)
+            self.animation_step_count += 1
+            self.status_label.setText(f"{self.animation_name} oynatılıyor... "
+                                      f"({self.animation_step_count}. düğüm, derinlik {event.depth})")
             self.canvas.update()
+            self.pending_event = next(self.animation_sequence, None)
         else:
             self.timer.stop()
             current_text = self.status_label.text()
             self.status_label.setText(current_text + " | Animasyon Bitti.")
             QMessageBox.information(self, "Bitti", "Animasyon tamamlandı.")
 
-    def reset_visuals(self):
-        """Haritadaki tüm görsel efektleri (yol, animasyon, renk) temizler."""
+    def reset_visuals(self, keep_coloring=False):
+        """Haritadaki tüm görsel efektleri (yol, animasyon, renk) temizler; keep_coloring ise renkler kalır."""
         # 1. Animasyon listesini temizle (Mavilikler gider)
         self.canvas.algo_nodes = []
 
@@ -867,12 +1156,29 @@ class MainWindow(QMainWindow):
         self.canvas.highlighted_path = []
 
         # 3. Renklendirmeyi temizle
-        self.canvas.coloring_result = {}
-        self.coloring_result = {}
+        if not keep_coloring:
+            self.canvas.coloring_result = {}
+            self.coloring_result = {}
+            self.coloring_session = None
+            if self.coloring_dialog is not None:
+                self.coloring_dialog.close()
+                self.coloring_dialog = None
 
         # 4. Canvas'ı yenile
         self.canvas.update()
 
+    def apply_coloring_diff(self, diff, touched=()):
+        """Artımlı renklendirme farkını tuvale ve açık renklendirme penceresine uygular."""
+        if not self.canvas.coloring_result:
+            # Yol çizimi renkleri kaldırdıysa oturum artık gösterilmiyor
+            self.coloring_session = None
+            return
+        if diff:
+            self.canvas.apply_coloring_diff(diff)
+        if self.coloring_dialog is not None and self.coloring_dialog.isVisible():
+            self.coloring_dialog.apply_diff(diff, touched)
+        self.status_label.setText(f"Renklendirme güncellendi: {self.coloring_session.color_count()} renk")
+
     # main_window.py içine eklenecek metodlar
 
     # main_window.py içindeki metod güncellemesi
@@ -935,19 +1241,14 @@ class MainWindow(QMainWindow):
                 if hasattr(self.loader, 'delete_relation'):
                     self.loader.delete_relation(u1_id, u2_id)
 
-                # 2. Graf yapısından (Listeden) sil
-                if self.selected_edge in self.graph.edges:
-                    self.graph.edges.remove(self.selected_edge)
-
-                # 3. Adjacency (Komşuluk) listesinden sil (Bu adım çok kritik!)
-                if u1_id in self.graph.adj:
-                    self.graph.adj[u1_id].discard(u2_id)
-                if u2_id in self.graph.adj:
-                    self.graph.adj[u2_id].discard(u1_id)
+                # 2-3. Graf yapısından sil (kenar indeksi ve komşuluk listesi birlikte güncellenir)
+                self.graph.remove_edge(u1_id, u2_id)
+                if self.coloring_session:
+                    self.apply_coloring_diff(self.coloring_session.edge_removed(u1_id, u2_id), (u1_id, u2_id))
 
-                # 4. Seçimi ve UI Panelini temizle
+                # 4. Seçimi ve UI Panelini temizle (renklendirme korunur)
                 self.selected_edge = None
-                self.reset_visuals()
+                self.reset_visuals(keep_coloring=True)
 
                 # Detay panelini sıfırla
                 for key in self.detail_labels:
@@ -1000,12 +1301,15 @@ class MainWindow(QMainWindow):
                                                QMessageBox.Yes | QMessageBox.No)
 
                 if confirm == QMessageBox.Yes:
+                    neighbors = self.graph.get_neighbors(selected_id)
                     self.loader.delete_university(selected_id)
                     self.graph.remove_node(selected_id)
+                    if self.coloring_session:
+                        self.apply_coloring_diff(self.coloring_session.node_removed(selected_id, neighbors), neighbors)
 
                     if self.selected_node and self.selected_node.uni_id == selected_id:
                         self.selected_node = None
-                        self.reset_visuals()
+                        self.reset_visuals(keep_coloring=True)
 
                     self.canvas.update()
                     QMessageBox.information(self, "Başarılı", f"'{selected_name}' başarıyla silindi.")
@@ -1039,20 +1343,29 @@ class MainWindow(QMainWindow):
         file_path, _ = QFileDialog.getOpenFileName(self, "JSON Seç", "", "JSON (*.json)")
 
         if file_path:
-            success, message = self.loader.import_from_json(file_path)
+            from PyQt5.QtWidgets import QProgressDialog
+
+            # Dosya akışlı okunur; çubuk okunan bayta göre ilerler
+            progress_dialog = QProgressDialog("Veriler aktarılıyor...", "İptal", 0, 100, self)
+            progress_dialog.setWindowTitle("JSON İçe Aktarma")
+            progress_dialog.setWindowModality(Qt.WindowModal)
+            progress_dialog.setMinimumDuration(300)
+
+            def on_progress(phase, position, total):
+                progress_dialog.setValue(int(100 * position / max(total, 1)))
+                QApplication.processEvents()
+                return not progress_dialog.wasCanceled()
+
+            success, message, delta = self.loader.import_from_json(file_path, progress=on_progress)
+            progress_dialog.close()
 
             if success:
-                # Grafik yenileme işlemleri...
-                self.graph.nodes = {}
-                self.graph.edges = []
-                self.graph.adj = {}
-                self.loader.load_graph(self.graph)
-                self.canvas.fit_view()
-                self.canvas.update()
-                QMessageBox.information(self, "Başarılı", "Veriler yüklendi.")
+                # Graf yeniden yüklenmez; yalnızca değişen kayıtlar uygulanır
+                self.apply_import_delta(delta)
+                self.show_import_report("Başarılı", message)
             else:
                 # Hata mesajını (sıralama çakışması veya eksik veri) burada göster
-                QMessageBox.critical(self, "Veri Hatası", f"İşlem durduruldu:\n{message}")
+                self.show_import_report("Veri Hatası", f"İşlem durduruldu:\n{message}", error=True)
 
     def import_csv_data(self):
         """CSV dosyasından veri yükler."""
@@ -1063,21 +1376,63 @@ class MainWindow(QMainWindow):
                                                    "CSV Dosyaları (*.csv);;Tüm Dosyalar (*)")
 
         if file_path:
+            from PyQt5.QtWidgets import QProgressDialog
+
+            # Dosya parça parça okunur; iki geçişin her biri çubuğun yarısını kaplar
+            progress_dialog = QProgressDialog("Üniversiteler aktarılıyor...", "İptal", 0, 200, self)
+            progress_dialog.setWindowTitle("CSV İçe Aktarma")
+            progress_dialog.setWindowModality(Qt.WindowModal)
+            progress_dialog.setMinimumDuration(300)
+
+            def on_progress(phase, position, total):
+                if phase == 2:
+                    progress_dialog.setLabelText("İlişkiler aktarılıyor...")
+                progress_dialog.setValue((phase - 1) * 100 + int(100 * position / max(total, 1)))
+                QApplication.processEvents()
+                return not progress_dialog.wasCanceled()
+
             # data_loader'daki fonksiyonu çağır
-            success, message = self.loader.import_from_csv(file_path)
+            success, message, delta = self.loader.import_from_csv(file_path, progress=on_progress)
+            progress_dialog.close()
 
             if success:
-                # Grafiği sıfırla ve yeniden yükle
-                self.graph.nodes = {}
-                self.graph.edges = []
-                self.graph.adj = {}
-                self.loader.load_graph(self.graph)
-
-                # Görünümü yenile
-                self.canvas.fit_view()
-                self.canvas.update()
-
-                QMessageBox.information(self, "Başarılı", message)
+                # Graf yeniden yüklenmez; yalnızca değişen kayıtlar uygulanır
+                self.apply_import_delta(delta)
+                self.show_import_report("Başarılı", message)
             else:
                 # Hata varsa göster
-                QMessageBox.critical(self, "İçe Aktarma Hatası", f"İşlem durduruldu:\n{message}")
+                self.show_import_report("İçe Aktarma Hatası", f"İşlem durduruldu:\n{message}", error=True)
+
+    def apply_import_delta(self, delta):
+        """İçe aktarma farkını grafa, açık renklendirmeye ve detay paneline yansıtır."""
+        if not delta:
+            return
+        was_empty = not self.graph.nodes
+        new_ids = self.loader.apply_delta(self.graph, delta)
+
+        if self.coloring_session:
+            session = self.coloring_session
+            diff = {}
+            touched = set(delta.updated)  # Bağlantı sayısı değişen uçlar da panelde yenilenir
+            for u_id, v_id in delta.added_relations:
+                if u_id in self.graph.nodes and v_id in self.graph.nodes:
+                    diff.update(session.edge_added(u_id, v_id))
+                    touched.update((u_id, v_id))
+            for node_id in new_ids:
+                if node_id not in session.colors:
+                    diff.update(session.node_added(node_id))
+            self.apply_coloring_diff(diff, touched)
+
+        if self.selected_node is not None and self.selected_node.uni_id in delta.updated:
+            self.show_node_details(self.selected_node)
+        if was_empty:
+            self.canvas.fit_view()
+        self.canvas.update()
+
+    def show_import_report(self, title, message, error=False):
+        """İçe aktarma sonucunu gösterir; tüm hata ve uyarılar 'Ayrıntılar' bölümündedir."""
+        box = QMessageBox(QMessageBox.Critical if error else QMessageBox.Information, title, message, parent=self)
+        report = self.loader.last_import_report
+        if report is not None and (report.errors or report.warnings):
+            box.setDetailedText(report.details())
+        box.exec_()
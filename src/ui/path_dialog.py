@@ -1,14 +1,24 @@
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QComboBox, QPushButton, QAbstractItemView
 
 class PathDialog(QDialog):
-    def __init__(self, university_list, parent=None):
+    def __init__(self, university_list, parent=None, algorithms=None, selected_algorithm=None):
         super().__init__(parent)
         self.setWindowTitle("En Kısa Yol")
-        self.resize(350, 250)
+        self.resize(350, 300)
         self.university_list = university_list
 
         layout = QVBoxLayout(self)
 
+        # Algoritma seçimi
+        layout.addWidget(QLabel("Algoritma:"))
+        self.combo_algo = QComboBox()
+        self.combo_algo.addItems(algorithms or ["Dijkstra", "A*"])
+        if selected_algorithm:
+            self.combo_algo.setCurrentText(selected_algorithm)
+        layout.addWidget(self.combo_algo)
+
+        layout.addSpacing(10)
+
         # Başlangıç
         layout.addWidget(QLabel("Başlangıç Üniversitesi:"))
         self.combo_start = QComboBox()
@@ -36,6 +46,9 @@ class PathDialog(QDialog):
         for uni_id, uni_name in sorted_unis:
             combo.addItem(uni_name, uni_id)
 
+    def get_algorithm(self):
+        return self.combo_algo.currentText()
+
     def get_selection(self):
         return (self.combo_start.currentData(), self.combo_end.currentData(),
                 self.combo_start.currentText(), self.combo_end.currentText())
\ No newline at end of file